@@ -129,6 +129,10 @@ IMAGE_FILES_SUBDIRECTORY = "images"
 EVALUATION_FILES_SUBDIRECTORY = "evaluation"
 COMPONENTS_FILES_SUBDIRECTORY = "components"
 
+# How long the objects of the chunks that were compacted into a single object
+# are kept, so that any open readers can finish with them
+JQFILEUPLOAD_COMPACTED_CHUNKS_DELETE_DELAY = timedelta(hours=1)
+
 AWS_S3_FILE_OVERWRITE = False
 # Note: deprecated in django storages 2.0
 AWS_BUCKET_ACL = "private"
@@ -165,6 +169,12 @@ PROTECTED_S3_STORAGE_USE_CLOUDFRONT = strtobool(
 PROTECTED_S3_STORAGE_CLOUDFRONT_DOMAIN = os.environ.get(
     "PROTECTED_S3_STORAGE_CLOUDFRONT_DOMAIN_NAME", ""
 )
+# How long to cache that a protected file exists before redirecting to it,
+# in seconds. 0 checks every request, None never checks.
+PROTECTED_S3_STORAGE_EXISTS_CACHE_TIMEOUT = 3600
+# How long to cache that a user can view an image when serving its files,
+# in seconds
+SERVING_PERMISSION_CACHE_TIMEOUT = 60
 
 PUBLIC_S3_STORAGE_KWARGS = {
     "access_key": os.environ.get("PUBLIC_S3_STORAGE_ACCESS_KEY", ""),
@@ -208,6 +218,11 @@ CHALLENGE_SUBDOMAIN_URL_CONF = "config.urls.challenge_subdomain"
 RENDERING_SUBDOMAIN_URL_CONF = "config.urls.rendering_subdomain"
 DEFAULT_SCHEME = os.environ.get("DEFAULT_SCHEME", "https")
 
+# How long the challenge of a subdomain is cached in seconds, in the shared
+# cache and in the memory of each process
+CHALLENGE_SUBDOMAIN_CACHE_TIMEOUT = 3600
+CHALLENGE_SUBDOMAIN_LOCAL_CACHE_TIMEOUT = 5
+
 # Workaround for https://github.com/ellmetha/django-machina/issues/219
 ABSOLUTE_URL_OVERRIDES = {
     "forum.forum": lambda o: reverse(
@@ -805,6 +820,11 @@ COMPONENTS_DOCKER_RUNTIME = os.environ.get("COMPONENTS_DOCKER_RUNTIME", None)
 COMPONENTS_NVIDIA_VISIBLE_DEVICES = os.environ.get(
     "COMPONENTS_NVIDIA_VISIBLE_DEVICES", "void"
 )
+# The disk space that loaded component images can use on each docker host,
+# the least recently used images are removed when this is exceeded
+COMPONENTS_DOCKER_IMAGE_CACHE_SIZE_GB = int(
+    os.environ.get("COMPONENTS_DOCKER_IMAGE_CACHE_SIZE_GB", "100")
+)
 
 # Set which template pack to use for forms
 CRISPY_TEMPLATE_PACK = "bootstrap4"
@@ -900,13 +920,21 @@ CELERY_BEAT_SCHEDULE = {
         "task": "grandchallenge.jqfileupload.tasks.cleanup_stale_uploads",
         "schedule": timedelta(hours=1),
     },
+    "compact_complete_uploads": {
+        "task": "grandchallenge.jqfileupload.tasks.compact_complete_uploads",
+        "schedule": timedelta(minutes=10),
+    },
     "clear_sessions": {
         "task": "grandchallenge.core.tasks.clear_sessions",
         "schedule": timedelta(days=1),
     },
+    "flush_download_counts": {
+        "task": "grandchallenge.serving.tasks.flush_download_counts",
+        "schedule": timedelta(minutes=1),
+    },
     "update_challenge_results_cache": {
         "task": "grandchallenge.challenges.tasks.update_challenge_results_cache",
-        "schedule": timedelta(minutes=5),
+        "schedule": timedelta(days=1),
     },
     "validate_external_challenges": {
         "task": "grandchallenge.challenges.tasks.check_external_challenge_urls",
@@ -956,6 +984,7 @@ CELERY_BEAT_SCHEDULE = {
 
 CELERY_TASK_ROUTES = {
     "grandchallenge.components.tasks.execute_job": "evaluation",
+    "grandchallenge.components.tasks.preload_docker_image": "evaluation",
     "grandchallenge.components.tasks.validate_docker_image": "images",
     "grandchallenge.cases.tasks.build_images": "images",
 }
@@ -963,9 +992,29 @@ CELERY_TASK_ROUTES = {
 # The name of the group whose members will be able to create algorithms
 ALGORITHMS_CREATORS_GROUP_NAME = "algorithm_creators"
 
+# The number of algorithm jobs that are sent to celery in one group
+ALGORITHMS_JOBS_QUEUE_CHUNK_SIZE = int(
+    os.environ.get("ALGORITHMS_JOBS_QUEUE_CHUNK_SIZE", "1000")
+)
+
 # The name of the group whose uploaded dicom files will be retained if the image builder fails
 DICOM_DATA_CREATORS_GROUP_NAME = "dicom_creators"
 
+# The number of uploaded files that are downloaded concurrently when building images
+CASES_PROVISIONING_CONCURRENCY = int(
+    os.environ.get("CASES_PROVISIONING_CONCURRENCY", "8")
+)
+
+# The maximum number of bytes that can be extracted from the archives in an
+# upload session, and the maximum ratio between the number of bytes extracted
+# from an uploaded archive (including any nested archives) and its size
+CASES_MAX_EXTRACTED_BYTES = int(
+    os.environ.get("CASES_MAX_EXTRACTED_BYTES", "107374182400")  # 100 gb
+)
+CASES_MAX_DECOMPRESSION_RATIO = int(
+    os.environ.get("CASES_MAX_DECOMPRESSION_RATIO", "1000")
+)
+
 # Disallow some challenge names due to subdomain or media folder clashes
 DISALLOWED_CHALLENGE_NAMES = {
     "m",
@@ -1012,6 +1061,11 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 16_777_216  # 16 mb
 # Default maximum width or height for thumbnails in retina workstation
 RETINA_DEFAULT_THUMBNAIL_SIZE = 128
 
+# The maximum width or height of the previews that are stored for new images
+CASES_PREVIEW_SIZES = (RETINA_DEFAULT_THUMBNAIL_SIZE, 256, 512)
+# How long thumbnails rendered from the full image are cached in seconds
+CASES_THUMBNAIL_CACHE_TIMEOUT = 86400
+
 # Retina specific settings
 RETINA_GRADERS_GROUP_NAME = "retina_graders"
 RETINA_ADMINS_GROUP_NAME = "retina_admins"
@@ -342,6 +342,13 @@ class AlgorithmImage(UUIDModel, ComponentImage):
     def api_url(self):
         return reverse("api:algorithms-image-detail", kwargs={"pk": self.pk})
 
+    @property
+    def preload_queues(self):
+        if self.queue_override:
+            return [self.queue_override]
+        else:
+            return super().preload_queues
+
     def save(self, *args, **kwargs):
         adding = self._state.adding
 
@@ -438,7 +445,7 @@ class Job(UUIDModel, ComponentJob):
                     ),
                     im_file.file,
                 )
-                for im_file in inp.image.files.all()
+                for im_file in inp.image.download_files
             ]
         return [(inp.interface.relative_path, inp.value)]
 
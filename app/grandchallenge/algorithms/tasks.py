@@ -1,9 +1,14 @@
 from celery import chord, group, shared_task
 from django.apps import apps
 from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
 from django.core.mail import send_mail
+from django.db import transaction
 from django.db.transaction import on_commit
+from guardian.models import GroupObjectPermission
+from guardian.shortcuts import assign_perm
 
 from grandchallenge.algorithms.models import (
     Algorithm,
@@ -13,6 +18,7 @@ from grandchallenge.algorithms.models import (
 )
 from grandchallenge.archives.models import Archive
 from grandchallenge.cases.models import Image, RawImageUploadSession
+from grandchallenge.cases.permissions import update_view_image_permissions
 from grandchallenge.cases.tasks import build_images
 from grandchallenge.components.models import (
     ComponentInterface,
@@ -226,14 +232,19 @@ def execute_jobs(
         extra_viewer_groups=extra_viewer_groups,
     )
 
-    if jobs:
-        workflow = group(j.signature for j in jobs)
-
-        if linked_task is not None:
-            linked_task.kwargs.update({"job_pks": [j.pk for j in jobs]})
-            workflow |= linked_task
+    if not jobs:
+        return
 
+    if linked_task is not None:
+        # The linked task needs all of the jobs to have finished
+        linked_task.kwargs.update({"job_pks": [j.pk for j in jobs]})
+        workflow = group(j.signature for j in jobs) | linked_task
         on_commit(workflow.apply_async)
+    else:
+        chunk_size = settings.ALGORITHMS_JOBS_QUEUE_CHUNK_SIZE
+        for idx in range(0, len(jobs), chunk_size):
+            workflow = group(j.signature for j in jobs[idx : idx + chunk_size])
+            on_commit(workflow.apply_async)
 
 
 def create_algorithm_job_with_inputs(
@@ -289,28 +300,126 @@ def create_algorithm_jobs(
                 )
             ]
 
-    for image in images:
-        if not ComponentInterfaceValue.objects.filter(
+    image_pks = _get_image_pks_without_jobs(
+        algorithm_image=algorithm_image,
+        image_pks=[image.pk for image in images],
+        creator=creator,
+        interface=default_input_interface,
+    )
+
+    if not image_pks:
+        return jobs
+
+    with transaction.atomic():
+        jobs = _bulk_create_jobs(
+            algorithm_image=algorithm_image,
+            image_pks=image_pks,
+            creator=creator,
             interface=default_input_interface,
-            image=image,
-            algorithms_jobs_as_input__algorithm_image=algorithm_image,
-            algorithms_jobs_as_input__creator=creator,
-        ).exists():
-            j = Job.objects.create(
-                creator=creator, algorithm_image=algorithm_image
+            extra_viewer_groups=extra_viewer_groups,
+        )
+
+    return jobs
+
+
+def _get_image_pks_without_jobs(
+    *, algorithm_image, image_pks, creator, interface
+):
+    """Filter the images that already have a job in one query."""
+    existing_inputs = ComponentInterfaceValue.objects.filter(
+        interface=interface,
+        image__isnull=False,
+        algorithms_jobs_as_input__algorithm_image=algorithm_image,
+        algorithms_jobs_as_input__creator=creator,
+    )
+    pending = set(
+        Image.objects.filter(pk__in=image_pks)
+        .exclude(pk__in=existing_inputs.values("image"))
+        .values_list("pk", flat=True)
+    )
+    return [pk for pk in dict.fromkeys(image_pks) if pk in pending]
+
+
+def _bulk_create_jobs(
+    *, algorithm_image, image_pks, creator, interface, extra_viewer_groups
+):
+    """
+    Create a job for each image with bulk queries.
+
+    This does the same as Job.save() followed by setting the inputs and
+    viewer groups for each job, but in a constant number of queries.
+    """
+    if extra_viewer_groups is None:
+        extra_viewer_groups = []
+
+    jobs = [
+        Job(creator=creator, algorithm_image=algorithm_image)
+        for _ in image_pks
+    ]
+
+    viewers = Group.objects.bulk_create(
+        [
+            Group(
+                name=f"{j._meta.app_label}_{j._meta.model_name}_{j.pk}_viewers"
             )
-            j.inputs.set(
-                [
-                    ComponentInterfaceValue.objects.create(
-                        interface=default_input_interface, image=image
-                    )
-                ]
+            for j in jobs
+        ]
+    )
+    for job, g in zip(jobs, viewers):
+        job.viewers = g
+
+    Job.objects.bulk_create(jobs)
+
+    civs = ComponentInterfaceValue.objects.bulk_create(
+        [
+            ComponentInterfaceValue(interface=interface, image_id=pk)
+            for pk in image_pks
+        ]
+    )
+    Job.inputs.through.objects.bulk_create(
+        [
+            Job.inputs.through(
+                job_id=job.pk, componentinterfacevalue_id=civ.pk
             )
+            for job, civ in zip(jobs, civs)
+        ]
+    )
 
-            if extra_viewer_groups is not None:
-                j.viewer_groups.add(*extra_viewer_groups)
+    viewer_groups = [
+        (job, g) for job in jobs for g in (job.viewers, *extra_viewer_groups)
+    ]
+    Job.viewer_groups.through.objects.bulk_create(
+        [
+            Job.viewer_groups.through(job_id=job.pk, group_id=g.pk)
+            for job, g in viewer_groups
+        ]
+    )
+
+    content_type = ContentType.objects.get_for_model(Job)
+    view_job = Permission.objects.get(
+        content_type=content_type, codename=f"view_{Job._meta.model_name}"
+    )
+    GroupObjectPermission.objects.bulk_create(
+        [
+            GroupObjectPermission(
+                content_type=content_type,
+                permission=view_job,
+                group_id=g.pk,
+                object_pk=str(job.pk),
+            )
+            for job, g in viewer_groups
+        ]
+    )
+
+    if creator:
+        creator.groups.add(*viewers)
+        assign_perm(
+            f"change_{Job._meta.model_name}",
+            creator,
+            Job.objects.filter(pk__in=[j.pk for j in jobs]),
+        )
 
-            jobs.append(j)
+    update_view_image_permissions(image_pks=image_pks)
 
     return jobs
 
@@ -0,0 +1,79 @@
+import csv
+import json
+from itertools import islice
+
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.utils.encoders import JSONEncoder
+
+from grandchallenge.core.renderers import PaginatedCSVRenderer
+
+
+class _Echo:
+    """A file like object that returns what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+class StreamingExportMixin:
+    """
+    Adds an export action that streams all of the filtered objects.
+
+    The objects are read with a server side cursor and serialized in chunks
+    of ``export_chunk_size``, so the memory use does not depend on the
+    number of objects. The prefetches of the queryset are made per chunk.
+    The export is available as csv, with the same columns as
+    ``PaginatedCSVRenderer``, or as newline delimited json.
+    """
+
+    export_chunk_size = 1000
+
+    @action(detail=False, url_path="export/(?P<export_format>csv|ndjson)")
+    def export(self, request, export_format):
+        rows = self._get_export_rows(
+            queryset=self.filter_queryset(self.get_queryset())
+        )
+
+        if export_format == "csv":
+            content = self._stream_csv(rows=rows)
+            content_type = "text/csv"
+        else:
+            content = (json.dumps(row, cls=JSONEncoder) + "\n" for row in rows)
+            content_type = "application/x-ndjson"
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{self.basename}.{export_format}"'
+
+        return response
+
+    def _get_export_rows(self, *, queryset):
+        prefetch_lookups = queryset._prefetch_related_lookups
+        objects = queryset.prefetch_related(None).iterator(
+            chunk_size=self.export_chunk_size
+        )
+
+        while True:
+            chunk = list(islice(objects, self.export_chunk_size))
+
+            if not chunk:
+                return
+
+            prefetch_related_objects(chunk, *prefetch_lookups)
+
+            yield from self.get_serializer(chunk, many=True).data
+
+    @staticmethod
+    def _stream_csv(*, rows):
+        writer = None
+        flatten = PaginatedCSVRenderer._flatten_value
+
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(_Echo(), fieldnames=row.keys())
+                yield writer.writeheader()
+
+            yield writer.writerow({k: flatten(v) for k, v in row.items()})
@@ -1,5 +1,141 @@
-from rest_framework.pagination import LimitOffsetPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates a queryset ordered by ``created`` then ``pk``.
+
+    Each page is selected with a filter on the last row of the previous page
+    rather than an offset, so deep pages are as fast as the first one, and
+    the total number of results is not counted.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, *, default_limit, max_limit):
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by("created", "pk")
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created, pk = self.decode_cursor(cursor, model=queryset.model)
+            queryset = queryset.filter(
+                Q(created__gt=created) | Q(created=created, pk__gt=pk)
+            )
+
+        results = list(queryset[: self.limit + 1])
+
+        self.has_next = len(results) > self.limit
+        results = results[: self.limit]
+        self.last = results[-1] if results else None
+
+        return results
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+
+        return min(max(limit, 1), self.max_limit)
+
+    def decode_cursor(self, cursor, *, model):
+        try:
+            created, pk = json.loads(urlsafe_b64decode(cursor.encode()))
+            created = parse_datetime(created)
+            pk = model._meta.pk.to_python(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created is None or pk is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return created, pk
+
+    def encode_cursor(self, obj):
+        return urlsafe_b64encode(
+            json.dumps([obj.created.isoformat(), str(obj.pk)]).encode()
+        ).decode()
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.last),
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
 
 
 class MaxLimit1000OffsetPagination(LimitOffsetPagination):
+    """
+    Limit offset pagination, or keyset pagination if requested.
+
+    Clients can opt in to keyset pagination by passing a ``cursor`` query
+    parameter, which is empty for the first page. The responses then only
+    include a link to the next page, see ``KeysetPagination``.
+    """
+
     max_limit = 1000
+    keyset_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset_pagination(queryset=queryset, request=request):
+            self.keyset_paginator = KeysetPagination(
+                default_limit=self.default_limit, max_limit=self.max_limit
+            )
+            return self.keyset_paginator.paginate_queryset(
+                queryset, request, view
+            )
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset_paginator is not None:
+            # There are no page controls for keyset pagination
+            return ""
+
+        return super().to_html()
+
+    @staticmethod
+    def use_keyset_pagination(*, queryset, request):
+        if KeysetPagination.cursor_query_param not in request.query_params:
+            return False
+
+        try:
+            queryset.model._meta.get_field("created")
+        except FieldDoesNotExist:
+            # Fall back to offset pagination
+            return False
+
+        return True
@@ -0,0 +1,36 @@
+# Generated by Django 3.1.9 on 2026-10-17 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0003_auto_20210406_0753"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="imagefile",
+            name="image_type",
+            field=models.CharField(
+                choices=[
+                    ("MHD", "MHD"),
+                    ("TIFF", "TIFF"),
+                    ("DZI", "DZI"),
+                    ("PREV", "Preview"),
+                ],
+                default="MHD",
+                max_length=4,
+            ),
+        ),
+        migrations.AddField(
+            model_name="imagefile",
+            name="preview_size",
+            field=models.PositiveSmallIntegerField(
+                editable=False,
+                help_text="The size of the square that a preview fits in",
+                null=True,
+            ),
+        ),
+    ]
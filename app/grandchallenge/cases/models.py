@@ -8,18 +8,18 @@ from django.conf import settings
 from django.contrib.auth.models import Group
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
-from django.db.models import Q
 from django.db.models.signals import post_delete
 from django.db.transaction import on_commit
 from django.dispatch import receiver
 from django.utils.text import get_valid_filename
-from guardian.shortcuts import assign_perm, get_groups_with_perms, remove_perm
+from guardian.shortcuts import assign_perm
 from panimg.image_builders.metaio_utils import (
     load_sitk_image,
     parse_mh_header,
 )
 from panimg.models import ColorSpace, ImageType
 
+from grandchallenge.cases.permissions import update_view_image_permissions
 from grandchallenge.core.models import UUIDModel
 from grandchallenge.core.storage import protected_s3_storage
 from grandchallenge.modalities.models import ImagingModality
@@ -475,50 +475,10 @@ class Image(UUIDModel):
             image from the results image set, and is used when the pre_clear
             signal is sent.
         """
-        if exclude_jobs is None:
-            exclude_jobs = []
-
-        algorithm_jobs_groups = (
-            Q(job__inputs__image=self) | Q(job__outputs__image=self)
-        ) & ~Q(job__in=exclude_jobs)
-        reader_studies_groups = Q(
-            editors_of_readerstudy__images__id__exact=self.pk
-        ) | Q(readers_of_readerstudy__images__id__exact=self.pk)
-        archive_groups = (
-            Q(editors_of_archive__images__id__exact=self.pk)
-            | Q(uploaders_of_archive__images__id__exact=self.pk)
-            | Q(users_of_archive__images__id__exact=self.pk)
+        update_view_image_permissions(
+            image_pks=[self.pk], exclude_jobs=exclude_jobs
         )
 
-        expected_groups = {
-            *Group.objects.filter(algorithm_jobs_groups),
-            *Group.objects.filter(reader_studies_groups),
-            *Group.objects.filter(archive_groups),
-        }
-
-        # Reader study editors for reader studies that have answers that
-        # include this image.
-        for answer in self.answer_set.select_related(
-            "question__reader_study__editors_group"
-        ).all():
-            expected_groups.add(answer.question.reader_study.editors_group)
-
-        current_groups = get_groups_with_perms(self, attach_perms=True)
-        current_groups = {
-            group
-            for group, perms in current_groups.items()
-            if "view_image" in perms
-        }
-
-        groups_missing_perms = expected_groups - current_groups
-        groups_with_extra_perms = current_groups - expected_groups
-
-        for g in groups_missing_perms:
-            assign_perm("view_image", g, self)
-
-        for g in groups_with_extra_perms:
-            remove_perm("view_image", g, self)
-
     def assign_view_perm_to_creator(self):
         for answer in self.answer_set.all():
             assign_perm("view_image", answer.creator, self)
@@ -527,6 +487,15 @@ class Image(UUIDModel):
     def api_url(self):
         return reverse("api:image-detail", kwargs={"pk": self.pk})
 
+    @property
+    def download_files(self):
+        """The files of this image, without the previews."""
+        return [
+            f
+            for f in self.files.all()
+            if f.image_type != ImageFile.IMAGE_TYPE_PREVIEW
+        ]
+
     class Meta:
         ordering = ("name",)
 
@@ -535,11 +504,13 @@ class ImageFile(UUIDModel):
     IMAGE_TYPE_MHD = ImageType.MHD.value
     IMAGE_TYPE_TIFF = ImageType.TIFF.value
     IMAGE_TYPE_DZI = ImageType.DZI.value
+    IMAGE_TYPE_PREVIEW = "PREV"
 
     IMAGE_TYPES = (
         (IMAGE_TYPE_MHD, "MHD"),
         (IMAGE_TYPE_TIFF, "TIFF"),
         (IMAGE_TYPE_DZI, "DZI"),
+        (IMAGE_TYPE_PREVIEW, "Preview"),
     )
 
     image = models.ForeignKey(
@@ -551,6 +522,11 @@ class ImageFile(UUIDModel):
     file = models.FileField(
         upload_to=image_file_path, blank=False, storage=protected_s3_storage
     )
+    preview_size = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        help_text="The size of the square that a preview fits in",
+    )
 
 
 @receiver(post_delete, sender=ImageFile)
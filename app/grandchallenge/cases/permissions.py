@@ -0,0 +1,129 @@
+from collections import defaultdict
+
+from django.apps import apps
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from guardian.models import GroupObjectPermission
+
+
+def _get_expected_viewer_groups(*, image_pks, exclude_jobs):
+    """The (group pk, image pk) pairs that should have view_image."""
+    Archive = apps.get_model(  # noqa: N806
+        app_label="archives", model_name="Archive"
+    )
+    Answer = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="Answer"
+    )
+    Job = apps.get_model(  # noqa: N806
+        app_label="algorithms", model_name="Job"
+    )
+    ReaderStudy = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="ReaderStudy"
+    )
+
+    expected = set()
+
+    for lookup in ("inputs", "outputs"):
+        job_groups = Job.viewer_groups.through.objects.filter(
+            **{f"job__{lookup}__image__in": image_pks}
+        )
+        if exclude_jobs is not None:
+            job_groups = job_groups.exclude(job__in=exclude_jobs)
+        expected.update(
+            (group_pk, image_pk)
+            for group_pk, image_pk in job_groups.values_list(
+                "group_id", f"job__{lookup}__image_id"
+            )
+        )
+
+    for image_pk, *group_pks in Archive.images.through.objects.filter(
+        image__in=image_pks
+    ).values_list(
+        "image_id",
+        "archive__editors_group_id",
+        "archive__uploaders_group_id",
+        "archive__users_group_id",
+    ):
+        expected.update((group_pk, image_pk) for group_pk in group_pks)
+
+    for image_pk, *group_pks in ReaderStudy.images.through.objects.filter(
+        image__in=image_pks
+    ).values_list(
+        "image_id",
+        "readerstudy__editors_group_id",
+        "readerstudy__readers_group_id",
+    ):
+        expected.update((group_pk, image_pk) for group_pk in group_pks)
+
+    # Reader study editors for reader studies that have answers that
+    # include these images.
+    expected.update(
+        Answer.objects.filter(answer_image__in=image_pks).values_list(
+            "question__reader_study__editors_group_id", "answer_image_id"
+        )
+    )
+
+    return {(group_pk, str(image_pk)) for group_pk, image_pk in expected}
+
+
+def update_view_image_permissions(*, image_pks, exclude_jobs=None):
+    """
+    Update the view_image permissions of the viewer groups of many images.
+
+    The groups that should be able to view each image are determined by the
+    algorithm jobs, archives, reader studies and answers that include it.
+    These are compared with the existing group object permissions in a
+    constant number of queries, and the difference is applied in bulk.
+
+    Parameters
+    ----------
+    image_pks
+        The primary keys of the images to update.
+    exclude_jobs
+        Exclude these jobs from being considered. This is useful when a
+        many to many relationship is being cleared to remove images from the
+        job, and is used when the pre_clear signal is sent.
+    """
+    image_pks = {str(pk) for pk in image_pks}
+
+    if not image_pks:
+        return
+
+    content_type = ContentType.objects.get_by_natural_key("cases", "image")
+    permission = Permission.objects.get(
+        content_type=content_type, codename="view_image"
+    )
+
+    expected = _get_expected_viewer_groups(
+        image_pks=image_pks, exclude_jobs=exclude_jobs
+    )
+
+    current = defaultdict(list)
+    for pk, group_pk, image_pk in GroupObjectPermission.objects.filter(
+        content_type=content_type,
+        permission=permission,
+        object_pk__in=image_pks,
+    ).values_list("pk", "group_id", "object_pk"):
+        current[(group_pk, image_pk)].append(pk)
+
+    GroupObjectPermission.objects.filter(
+        pk__in=[
+            pk
+            for key, pks in current.items()
+            if key not in expected
+            for pk in pks
+        ]
+    ).delete()
+
+    GroupObjectPermission.objects.bulk_create(
+        [
+            GroupObjectPermission(
+                content_type=content_type,
+                permission=permission,
+                group_id=group_pk,
+                object_pk=image_pk,
+            )
+            for group_pk, image_pk in expected - current.keys()
+        ],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,106 @@
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import SimpleITK
+from PIL import Image as PILImage
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+
+from grandchallenge.cases.models import Image, ImageFile
+
+
+def sitk_image_to_pil(image_itk) -> PILImage.Image:
+    """Convert an image, or the center slice of a 3D image, to PIL."""
+    depth = image_itk.GetDepth()
+    image_nparray = SimpleITK.GetArrayFromImage(image_itk)
+    if depth > 0:
+        # Get center slice of image if 3D
+        image_nparray = image_nparray[depth // 2]
+    return PILImage.fromarray(image_nparray)
+
+
+def pil_image_to_png(image_pil) -> bytes:
+    buffer = BytesIO()
+    image_pil.save(buffer, format="png")
+    return buffer.getvalue()
+
+
+def create_preview_files(*, image_id, image_itk) -> List[ImageFile]:
+    """
+    Render the previews of an image.
+
+    A PNG preview is created for each of ``settings.CASES_PREVIEW_SIZES``
+    that fits in a square of that size. The ImageFiles are not saved.
+    """
+    image_pil = sitk_image_to_pil(image_itk)
+    preview_files = []
+
+    for size in settings.CASES_PREVIEW_SIZES:
+        preview = image_pil.copy()
+        preview.thumbnail((size, size), PILImage.LANCZOS)
+        preview_files.append(
+            ImageFile(
+                image_id=image_id,
+                image_type=ImageFile.IMAGE_TYPE_PREVIEW,
+                preview_size=size,
+                file=ContentFile(
+                    pil_image_to_png(preview), name=f"preview_{size}.png"
+                ),
+            )
+        )
+
+    return preview_files
+
+
+def _get_preview_file(*, image: Image, min_size: int) -> Optional[ImageFile]:
+    """Get the smallest stored preview that is at least min_size."""
+    return (
+        image.files.filter(
+            image_type=ImageFile.IMAGE_TYPE_PREVIEW,
+            preview_size__gte=min_size,
+        )
+        .order_by("preview_size")
+        .first()
+    )
+
+
+def get_thumbnail_png(
+    *, image: Image, size: Optional[Tuple[int, int]] = None
+) -> bytes:
+    """
+    Get a PNG of an image that fits in size, or at full size if None.
+
+    The thumbnail is made from a stored preview if there is one that is
+    large enough. Otherwise it is rendered from the full image and cached.
+    """
+    if size is not None:
+        preview_file = _get_preview_file(image=image, min_size=max(size))
+
+        if preview_file is not None:
+            with preview_file.file.open("rb") as f:
+                preview_png = f.read()
+
+            preview = PILImage.open(BytesIO(preview_png))
+
+            if preview.width <= size[0] and preview.height <= size[1]:
+                return preview_png
+
+            preview.thumbnail(size, PILImage.LANCZOS)
+            return pil_image_to_png(preview)
+
+    key = f"cases:image-thumbnail:{image.pk}:{size}"
+    thumbnail_png = cache.get(key)
+
+    if thumbnail_png is None:
+        image_pil = sitk_image_to_pil(image.get_sitk_image())
+
+        if size is not None:
+            image_pil.thumbnail(size, PILImage.LANCZOS)
+
+        thumbnail_png = pil_image_to_png(image_pil)
+        cache.set(
+            key, thumbnail_png, timeout=settings.CASES_THUMBNAIL_CACHE_TIMEOUT
+        )
+
+    return thumbnail_png
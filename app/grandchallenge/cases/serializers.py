@@ -25,7 +25,9 @@ class ImageFileSerializer(serializers.ModelSerializer):
 
 
 class HyperlinkedImageSerializer(serializers.ModelSerializer):
-    files = ImageFileSerializer(many=True, read_only=True)
+    files = ImageFileSerializer(
+        source="download_files", many=True, read_only=True
+    )
     job_set = SerializerMethodField()
     archive_set = HyperlinkedRelatedField(
         read_only=True, many=True, view_name="api:archive-detail"
@@ -1,11 +1,14 @@
 import os
 import tarfile
 import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass
 from datetime import timedelta
-from itertools import chain
 from pathlib import Path
+from shutil import copyfileobj
 from tempfile import TemporaryDirectory
+from time import perf_counter
 from typing import (
     Callable,
     Dict,
@@ -17,14 +20,17 @@ from typing import (
     Tuple,
 )
 
+import SimpleITK
 from billiard.exceptions import SoftTimeLimitExceeded, TimeLimitExceeded
 from celery import shared_task
 from django.conf import settings
 from django.contrib.auth.models import Group
-from django.core.exceptions import ValidationError
+from django.core.exceptions import SuspiciousFileOperation, ValidationError
 from django.core.files import File
-from django.db import transaction
+from django.db import models, transaction
 from django.utils import timezone
+from django.utils._os import safe_join
+from guardian.shortcuts import assign_perm
 from panimg import convert
 from panimg.models import PanImgResult
 
@@ -37,10 +43,16 @@ from grandchallenge.cases.models import (
     RawImageFile,
     RawImageUploadSession,
 )
+from grandchallenge.cases.previews import create_preview_files
+from grandchallenge.jqfileupload.models import StagedFile
 from grandchallenge.jqfileupload.widgets.uploader import (
-    NotFoundError,
     StagedAjaxFile,
+    load_staged_ajax_files,
 )
+from grandchallenge.statistics import metrics
+
+PROVISIONING_BUFFER_SIZE = 0x100000  # 1MB
+EXTRACTION_BUFFER_SIZE = 0x100000  # 1MB
 
 
 class ProvisioningError(Exception):
@@ -86,8 +98,12 @@ def populate_provisioning_directory(
     """
     provisioning_dir = Path(provisioning_dir)
 
-    def copy_to_tmpdir(image_file: RawImageFile):
-        staged_file = StagedAjaxFile(image_file.staged_file_id)
+    staged_files = load_staged_ajax_files(
+        raw_file.staged_file_id for raw_file in raw_files
+    )
+
+    def copy_to_tmpdir(image_file: RawImageFile) -> int:
+        staged_file = staged_files[image_file.staged_file_id]
         if not staged_file.exists:
             raise ValueError(
                 f"staged file {image_file.staged_file_id} does not exist"
@@ -95,24 +111,46 @@ def populate_provisioning_directory(
 
         with open(provisioning_dir / staged_file.name, "wb") as dest_file:
             with staged_file.open() as src_file:
-                buffer_size = 0x10000
-                first = True
-                buffer = b""
-                while first or (len(buffer) >= buffer_size):
-                    first = False
-                    buffer = src_file.read(buffer_size)
-                    dest_file.write(buffer)
+                copyfileobj(src_file, dest_file, PROVISIONING_BUFFER_SIZE)
 
-    exceptions_raised = 0
+            return dest_file.tell()
+
+    # Files with the same name would be written to the same path at the
+    # same time, so only the last of them is copied
+    unique_files = {}
     for raw_file in raw_files:
-        try:
-            copy_to_tmpdir(raw_file)
-        except Exception:
-            logger.exception(
-                f"populate_provisioning_directory exception "
-                f"for file: '{raw_file.filename}'"
-            )
-            exceptions_raised += 1
+        staged_file = staged_files[raw_file.staged_file_id]
+        key = staged_file.name if staged_file.exists else staged_file.uuid
+        unique_files[key] = raw_file
+
+    exceptions_raised = 0
+    total_bytes = 0
+    start = perf_counter()
+
+    with ThreadPoolExecutor(
+        max_workers=settings.CASES_PROVISIONING_CONCURRENCY
+    ) as executor:
+        futures = {
+            executor.submit(copy_to_tmpdir, raw_file): raw_file
+            for raw_file in unique_files.values()
+        }
+
+        for future in as_completed(futures):
+            try:
+                total_bytes += future.result()
+            except Exception:
+                logger.exception(
+                    f"populate_provisioning_directory exception "
+                    f"for file: '{futures[future].filename}'"
+                )
+                exceptions_raised += 1
+
+    duration = perf_counter() - start
+    logger.info(
+        f"Provisioned {len(raw_files)} file(s), {total_bytes} bytes, "
+        f"in {duration:.2f}s "
+        f"({total_bytes / max(duration, 1e-6) / 1e6:.2f} MB/s)"
+    )
 
     if exceptions_raised > 0:
         raise ProvisioningError(
@@ -172,34 +210,206 @@ def _check_sanity(info, is_tar, path):
         setattr(info, filename_attr, filename)
 
 
-def extract(file, path, is_tar=False):
+@dataclass
+class _ExtractionSource:
+    """An uploaded file and the number of bytes extracted from it so far."""
+
+    path: Path
+    size: int
+    extracted_bytes: int = 0
+
+
+@dataclass
+class _ExtractionItem:
+    """A file that might be an archive, waiting to be checked."""
+
+    path: Path
+    target_path: Path
+    source: _ExtractionSource
+
+
+class ArchiveExtractor:
     """
-    Extracts all files in `file` to `path`.
+    Extracts archives, and the archives nested inside of them.
+
+    Archives are processed from a work queue and extracted member by member.
+    Only the files that were extracted from an archive are checked for nested
+    archives, so the target directory is never walked. The number of bytes
+    extracted is limited in total and relative to the size of the uploaded
+    file that they came from, which protects against decompression bombs.
 
     Parameters
     ----------
-    file:
-        A zip or tar file.
-    path:
-        The path to which the contents of `file` are to be extracted.
-
+    max_bytes
+        The maximum number of bytes that can be extracted in total,
+        defaults to ``settings.CASES_MAX_EXTRACTED_BYTES``.
+    max_ratio
+        The maximum ratio between the bytes extracted from an uploaded file
+        and its size, defaults to
+        ``settings.CASES_MAX_DECOMPRESSION_RATIO``.
     """
-    list_func = file.getmembers if is_tar else file.infolist
-    filename_attr = "name" if is_tar else "filename"
-    is_dir_func = "isdir" if is_tar else "is_dir"
-    extracted = False
-    for info in sorted(list_func(), key=lambda k: getattr(k, filename_attr)):
-        # Skip directories
-        if getattr(info, is_dir_func)():
-            continue
 
-        _check_sanity(info, is_tar, path)
-        file.extract(info, path)
-        extracted = True
-    return extracted
+    def __init__(
+        self,
+        *,
+        max_bytes: Optional[int] = None,
+        max_ratio: Optional[int] = None,
+    ):
+        self.max_bytes = (
+            settings.CASES_MAX_EXTRACTED_BYTES
+            if max_bytes is None
+            else max_bytes
+        )
+        self.max_ratio = (
+            settings.CASES_MAX_DECOMPRESSION_RATIO
+            if max_ratio is None
+            else max_ratio
+        )
+        self.extracted_bytes = 0
+        self.extracted_archives = 0
+
+        self._queue = deque()
+        self._queued_paths = set()
+
+    def add(self, *, file_path: Path, target_path: Path):
+        """Queue an uploaded file, archives are extracted to target_path."""
+        if not file_path.is_file():
+            return
+
+        self._enqueue(
+            _ExtractionItem(
+                path=file_path,
+                target_path=target_path,
+                source=_ExtractionSource(
+                    path=file_path, size=file_path.stat().st_size
+                ),
+            )
+        )
 
+    def _enqueue(self, item: _ExtractionItem):
+        if item.path not in self._queued_paths:
+            self._queued_paths.add(item.path)
+            self._queue.append(item)
 
-def check_compressed_and_extract(file_path, target_path, checked_paths=None):
+    def run(self):
+        """Extract all of the archives in the queue."""
+        start = perf_counter()
+
+        while self._queue:
+            item = self._queue.popleft()
+            self._queued_paths.discard(item.path)
+
+            for path in self._extract(item=item):
+                self._enqueue(
+                    _ExtractionItem(
+                        path=path, target_path=path.parent, source=item.source
+                    )
+                )
+
+        if self.extracted_archives:
+            logger.info(
+                f"Extracted {self.extracted_bytes} bytes from "
+                f"{self.extracted_archives} archives in "
+                f"{perf_counter() - start:.2f} seconds"
+            )
+
+    def _extract(self, *, item: _ExtractionItem) -> List[Path]:
+        if not item.path.is_file():
+            # Overwritten by a directory in another archive
+            return []
+
+        if tarfile.is_tarfile(item.path):
+            with tarfile.open(item.path) as tf:
+                extracted = self._extract_members(
+                    file=tf, item=item, is_tar=True
+                )
+        elif zipfile.is_zipfile(item.path):
+            with zipfile.ZipFile(item.path) as zf:
+                extracted = self._extract_members(
+                    file=zf, item=item, is_tar=False
+                )
+        else:
+            return []
+
+        # Make sure files have actually been extracted, then delete the archive
+        if extracted:
+            item.path.unlink()
+            self.extracted_archives += 1
+
+        return extracted
+
+    def _extract_members(self, *, file, item: _ExtractionItem, is_tar: bool):
+        list_func = file.getmembers if is_tar else file.infolist
+        filename_attr = "name" if is_tar else "filename"
+        is_dir_func = "isdir" if is_tar else "is_dir"
+        size_attr = "size" if is_tar else "file_size"
+
+        extracted = {}
+
+        for info in sorted(
+            list_func(), key=lambda k: getattr(k, filename_attr)
+        ):
+            # Skip directories
+            if getattr(info, is_dir_func)():
+                continue
+
+            _check_sanity(info, is_tar, item.target_path)
+
+            # Skip devices and fifos
+            if is_tar and not info.isfile():
+                continue
+
+            try:
+                dest = Path(
+                    safe_join(item.target_path, getattr(info, filename_attr))
+                )
+            except SuspiciousFileOperation:
+                raise ValidationError(
+                    "Archive members must be inside of the archive."
+                )
+
+            # Fail early when the archive reports a size that is too large
+            self._check_limits(
+                source=item.source, size=getattr(info, size_attr)
+            )
+
+            dest.parent.mkdir(parents=True, exist_ok=True)
+
+            src = file.extractfile(info) if is_tar else file.open(info)
+            with src, open(dest, "wb") as dst:
+                while True:
+                    chunk = src.read(EXTRACTION_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    self._consume(source=item.source, size=len(chunk))
+                    dst.write(chunk)
+
+            extracted[dest] = None
+
+        return list(extracted)
+
+    def _consume(self, *, source: _ExtractionSource, size: int):
+        self._check_limits(source=source, size=size)
+        source.extracted_bytes += size
+        self.extracted_bytes += size
+
+    def _check_limits(self, *, source: _ExtractionSource, size: int):
+        if self.extracted_bytes + size > self.max_bytes:
+            raise ProvisioningError(
+                f"The extracted files exceed the maximum size of "
+                f"{self.max_bytes} bytes."
+            )
+
+        if source.extracted_bytes + size > self.max_ratio * max(
+            source.size, 1
+        ):
+            raise ProvisioningError(
+                f"The compression ratio of {source.path.name} exceeds the "
+                f"maximum of {self.max_ratio}."
+            )
+
+
+def check_compressed_and_extract(file_path: Path, target_path: Path):
     """
     Checks if `file_path` is a zip or tar file and if so, extracts it.
 
@@ -209,45 +419,17 @@ def check_compressed_and_extract(file_path, target_path, checked_paths=None):
         The file path to be checked and possibly extracted.
     target_path:
         The path to which the contents of `file_path` are to be extracted.
-    checked_paths:
-        Files that have already been extracted.
     """
-
-    def extract_file(fp):
-        is_extracted = False
-        if tarfile.is_tarfile(fp):
-            with tarfile.open(fp) as tf:
-                is_extracted = extract(tf, target_path, is_tar=True)
-        elif zipfile.is_zipfile(fp):
-            with zipfile.ZipFile(fp) as zf:
-                is_extracted = extract(zf, target_path)
-
-        # Make sure files have actually been extracted, then delete the archive
-        if is_extracted:
-            fp.unlink()
-        return is_extracted
-
-    if checked_paths is None:
-        checked_paths = []
-    if file_path in checked_paths:
-        return
-    checked_paths.append(file_path)
-
-    extracted = extract_file(file_path)
-
-    # check zips in zips
-    if extracted:
-        for root, _, files in os.walk(target_path):
-            for file in files:
-                check_compressed_and_extract(
-                    Path(os.path.join(root, file)), root, checked_paths
-                )
+    extractor = ArchiveExtractor()
+    extractor.add(file_path=file_path, target_path=target_path)
+    extractor.run()
 
 
 def extract_files(source_path: Path):
-    checked_paths = []
+    extractor = ArchiveExtractor()
     for file_path in source_path.iterdir():
-        check_compressed_and_extract(file_path, source_path, checked_paths)
+        extractor.add(file_path=file_path, target_path=source_path)
+    extractor.run()
 
 
 @shared_task
@@ -294,6 +476,8 @@ def build_images(*, upload_session_pk):
     upload_session.status = upload_session.STARTED
     upload_session.save()
 
+    started_at = perf_counter()
+
     with TemporaryDirectory(prefix="construct_image_volumes-") as tmp_dir:
         tmp_dir = Path(tmp_dir)
 
@@ -317,6 +501,10 @@ def build_images(*, upload_session_pk):
         else:
             upload_session.status = upload_session.SUCCESS
             upload_session.save()
+        finally:
+            metrics.UPLOAD_SESSIONS_IMPORT_DURATION.observe(
+                perf_counter() - started_at
+            )
 
 
 def _handle_raw_image_files(tmp_dir, upload_session):
@@ -324,18 +512,19 @@ def _handle_raw_image_files(tmp_dir, upload_session):
         Path(d[0]).joinpath(f) for d in os.walk(tmp_dir) for f in d[2]
     }
 
-    session_files = [
-        RawImageFile.objects.get_or_create(
-            filename=str(f.relative_to(tmp_dir)),
-            upload_session=upload_session,
-        )[0]
-        for f in input_files
-    ]
+    session_files = _get_or_create_raw_image_files(
+        filenames={str(f.relative_to(tmp_dir)) for f in input_files},
+        upload_session=upload_session,
+    )
+
+    staged_files = load_staged_ajax_files(
+        f.staged_file_id for f in session_files if f.staged_file_id
+    )
 
     filepath_lookup: Dict[str, RawImageFile] = {
         raw_image_file.staged_file_id
         and os.path.join(
-            tmp_dir, StagedAjaxFile(raw_image_file.staged_file_id).name
+            tmp_dir, staged_files[raw_image_file.staged_file_id].name
         )
         or os.path.join(tmp_dir, raw_image_file.filename): raw_image_file
         for raw_image_file in session_files
@@ -356,6 +545,32 @@ def _handle_raw_image_files(tmp_dir, upload_session):
     _delete_session_files(session_files=session_files,)
 
 
+def _get_or_create_raw_image_files(
+    *, filenames: Set[str], upload_session: RawImageUploadSession
+) -> List[RawImageFile]:
+    """Get or create the RawImageFiles for the filenames in bulk."""
+    existing_files = {
+        f.filename: f
+        for f in upload_session.rawimagefile_set.filter(filename__in=filenames)
+    }
+
+    new_files = RawImageFile.objects.bulk_create(
+        [
+            RawImageFile(filename=filename, upload_session=upload_session)
+            for filename in sorted(filenames - existing_files.keys())
+        ]
+    )
+
+    if new_files and upload_session.creator:
+        assign_perm(
+            f"view_{RawImageFile._meta.model_name}",
+            upload_session.creator,
+            RawImageFile.objects.filter(pk__in=[f.pk for f in new_files]),
+        )
+
+    return [*existing_files.values(), *new_files]
+
+
 @dataclass
 class ImporterResult:
     new_images: Set[Image]
@@ -398,6 +613,9 @@ def import_images(
         _check_all_ids(panimg_result=panimg_result)
 
         django_result = _convert_panimg_to_django(panimg_result=panimg_result)
+        django_result.new_image_files |= _create_preview_files(
+            panimg_result=panimg_result
+        )
 
         _store_images(
             origin=origin,
@@ -441,6 +659,42 @@ class ConversionResult:
     new_folders: Set[FolderUpload]
 
 
+def _create_preview_files(*, panimg_result: PanImgResult) -> Set[ImageFile]:
+    """Render the previews of the new images from their local files."""
+    files_per_image = defaultdict(list)
+    for f in panimg_result.new_image_files:
+        if f.image_type == ImageFile.IMAGE_TYPE_MHD:
+            files_per_image[f.image_id].append(f.file)
+
+    preview_files = set()
+
+    for image_id, files in files_per_image.items():
+        headers = [f for f in files if f.suffix in {".mha", ".mhd"}]
+
+        if (
+            len(headers) != 1
+            or sum(f.stat().st_size for f in files)
+            > settings.MAX_SITK_FILE_SIZE
+        ):
+            continue
+
+        try:
+            preview_files.update(
+                create_preview_files(
+                    image_id=image_id,
+                    image_itk=SimpleITK.ReadImage(str(headers[0])),
+                )
+            )
+        except Exception:
+            # Previews are optional, they are rendered on demand instead
+            logger.warning(
+                f"Could not create previews for {headers[0].name}",
+                exc_info=True,
+            )
+
+    return preview_files
+
+
 def _convert_panimg_to_django(
     *, panimg_result: PanImgResult
 ) -> ConversionResult:
@@ -471,15 +725,67 @@ def _store_images(
     image_files: Set[ImageFile],
     folders: Set[FolderUpload],
 ):
+    for image in images:
+        image.origin = origin
+
     with transaction.atomic():
-        for image in images:
-            image.origin = origin
-            image.full_clean()
-            image.save()
+        _bulk_full_clean(model=Image, objs=images)
+        Image.objects.bulk_create(images)
+
+        # Attach the images so that the upload paths do not query for them
+        images_by_pk = {image.pk: image for image in images}
+        for image_file in image_files:
+            if image_file.image_id in images_by_pk:
+                image_file.image = images_by_pk[image_file.image_id]
+
+        _bulk_full_clean(model=ImageFile, objs=image_files)
+        ImageFile.objects.bulk_create(image_files)
+
+        for folder in folders:
+            folder.full_clean()
+            folder.save()
 
-        for obj in chain(image_files, folders):
-            obj.full_clean()
-            obj.save()
+
+def _bulk_full_clean(*, model, objs: Iterable[models.Model]):
+    """
+    Validates many new instances of a model.
+
+    This is equivalent to calling full_clean on each instance, but the
+    foreign keys and primary keys are checked with one query per field
+    rather than one query per instance.
+    """
+    foreign_keys = [f for f in model._meta.concrete_fields if f.is_relation]
+
+    for obj in objs:
+        obj.full_clean(
+            exclude=[f.name for f in foreign_keys], validate_unique=False
+        )
+
+    for field in foreign_keys:
+        values = {getattr(obj, field.attname) for obj in objs}
+
+        if None in values and not field.blank:
+            raise ValidationError({field.name: "This field cannot be blank."})
+
+        values.discard(None)
+        target = field.target_field.attname
+        found = (
+            field.remote_field.model._base_manager.filter(
+                **{f"{target}__in": values}
+            )
+            .values_list(target, flat=True)
+            .distinct()
+        )
+
+        if len(found) != len(values):
+            raise ValidationError(
+                {field.name: f"{field.verbose_name} instance does not exist."}
+            )
+
+    if model._base_manager.filter(pk__in=[obj.pk for obj in objs]).exists():
+        raise ValidationError(
+            f"{model._meta.verbose_name} with this Id already exists."
+        )
 
 
 def _handle_raw_files(
@@ -498,7 +804,6 @@ def _handle_raw_files(
         raw_image = filepath_lookup[str(filepath)]
         raw_image.error = None
         raw_image.consumed = True
-        raw_image.save()
 
     for filepath in unconsumed_files:
         raw_file = filepath_lookup[str(filepath)]
@@ -507,7 +812,11 @@ def _handle_raw_files(
             f"File could not be processed by any image builder:\n\n{error}"
         )
         n_errors += 1
-        raw_file.save()
+
+    RawImageFile.objects.bulk_update(
+        [filepath_lookup[str(f)] for f in input_files],
+        fields=["error", "consumed"],
+    )
 
     if unconsumed_files:
         upload_session.error_message = (
@@ -522,24 +831,35 @@ def _delete_session_files(*, session_files):
     dicom_group = Group.objects.get(
         name=settings.DICOM_DATA_CREATORS_GROUP_NAME
     )
-    users = dicom_group.user_set.values_list("username", flat=True)
+    users = set(dicom_group.user_set.values_list("username", flat=True))
+
+    retained_files = []
+    deleted_files = []
+
     for file in session_files:
-        try:
-            if file.staged_file_id:
-                saf = StagedAjaxFile(file.staged_file_id)
-
-                if (
-                    not file.consumed
-                    and Path(file.filename).suffix == ".dcm"
-                    and getattr(file.creator, "username", None) in users
-                ):
-                    saf.staged_files.update(
-                        timeout=timezone.now() + timedelta(days=90)
-                    )
-                    continue
+        if not file.staged_file_id:
+            continue
+        elif (
+            not file.consumed
+            and Path(file.filename).suffix == ".dcm"
+            and getattr(file.creator, "username", None) in users
+        ):
+            retained_files.append(file)
+        else:
+            deleted_files.append(file)
+
+    StagedFile.objects.filter(
+        file_id__in=[f.staged_file_id for f in retained_files]
+    ).update(timeout=timezone.now() + timedelta(days=90))
+
+    chunks = StagedFile.objects.filter(
+        file_id__in=[f.staged_file_id for f in deleted_files]
+    )
+    for chunk in chunks:
+        chunk.file.storage.delete(name=chunk.file.name)
+    chunks.delete()
+
+    for file in deleted_files:
+        file.staged_file_id = None
 
-                file.staged_file_id = None
-                saf.delete()
-            file.save()
-        except NotFoundError:
-            pass
+    RawImageFile.objects.bulk_update(deleted_files, fields=["staged_file_id"])
@@ -23,6 +23,7 @@ from rest_framework.viewsets import GenericViewSet, ReadOnlyModelViewSet
 from rest_framework_guardian.filters import ObjectPermissionsFilter
 
 from grandchallenge.algorithms.tasks import create_algorithm_jobs_for_session
+from grandchallenge.api.mixins import StreamingExportMixin
 from grandchallenge.archives.tasks import add_images_to_archive
 from grandchallenge.cases.models import (
     Image,
@@ -99,7 +100,7 @@ class OSDImageDetail(
         return context
 
 
-class ImageViewSet(ReadOnlyModelViewSet):
+class ImageViewSet(StreamingExportMixin, ReadOnlyModelViewSet):
     serializer_class = HyperlinkedImageSerializer
     queryset = Image.objects.all().prefetch_related(
         "files",
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from grandchallenge.challenges.models import Challenge
+from grandchallenge.challenges.tasks import update_cached_results
+from grandchallenge.evaluation.models import Evaluation, Phase
+from grandchallenge.subdomains.cache import invalidate_challenge
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def update_cached_num_participants(instance, action, reverse, pk_set, **_):
+    if action not in ["post_add", "post_remove", "pre_clear", "post_clear"]:
+        # nothing to do for the other actions
+        return
+
+    if action == "pre_clear":
+        if not reverse:
+            # The groups of this user are unknown after they are cleared
+            instance._cleared_challenge_pks = list(
+                Challenge.objects.filter(
+                    participants_group__user=instance
+                ).values_list("pk", flat=True)
+            )
+        return
+
+    if reverse:
+        challenges = Challenge.objects.filter(participants_group=instance)
+    elif action == "post_clear":
+        challenges = Challenge.objects.filter(
+            pk__in=instance.__dict__.pop("_cleared_challenge_pks", [])
+        )
+    else:
+        challenges = Challenge.objects.filter(participants_group__in=pk_set)
+
+    update_cached_results(challenges=challenges)
+
+
+@receiver(post_save, sender=Evaluation)
+def update_cached_results_on_save(instance, created, **_):
+    if created or instance.published != instance._published_orig:
+        update_cached_results(
+            challenges=Challenge.objects.filter(
+                phase__submission__evaluation=instance
+            )
+        )
+
+
+@receiver(post_delete, sender=Evaluation)
+def update_cached_results_on_delete(instance, **_):
+    update_cached_results(
+        challenges=Challenge.objects.filter(
+            phase__submission=instance.submission_id
+        )
+    )
+
+
+@receiver(post_save, sender=Challenge)
+@receiver(post_delete, sender=Challenge)
+def invalidate_cached_challenge(instance, **_):
+    invalidate_challenge(short_name=instance.short_name)
+
+
+@receiver(post_save, sender=Phase)
+@receiver(post_delete, sender=Phase)
+def invalidate_cached_phase_challenge(instance, **_):
+    invalidate_challenge(short_name=instance.challenge.short_name)
@@ -1,5 +1,8 @@
 from celery import shared_task
+from django.contrib.auth import get_user_model
 from django.core.mail import mail_managers
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from requests import exceptions, get
 
 from grandchallenge.challenges.models import Challenge, ExternalChallenge
@@ -7,31 +10,51 @@ from grandchallenge.evaluation.models import Evaluation
 from grandchallenge.subdomains.utils import reverse
 
 
-@shared_task
-def update_challenge_results_cache():
-    for c in Challenge.objects.all():
-        kwargs = {
-            "cached_num_participants": c.participants_group.user_set.all().count()
-        }
+def update_cached_results(*, challenges):
+    """
+    Update the cached participant and result statistics of challenges.
 
-        challenge_results = Evaluation.objects.filter(
-            submission__phase__challenge=c, published=True
-        ).order_by("-created")
+    All of the challenges in the queryset are updated with a single query,
+    so this is used both by the signal handlers for the challenges affected
+    by a change, and to reconcile the cached values of all challenges.
+    """
+    participants = (
+        get_user_model()
+        .groups.through.objects.filter(group=OuterRef("participants_group"))
+        .order_by()
+        .values("group")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    results = Evaluation.objects.filter(
+        submission__phase__challenge=OuterRef("pk"), published=True
+    ).order_by()
 
-        try:
-            kwargs.update(
-                {
-                    "cached_num_results": challenge_results.count(),
-                    "cached_latest_result": challenge_results.first().created,
-                }
-            )
-        except AttributeError:
-            # No results for this challenge
-            kwargs.update(
-                {"cached_num_results": 0, "cached_latest_result": None}
-            )
+    challenges.update(
+        cached_num_participants=Coalesce(Subquery(participants), 0),
+        cached_num_results=Coalesce(
+            Subquery(
+                results.values("submission__phase__challenge")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        ),
+        cached_latest_result=Subquery(
+            results.order_by("-created").values("created")[:1]
+        ),
+    )
 
-        Challenge.objects.filter(pk=c.pk).update(**kwargs)
+
+@shared_task
+def update_challenge_results_cache():
+    """
+    Reconcile the cached results of all challenges.
+
+    The cached values are maintained by signals, but these are not sent
+    for bulk operations, so this repairs any drift.
+    """
+    update_cached_results(challenges=Challenge.objects.all())
 
 
 @shared_task
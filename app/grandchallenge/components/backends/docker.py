@@ -1,5 +1,6 @@
 import io
 import json
+import logging
 import os
 import re
 import sys
@@ -8,22 +9,31 @@ from contextlib import contextmanager
 from pathlib import Path
 from random import randint
 from shutil import copyfileobj
-from tempfile import SpooledTemporaryFile
-from time import sleep
-from typing import Tuple
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+from typing import Iterable, Iterator, Tuple
 
 import docker
 from django.conf import settings
 from django.core.files import File
-from django.core.files.temp import NamedTemporaryFile
+from django.core.files.base import ContentFile
 from django.db.models import Model, QuerySet
+from django.utils._os import safe_join
 from docker.api.container import ContainerApiMixin
 from docker.errors import APIError, ImageNotFound
 from docker.tls import TLSConfig
 from docker.types import LogConfig
 from requests import HTTPError
 
-MAX_SPOOL_SIZE = 1_000_000_000  # 1GB
+from grandchallenge.components.backends.image_cache import (
+    DockerImageCache,
+    record_cache_hit,
+    record_cache_miss,
+)
+
+logger = logging.getLogger(__name__)
+
+TAR_STREAM_CHUNK_SIZE = 1024 * 1024  # 1MB
 LOGLINES = 2000  # The number of loglines to keep
 
 # Docker logline error message with optional RFC3339 timestamp
@@ -173,22 +183,47 @@ class DockerConnection:
         self.stop_and_cleanup()
 
     def _pull_images(self):
+        if self._exec_image_loaded:
+            record_cache_hit(image_sha256=self._exec_image_sha256)
+        else:
+            record_cache_miss(image_sha256=self._exec_image_sha256)
+            self._load_exec_image()
+
+        self._update_image_cache()
+
+    def preload_image(self):
+        """Load the exec image on the docker host before it is needed."""
+        if not self._exec_image_loaded:
+            self._load_exec_image()
+
+        self._update_image_cache()
+
+    @property
+    def _exec_image_loaded(self) -> bool:
         try:
             self._client.images.get(name=self._exec_image_sha256)
         except ImageNotFound:
-            # This can take a long time so increase the default timeout #1330
-            old_timeout = self._client.api.timeout
-            self._client.api.timeout = 600  # 10 minutes
+            return False
+        else:
+            return True
 
-            with SpooledTemporaryFile(
-                max_size=MAX_SPOOL_SIZE
-            ) as fdst, self._exec_image.open("rb") as fsrc:
-                copyfileobj(fsrc=fsrc, fdst=fdst)
-                fdst.seek(0)
-                self._client.images.load(fdst)
+    def _load_exec_image(self):
+        # This can take a long time so increase the default timeout #1330
+        old_timeout = self._client.api.timeout
+        self._client.api.timeout = 600  # 10 minutes
 
+        try:
+            # The file is streamed from storage to the docker api
+            with self._exec_image.open("rb") as f:
+                self._client.images.load(f)
+        finally:
             self._client.api.timeout = old_timeout
 
+    def _update_image_cache(self):
+        image_cache = DockerImageCache(client=self._client)
+        image_cache.touch(image_sha256=self._exec_image_sha256)
+        image_cache.evict(keep=self._exec_image_sha256)
+
 
 class Executor(DockerConnection):
     def __init__(
@@ -210,6 +245,9 @@ class Executor(DockerConnection):
         self._stderr = ""
         self._result = {}
 
+        self._provisioning_bytes = 0
+        self._provisioning_duration = 0.0
+
     def execute(self):
         self._pull_images()
         self._create_io_volumes()
@@ -230,6 +268,19 @@ class Executor(DockerConnection):
     def result(self):
         return self._result
 
+    @property
+    def provisioning_duration(self) -> float:
+        """The time in seconds that was spent provisioning the inputs."""
+        return self._provisioning_duration
+
+    @property
+    def provisioning_throughput(self) -> float:
+        """The rate in bytes/sec at which the inputs were provisioned."""
+        if self._provisioning_duration > 0:
+            return self._provisioning_bytes / self._provisioning_duration
+        else:
+            return 0.0
+
     def _pull_images(self):
         try:
             self._client.images.get(name=self._io_image)
@@ -259,21 +310,47 @@ class Executor(DockerConnection):
             self._copy_input_files(writer=writer)
 
     def _copy_input_files(self, writer):
+        members = []
+
         for input_file in self._input_files:
             if isinstance(input_file, tuple):
                 name, input_file = input_file
                 if not hasattr(input_file, "name"):
-                    file = NamedTemporaryFile(delete=True)
-                    file.write(bytes(json.dumps(input_file), "utf-8"))
-                    file.flush()
-                    input_file = File(file, name=name)
+                    input_file = ContentFile(
+                        bytes(json.dumps(input_file), "utf-8"), name=name
+                    )
             else:
                 name = input_file.name
-            subdirs = os.path.join("/input", *name.split("/")[:-1])
-            writer.exec_run(f"mkdir -p {subdirs}")
-            put_file(
-                container=writer, src=input_file, dest=f"/input/{name}",
-            )
+
+            members.append((name, input_file))
+
+        self._put_archive(container=writer, path="/input/", members=members)
+
+    def _put_archive(
+        self,
+        *,
+        container: ContainerApiMixin,
+        path: str,
+        members: Iterable[Tuple[str, File]],
+    ):
+        """
+        Streams the members to the container in a single tar archive,
+        recording the number of bytes sent and the time taken.
+        """
+        archive = TarStream(members=members)
+
+        start = perf_counter()
+        container.put_archive(path, iter(archive))
+        duration = perf_counter() - start
+
+        self._provisioning_bytes += archive.bytes_written
+        self._provisioning_duration += duration
+
+        logger.info(
+            f"Provisioned {archive.bytes_written} bytes to {path} of "
+            f"{self._job_label} in {duration:.2f}s "
+            f"({self.provisioning_throughput:.0f} bytes/s)"
+        )
 
     def _chmod_volumes(self):
         """Ensure that the i/o directories are writable."""
@@ -343,10 +420,12 @@ class Executor(DockerConnection):
                 labels=self._labels,
                 **self._run_kwargs,
             )
-        ) as reader:
+        ) as reader, TemporaryDirectory() as tmpdir:
+            get_archive(container=reader, src="/output/", dest=tmpdir)
+
             for output in output_interfaces:
                 output.create_component_interface_values(
-                    reader=reader, job=job
+                    output_dir=Path(tmpdir), job=job
                 )
 
 
@@ -454,40 +533,173 @@ def cleanup(container: ContainerApiMixin):
         container.remove(force=True)
 
 
+class TarStream:
+    """
+    Generates a tar archive on the fly from a collection of files.
+
+    Iterating over an instance yields the archive in chunks, reading each
+    file as it goes, so the archive is never held in memory or spooled to
+    disk. The parent directories of each member are added to the archive
+    so that the directory structure is created when it is extracted.
+
+    :param members: An iterable of (name, file) tuples, where name is the
+        path of the file relative to the root of the archive
+    """
+
+    def __init__(
+        self,
+        *,
+        members: Iterable[Tuple[str, File]],
+        chunk_size: int = TAR_STREAM_CHUNK_SIZE,
+    ):
+        self._members = members
+        self._chunk_size = chunk_size
+        self._directories = set()
+        self.bytes_written = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.bytes_written = 0
+
+        for name, src in self._members:
+            name = name.strip("/")
+
+            yield from self._directory_headers(name=name)
+            yield from self._file_blocks(name=name, src=src)
+
+        # Two empty blocks mark the end of the archive, which is then padded
+        # to a full record
+        end = tarfile.NUL * 2 * tarfile.BLOCKSIZE
+        remainder = (self.bytes_written + len(end)) % tarfile.RECORDSIZE
+        if remainder:
+            end += tarfile.NUL * (tarfile.RECORDSIZE - remainder)
+
+        yield self._count(end)
+
+    def _count(self, chunk: bytes) -> bytes:
+        self.bytes_written += len(chunk)
+        return chunk
+
+    def _directory_headers(self, *, name: str) -> Iterator[bytes]:
+        parents = Path(name).parents
+
+        for parent in reversed(parents[:-1]):
+            if parent not in self._directories:
+                self._directories.add(parent)
+
+                tarinfo = tarfile.TarInfo(name=str(parent))
+                tarinfo.type = tarfile.DIRTYPE
+                tarinfo.mode = 0o755
+
+                yield self._count(_tar_header(tarinfo))
+
+    def _file_blocks(self, *, name: str, src: File) -> Iterator[bytes]:
+        tarinfo = tarfile.TarInfo(name=name)
+        tarinfo.size = getattr(src, "size", sys.getsizeof(src))
+
+        yield self._count(_tar_header(tarinfo))
+
+        remaining = tarinfo.size
+
+        with src.open("rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(self._chunk_size, remaining))
+                if not chunk:
+                    raise OSError(f"Unexpected end of data in {name}")
+                remaining -= len(chunk)
+                yield self._count(chunk)
+
+        _, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+        if remainder:
+            yield self._count(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+
+
+def _tar_header(tarinfo: tarfile.TarInfo) -> bytes:
+    return tarinfo.tobuf(
+        format=tarfile.DEFAULT_FORMAT,
+        encoding=tarfile.ENCODING,
+        errors="surrogateescape",
+    )
+
+
 def put_file(*, container: ContainerApiMixin, src: File, dest: str) -> ():
     """
     Puts a file on the host into a container.
-    This method will create an in memory tar archive, add the src file to this
-    and upload it to the docker container where it will be unarchived at dest.
+    This method will stream a tar archive containing the src file to the
+    docker container where it will be unarchived at dest.
 
     :param container: The container to write to
     :param src: The path to the source file on the host
     :param dest: The path to the target file in the container
     :return:
     """
-    with SpooledTemporaryFile(max_size=MAX_SPOOL_SIZE) as tar_b:
-        tarinfo = tarfile.TarInfo(name=os.path.basename(dest))
-        tarinfo.size = getattr(src, "size", sys.getsizeof(src))
+    archive = TarStream(members=[(os.path.basename(dest), src)])
+    container.put_archive(os.path.dirname(dest), iter(archive))
 
-        with tarfile.open(fileobj=tar_b, mode="w") as tar, src.open("rb") as f:
-            tar.addfile(tarinfo, fileobj=f)
 
-        tar_b.seek(0)
-        container.put_archive(os.path.dirname(dest), tar_b)
+class ChunkedStream(io.RawIOBase):
+    """A read only file like object that consumes an iterator of chunks."""
 
+    def __init__(self, chunks: Iterable[bytes]):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self):
+        return True
 
-def get_file(*, container: ContainerApiMixin, src: Path):
-    tarstrm, info = container.get_archive(src)
+    def readinto(self, b):
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
 
-    if info["size"] > 2e9:
-        raise ValueError(f"File {src} is too big to be decompressed.")
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
 
-    file_obj = io.BytesIO()
-    for ts in tarstrm:
-        file_obj.write(ts)
+        return n
 
-    file_obj.seek(0)
-    tar = tarfile.open(mode="r", fileobj=file_obj)
-    content = tar.extractfile(src.name)
 
-    return content
+def get_archive(*, container: ContainerApiMixin, src: str, dest: str):
+    """
+    Gets a directory from a container and extracts it to dest on the host.
+
+    The tar archive is streamed from the docker api and unpacked member by
+    member, so it is never held in memory. Only regular files and
+    directories are extracted, links and special files are skipped.
+
+    :param container: The container to read from
+    :param src: The path to the source directory in the container
+    :param dest: The path to the target directory on the host
+    """
+    tarstrm, _ = container.get_archive(src)
+
+    # The archive contains the source directory itself, so strip it
+    prefix = Path(src).name
+
+    with tarfile.open(
+        fileobj=io.BufferedReader(
+            ChunkedStream(tarstrm), buffer_size=TAR_STREAM_CHUNK_SIZE
+        ),
+        mode="r|",
+    ) as tar:
+        for member in tar:
+            name = Path(member.name)
+
+            if name.parts[:1] == (prefix,):
+                name = name.relative_to(prefix)
+
+            if name == Path(".") or not (member.isfile() or member.isdir()):
+                continue
+
+            target = Path(safe_join(dest, name))
+
+            if member.isdir():
+                target.mkdir(parents=True, exist_ok=True)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with tar.extractfile(member) as fsrc, open(
+                    target, "wb"
+                ) as fdst:
+                    copyfileobj(fsrc, fdst, TAR_STREAM_CHUNK_SIZE)
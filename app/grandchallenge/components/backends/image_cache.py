@@ -0,0 +1,97 @@
+import logging
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache
+from docker.errors import APIError, ImageNotFound
+
+logger = logging.getLogger(__name__)
+
+
+def _counter_key(*, image_sha256: str, counter: str) -> str:
+    return f"components:docker-image-cache:{image_sha256}:{counter}"
+
+
+def _incr(key: str):
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+def record_cache_hit(*, image_sha256: str):
+    _incr(_counter_key(image_sha256=image_sha256, counter="hits"))
+
+
+def record_cache_miss(*, image_sha256: str):
+    _incr(_counter_key(image_sha256=image_sha256, counter="misses"))
+
+
+def get_cache_stats(*, image_sha256: str) -> dict:
+    """The number of times a job found the image already loaded or not."""
+    return {
+        counter: cache.get(
+            _counter_key(image_sha256=image_sha256, counter=counter), 0
+        )
+        for counter in ("hits", "misses")
+    }
+
+
+class DockerImageCache:
+    """
+    Keeps track of the component images loaded on a docker host.
+
+    The last time that each image was used is stored in the cache, keyed by
+    the id of the docker daemon. When the images loaded on the host exceed
+    ``settings.COMPONENTS_DOCKER_IMAGE_CACHE_SIZE_GB``, the least recently
+    used images are removed. Images that are not tracked here (e.g. the io
+    image) are never removed.
+    """
+
+    def __init__(self, *, client):
+        self._client = client
+        self._key = f"components:docker-image-cache:host:{client.info()['ID']}"
+
+    @property
+    def last_used(self) -> dict:
+        return cache.get(self._key, {})
+
+    def touch(self, *, image_sha256: str):
+        last_used = self.last_used
+        last_used[image_sha256] = time()
+        cache.set(self._key, last_used, timeout=None)
+
+    def evict(self, *, keep: str):
+        """Remove the least recently used images until under budget."""
+        budget = settings.COMPONENTS_DOCKER_IMAGE_CACHE_SIZE_GB * 1e9
+        last_used = self.last_used
+
+        sizes = {}
+        for image_sha256 in last_used:
+            try:
+                image = self._client.images.get(name=image_sha256)
+            except ImageNotFound:
+                continue
+            sizes[image_sha256] = image.attrs["Size"]
+
+        total = sum(sizes.values())
+
+        for image_sha256 in sorted(sizes, key=lambda k: last_used[k]):
+            if total <= budget:
+                break
+
+            if image_sha256 == keep:
+                continue
+
+            try:
+                self._client.images.remove(image=image_sha256)
+            except APIError as e:
+                # The image is probably in use by a running container
+                logger.warning(f"Could not remove {image_sha256}: {e}")
+                continue
+
+            total -= sizes.pop(image_sha256)
+
+        cache.set(
+            self._key,
+            {k: v for k, v in last_used.items() if k in sizes},
+            timeout=None,
+        )
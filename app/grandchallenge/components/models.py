@@ -3,8 +3,7 @@ import logging
 from decimal import Decimal
 from json import JSONDecodeError
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import Tuple, Type
+from typing import List, Tuple, Type
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -17,7 +16,6 @@ from django.utils.text import get_valid_filename
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.fields import AutoSlugField
-from docker.errors import NotFound
 from panimg.image_builders import image_builder_mhd, image_builder_tiff
 
 from grandchallenge.cases.models import Image
@@ -25,8 +23,8 @@ from grandchallenge.cases.tasks import import_images
 from grandchallenge.components.backends.docker import (
     ComponentException,
     Executor,
-    get_file,
 )
+from grandchallenge.components.backends.image_cache import get_cache_stats
 from grandchallenge.components.tasks import execute_job, validate_docker_image
 from grandchallenge.components.validators import validate_safe_path
 from grandchallenge.core.storage import (
@@ -37,6 +35,7 @@ from grandchallenge.core.validators import (
     ExtensionValidator,
     MimeTypeValidator,
 )
+from grandchallenge.statistics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -382,48 +381,32 @@ class ComponentInterface(models.Model):
     class Meta:
         ordering = ("pk",)
 
-    def create_component_interface_values(self, *, reader, job):
-        # TODO JM These functions rely on docker specific code (reader)
+    def create_component_interface_values(self, *, output_dir: Path, job):
+        """
+        Create the values for this interface from the contents of the
+        output directory of a job, which has been copied to output_dir.
+        """
         if self.is_image_kind:
-            self._create_images_result(reader=reader, job=job)
+            self._create_images_result(output_dir=output_dir, job=job)
         else:
-            self._create_file_result(reader=reader, job=job)
+            self._create_file_result(output_dir=output_dir, job=job)
 
-    def _create_images_result(self, *, reader, job):
+    def _create_images_result(self, *, output_dir: Path, job):
         # TODO JM in the future this will be a file, not a directory
-        base_dir = Path(self.output_path)
-        found_files = reader.exec_run(f"find {base_dir} -type f")
+        base_dir = Path(safe_join(output_dir, self.relative_path))
 
-        if found_files.exit_code != 0:
-            logger.warning(f"Error listing {base_dir}")
+        if not base_dir.is_dir():
+            logger.warning(f"Error listing {self.output_path}")
             return
 
-        output_files = [
-            base_dir / Path(f)
-            for f in found_files.output.decode().splitlines()
-        ]
-
-        if not output_files:
+        if not any(f.is_file() for f in base_dir.rglob("*")):
             logger.warning("Output directory is empty")
             return
 
-        with TemporaryDirectory() as tmpdir:
-            for file in output_files:
-                temp_file = Path(safe_join(tmpdir, file.relative_to(base_dir)))
-                temp_file.parent.mkdir(parents=True, exist_ok=True)
-
-                with open(temp_file, "wb") as outfile:
-                    infile = get_file(container=reader, src=file)
-
-                    buffer = True
-                    while buffer:
-                        buffer = infile.read(1024)
-                        outfile.write(buffer)
-
-            importer_result = import_images(
-                input_directory=tmpdir,
-                builders=[image_builder_mhd, image_builder_tiff],
-            )
+        importer_result = import_images(
+            input_directory=base_dir,
+            builders=[image_builder_mhd, image_builder_tiff],
+        )
 
         for image in importer_result.new_images:
             civ = ComponentInterfaceValue.objects.create(
@@ -431,11 +414,10 @@ class ComponentInterface(models.Model):
             )
             job.outputs.add(civ)
 
-    def _create_file_result(self, reader, job):
-        output_file = Path(self.output_path)
-        try:
-            file = get_file(container=reader, src=output_file)
-        except NotFound:
+    def _create_file_result(self, *, output_dir: Path, job):
+        output_file = Path(safe_join(output_dir, self.relative_path))
+
+        if not output_file.is_file():
             raise ComponentException(
                 f"The evaluation or algorithm failed for an unknown reason as "
                 f"file {self.output_path} was not produced. Please contact the "
@@ -445,15 +427,16 @@ class ComponentInterface(models.Model):
         if self.save_in_object_store:
             civ = ComponentInterfaceValue.objects.create(interface=self)
             try:
-                civ.file = File(file, name=str(output_file.name))
-                civ.full_clean()
-                civ.save()
+                with open(output_file, "rb") as file:
+                    civ.file = File(file, name=str(output_file.name))
+                    civ.full_clean()
+                    civ.save()
             except ValidationError:
                 raise ComponentException("Invalid filetype.")
         else:
             try:
                 result = json.loads(
-                    file.read().decode(),
+                    output_file.read_text(encoding="utf-8"),
                     parse_constant=lambda x: None,  # Removes -inf, inf and NaN
                 )
             except JSONDecodeError as e:
@@ -593,14 +576,28 @@ class ComponentJob(models.Model):
 
         if status == self.STARTED and self.started_at is None:
             self.started_at = now()
+            self._observe_duration(
+                histograms=metrics.JOB_QUEUE_DURATION,
+                duration=self.started_at - self.created,
+            )
         elif (
             status in [self.SUCCESS, self.FAILURE, self.CANCELLED]
             and self.completed_at is None
         ):
             self.completed_at = now()
+            if self.started_at is not None:
+                self._observe_duration(
+                    histograms=metrics.JOB_EXECUTION_DURATION,
+                    duration=self.completed_at - self.started_at,
+                )
 
         self.save()
 
+    def _observe_duration(self, *, histograms, duration):
+        histogram = histograms.get(self._meta.label_lower)
+        if histogram is not None:
+            histogram.observe(duration.total_seconds())
+
     @property
     def container(self) -> "ComponentImage":
         """
@@ -702,6 +699,19 @@ class ComponentImage(models.Model):
         default=Decimal("1.0"), max_digits=4, decimal_places=2
     )
 
+    @property
+    def preload_queues(self) -> List[str]:
+        """The queues of the workers that will execute this image"""
+        if self.requires_gpu:
+            return ["gpu"]
+        else:
+            return ["evaluation"]
+
+    @property
+    def cache_stats(self) -> dict:
+        """The number of times jobs found this image loaded or not"""
+        return get_cache_stats(image_sha256=self.image_sha256)
+
     def save(self, *args, **kwargs):
         adding = self._state.adding
 
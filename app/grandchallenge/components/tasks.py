@@ -14,7 +14,10 @@ from django.db import OperationalError
 from django.db.models import DateTimeField, ExpressionWrapper, F
 from django.utils.timezone import now
 
-from grandchallenge.components.backends.docker import ComponentException
+from grandchallenge.components.backends.docker import (
+    ComponentException,
+    DockerConnection,
+)
 from grandchallenge.components.emails import send_invalid_dockerfile_email
 from grandchallenge.jqfileupload.widgets.uploader import StagedAjaxFile
 
@@ -43,6 +46,16 @@ def validate_docker_image(*, pk: uuid.UUID, app_label: str, model_name: str):
         image_sha256=f"sha256:{image_sha256}", ready=True
     )
 
+    for queue in instance.preload_queues:
+        preload_docker_image.apply_async(
+            kwargs={
+                "pk": pk,
+                "app_label": app_label,
+                "model_name": model_name,
+            },
+            queue=queue,
+        )
+
 
 def _validate_docker_image_manifest(*, model, instance) -> str:
     manifest = _extract_docker_image_file(
@@ -99,6 +112,30 @@ def _extract_docker_image_file(*, model, instance, filename: str):
         raise ValidationError("Invalid Dockerfile")
 
 
+@shared_task
+def preload_docker_image(*, pk: uuid.UUID, app_label: str, model_name: str):
+    """
+    Load a container image on the docker host of the worker.
+
+    The image is then already available when the first job that uses it is
+    executed. Only one worker on each queue receives this task, the other
+    workers will load the image when it is first used.
+    """
+    model = apps.get_model(app_label=app_label, model_name=model_name)
+
+    instance = model.objects.get(pk=pk)
+
+    if not instance.ready:
+        raise RuntimeError("Image is not ready to be loaded.")
+
+    DockerConnection(
+        job_id=f"preload-{instance.pk}",
+        job_class=model,
+        exec_image=instance.image,
+        exec_image_sha256=instance.image_sha256,
+    ).preload_image()
+
+
 def retry_if_dropped(func):
     """
     Retry a function that relies on an open database connection.
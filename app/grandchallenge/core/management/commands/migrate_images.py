@@ -21,7 +21,10 @@ class Command(BaseCommand):
             page = paginator.page(idx)
 
             for im in page.object_list:
-                for f in im.files.exclude(image_type=ImageFile.IMAGE_TYPE_DZI):
+                for f in im.download_files:
+                    if f.image_type == ImageFile.IMAGE_TYPE_DZI:
+                        continue
+
                     old_name = f.file.name
                     new_name = image_file_path(f, Path(f.file.name).name)
 
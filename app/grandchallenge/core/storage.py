@@ -1,5 +1,8 @@
 import copy
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from math import ceil
 from uuid import uuid4
 
 from botocore.signers import CloudFrontSigner
@@ -15,6 +18,12 @@ from django.utils.text import get_valid_filename
 from django.utils.timezone import now
 from storages.backends.s3boto3 import S3Boto3Storage
 
+# Limits for multipart uploads, see
+# https://docs.aws.amazon.com/AmazonS3/latest/userguide/qfacts.html
+MULTIPART_MIN_PART_SIZE = 5 * 1024 * 1024  # 5 MiB
+MULTIPART_MAX_PART_SIZE = 5 * 1024 * 1024 * 1024  # 5 GiB
+MULTIPART_MAX_PARTS = 10_000
+
 
 class S3Storage(S3Boto3Storage):
     """
@@ -42,6 +51,86 @@ class S3Storage(S3Boto3Storage):
             Key=to_name,
         )
 
+    def compose(self, *, from_names, to_name, max_workers=8):
+        """
+        Concatenates objects in this bucket into a new object.
+
+        The objects are copied server side with a multipart upload, so the
+        data is never downloaded. S3 requires all of the parts, apart from
+        the last, to be at least MULTIPART_MIN_PART_SIZE, so a ValueError
+        is raised if any object apart from the last one is smaller than this.
+        """
+        to_name = self._normalize_name(self._clean_name(to_name))
+
+        parts = []
+        for from_name in from_names:
+            size = self.size(from_name)
+
+            if size == 0:
+                continue
+
+            name = self._normalize_name(self._clean_name(from_name))
+
+            # Objects larger than the maximum part size are split evenly
+            num_parts = ceil(size / MULTIPART_MAX_PART_SIZE)
+            part_size = ceil(size / num_parts)
+
+            for start in range(0, size, part_size):
+                end = min(start + part_size, size) - 1
+                parts.append((name, start, end))
+
+        if any(
+            end - start + 1 < MULTIPART_MIN_PART_SIZE
+            for _, start, end in parts[:-1]
+        ):
+            raise ValueError(
+                f"Only the last object can be smaller than "
+                f"{MULTIPART_MIN_PART_SIZE} bytes"
+            )
+
+        if len(parts) > MULTIPART_MAX_PARTS:
+            raise ValueError(
+                f"Cannot compose more than {MULTIPART_MAX_PARTS} parts"
+            )
+
+        client = self.connection.meta.client
+        upload_id = client.create_multipart_upload(
+            Bucket=self.bucket_name, Key=to_name
+        )["UploadId"]
+
+        def copy_part(part_number, part):
+            name, start, end = part
+            response = client.upload_part_copy(
+                Bucket=self.bucket_name,
+                Key=to_name,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                CopySource={"Bucket": self.bucket_name, "Key": name},
+                CopySourceRange=f"bytes={start}-{end}",
+            )
+            return {
+                "ETag": response["CopyPartResult"]["ETag"],
+                "PartNumber": part_number,
+            }
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                completed_parts = list(
+                    executor.map(copy_part, range(1, len(parts) + 1), parts)
+                )
+
+            client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=to_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed_parts},
+            )
+        except Exception:
+            client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=to_name, UploadId=upload_id
+            )
+            raise
+
 
 @deconstructible
 class PrivateS3Storage(S3Storage):
@@ -79,34 +168,57 @@ class ProtectedS3Storage(S3Storage):
 
         https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/cloudfront.html#id57
         """
-        name = self._normalize_name(self._clean_name(name))
+        return self.cloudfront_signed_urls(
+            names=[name], domain=domain, expire=expire
+        )[name]
+
+    def cloudfront_signed_urls(self, *, names, domain=None, expire=None):
+        """
+        Create signed urls for many files that all expire at the same time.
 
+        Returns a dictionary of the signed url for each name.
+        """
         if domain is None:
             domain = settings.PROTECTED_S3_STORAGE_CLOUDFRONT_DOMAIN
 
-        url = f"https://{domain}/{filepath_to_uri(name)}"
-
         if expire is None:
             expire = now() + datetime.timedelta(
                 seconds=settings.CLOUDFRONT_URL_EXPIRY_SECONDS
             )
 
-        return self._cloudfront_signer.generate_presigned_url(
-            url, date_less_than=expire
-        )
+        signer = self._cloudfront_signer
+        urls = {}
+
+        for name in names:
+            key = self._normalize_name(self._clean_name(name))
+            urls[name] = signer.generate_presigned_url(
+                f"https://{domain}/{filepath_to_uri(key)}",
+                date_less_than=expire,
+            )
+
+        return urls
 
     @property
     def _cloudfront_signer(self):
-        with open(settings.CLOUDFRONT_PRIVATE_KEY_PATH, "rb") as key_file:
-            private_key = serialization.load_pem_private_key(
-                key_file.read(), password=None, backend=default_backend()
-            )
+        return _get_cloudfront_signer(
+            key_pair_id=settings.CLOUDFRONT_KEY_PAIR_ID,
+            private_key_path=settings.CLOUDFRONT_PRIVATE_KEY_PATH,
+        )
+
 
-        return CloudFrontSigner(
-            settings.CLOUDFRONT_KEY_PAIR_ID,
-            lambda m: private_key.sign(m, padding.PKCS1v15(), hashes.SHA1()),
+@lru_cache(maxsize=1)
+def _get_cloudfront_signer(*, key_pair_id, private_key_path):
+    """The private key is only read and parsed once per process."""
+    with open(private_key_path, "rb") as key_file:
+        private_key = serialization.load_pem_private_key(
+            key_file.read(), password=None, backend=default_backend()
         )
 
+    return CloudFrontSigner(
+        key_pair_id,
+        lambda m: private_key.sign(m, padding.PKCS1v15(), hashes.SHA1()),
+    )
+
 
 @deconstructible
 class PublicS3Storage(S3Storage):
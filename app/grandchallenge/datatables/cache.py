@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+def _version_key(*, model, pk) -> str:
+    return f"datatables:version:{model._meta.label_lower}:{pk}"
+
+
+def _counter_key(*, view: str, counter: str) -> str:
+    return f"datatables:{view}:{counter}"
+
+
+def _incr(key: str):
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+def get_version(*, model, pk) -> int:
+    """The current version of the cached pages of an object."""
+    return cache.get(_version_key(model=model, pk=pk), 0)
+
+
+def increment_version(*, model, pk):
+    """
+    Invalidate the cached pages of an object.
+
+    This is called by the signal handlers, but must be called explicitly
+    after bulk operations as these do not send signals.
+    """
+    _incr(_version_key(model=model, pk=pk))
+
+
+def _get_path(instance, path):
+    for attr in path.split("__"):
+        instance = getattr(instance, attr)
+    return instance
+
+
+def connect_version_signals(*, model, version_model, path):
+    """
+    Invalidate the cached pages of an object when its dependencies change.
+
+    Parameters
+    ----------
+    model
+        The model whose instances the cached pages depend on.
+    version_model
+        The model of the object that the pages are cached for.
+    path
+        The lookup from an instance of ``model`` to the primary key of the
+        ``version_model`` instance, e.g. ``submission__phase_id``.
+    """
+    uid = (
+        f"datatables-version-{version_model._meta.label_lower}-"
+        f"{model._meta.label_lower}"
+    )
+
+    def on_change(instance, **_):
+        pk = _get_path(instance, path)
+        if pk is not None:
+            increment_version(model=version_model, pk=pk)
+
+    def on_m2m_change(field):
+        def handler(instance, action, reverse, pk_set, **_):
+            if reverse and action == "pre_clear":
+                # The affected instances are not known after the clear
+                objects = model.objects.filter(**{field.name: instance})
+            elif reverse and action in ["post_add", "post_remove"]:
+                objects = model.objects.filter(pk__in=pk_set)
+            elif not reverse and action in [
+                "post_add",
+                "post_remove",
+                "post_clear",
+            ]:
+                objects = [instance]
+            else:
+                return
+
+            for pk in {_get_path(o, path) for o in objects} - {None}:
+                increment_version(model=version_model, pk=pk)
+
+        return handler
+
+    post_save.connect(on_change, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid=uid)
+
+    for field in model._meta.local_many_to_many:
+        m2m_changed.connect(
+            on_m2m_change(field),
+            sender=field.remote_field.through,
+            weak=False,
+            dispatch_uid=f"{uid}-{field.name}",
+        )
+
+
+def record_cache_hit(*, view: str):
+    _incr(_counter_key(view=view, counter="hits"))
+
+
+def record_cache_miss(*, view: str):
+    _incr(_counter_key(view=view, counter="misses"))
+
+
+def get_cache_stats(*, view: str) -> dict:
+    """The number of requests for a view that were served from the cache."""
+    stats = {
+        counter: cache.get(_counter_key(view=view, counter=counter), 0)
+        for counter in ("hits", "misses")
+    }
+    total = stats["hits"] + stats["misses"]
+    stats["ratio"] = stats["hits"] / total if total else 0.0
+    return stats
@@ -1,18 +1,27 @@
 from dataclasses import dataclass
 from functools import reduce
+from hashlib import sha256
 from operator import or_
 from typing import Tuple
 
+from django.core.cache import cache
 from django.db.models import Q
 from django.http import JsonResponse
 from django.template.loader import render_to_string
 from django.views.generic import ListView
 
+from grandchallenge.datatables.cache import (
+    get_version,
+    record_cache_hit,
+    record_cache_miss,
+)
+
 
 class PaginatedTableListView(ListView):
     columns = []
     search_fields = []
     default_sort_column = 0
+    cache_timeout = 300
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(object_list=object_list, **kwargs)
@@ -37,32 +46,103 @@ class PaginatedTableListView(ListView):
         ]
 
     def get(self, request, *args, **kwargs):
-        response = super().get(request, *args, **kwargs)
         if request.META.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest":
-            start = int(request.GET.get("start", 0))
-            page_size = int(request.GET.get("length"))
-            search = request.GET.get("search[value]")
-            page = start // page_size + 1
-            order_by = request.GET.get("order[0][column]")
-            order_by = (
-                self.columns[int(order_by)].sort_field
-                if order_by
-                else self.order_by
-            )
-            order_dir = request.GET.get("order[0][dir]", "desc")
-            order_by = f"{'-' if order_dir == 'desc' else ''}{order_by}"
-            data = self.filter_queryset(self.object_list, search, order_by)
-            paginator = self.get_paginator(queryset=data, per_page=page_size)
-            objects = paginator.page(page)
             return JsonResponse(
                 {
                     "draw": int(request.GET.get("draw")),
-                    "recordsTotal": self.object_list.count(),
-                    "recordsFiltered": paginator.count,
-                    "data": self.render_rows(object_list=objects),
+                    **self.get_table_data(),
                 }
             )
-        return response
+        return super().get(request, *args, **kwargs)
+
+    def get_table_data(self):
+        if self.get_cache_version_object() is None:
+            return self.render_table_data()
+
+        key = self.get_table_cache_key()
+        view = self.cache_view_name
+        data = cache.get(key)
+
+        if data is None:
+            record_cache_miss(view=view)
+            data = self.render_table_data()
+            cache.set(key, data, timeout=self.cache_timeout)
+        else:
+            record_cache_hit(view=view)
+
+        return data
+
+    def render_table_data(self):
+        self.object_list = self.get_queryset()
+
+        start = int(self.request.GET.get("start", 0))
+        page_size = int(self.request.GET.get("length"))
+        search = self.request.GET.get("search[value]")
+        page = start // page_size + 1
+        order_by = self.request.GET.get("order[0][column]")
+        order_by = (
+            self.columns[int(order_by)].sort_field
+            if order_by
+            else self.order_by
+        )
+        order_dir = self.request.GET.get("order[0][dir]", "desc")
+        order_by = f"{'-' if order_dir == 'desc' else ''}{order_by}"
+        data = self.filter_queryset(self.object_list, search, order_by)
+        paginator = self.get_paginator(queryset=data, per_page=page_size)
+        objects = paginator.page(page)
+
+        return {
+            "recordsTotal": self.object_list.count(),
+            "recordsFiltered": paginator.count,
+            "data": self.render_rows(object_list=objects),
+        }
+
+    @property
+    def cache_view_name(self):
+        return f"{self.__module__}.{self.__class__.__name__}"
+
+    def get_cache_version_object(self):
+        """
+        The object that the rendered pages are cached for.
+
+        The pages are only cached if this returns an object. The cached pages
+        are invalidated when the version of the object is incremented, see
+        ``datatables.cache.connect_version_signals``.
+        """
+        return None
+
+    def get_cache_permission_context(self):
+        """The part of the cache key that determines what the user can see."""
+        if self.request.user.is_authenticated:
+            return self.request.user.pk
+        else:
+            return None
+
+    def get_table_cache_key(self):
+        """
+        The cache key for the requested page of the table.
+
+        The key includes the version of the cache version object, so the
+        cached pages are invalidated when the object or its dependencies
+        change.
+        """
+        version_object = self.get_cache_version_object()
+        params = sorted(
+            (k, v)
+            for k, v in self.request.GET.lists()
+            if k not in {"draw", "_"}
+        )
+        key = repr(
+            (
+                get_version(model=type(version_object), pk=version_object.pk),
+                self.request.get_host(),
+                self.request.path,
+                params,
+                self.get_cache_permission_context(),
+            )
+        )
+        digest = sha256(key.encode("utf-8")).hexdigest()
+        return f"datatables:{self.cache_view_name}:{digest}"
 
     def filter_queryset(self, queryset, search, order_by):
         if search:
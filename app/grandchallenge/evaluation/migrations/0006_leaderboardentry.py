@@ -0,0 +1,116 @@
+# Generated by Django 3.1.9 on 2026-10-17 20:39
+from itertools import chain
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _get_jsonpath(obj, jsonpath):
+    try:
+        for key in str(jsonpath).split("."):
+            obj = obj[key]
+        return obj
+    except (KeyError, TypeError):
+        return ""
+
+
+def calculate_leaderboards(apps, schema_editor):
+    """Create the entries of the evaluations that are currently ranked."""
+    Phase = apps.get_model("evaluation", "Phase")  # noqa: N806
+    Evaluation = apps.get_model("evaluation", "Evaluation")  # noqa: N806
+    LeaderboardEntry = apps.get_model(  # noqa: N806
+        "evaluation", "LeaderboardEntry"
+    )
+
+    for phase in Phase.objects.iterator():
+        paths = [
+            p
+            for p in (
+                phase.score_jsonpath,
+                phase.score_error_jsonpath,
+                *chain.from_iterable(
+                    (col["path"], col.get("error_path"))
+                    for col in phase.extra_results_columns
+                ),
+            )
+            if p
+        ]
+
+        entries = []
+
+        for e in (
+            Evaluation.objects.filter(submission__phase=phase, rank__gt=0)
+            .only("pk", "rank")
+            .prefetch_related("outputs__interface")
+        ):
+            metrics_json = next(
+                (
+                    o.value
+                    for o in e.outputs.all()
+                    if o.interface.slug == "metrics-json-file"
+                ),
+                None,
+            )
+            entries.append(
+                LeaderboardEntry(
+                    evaluation_id=e.pk,
+                    phase_id=phase.pk,
+                    rank=e.rank,
+                    metrics={p: _get_jsonpath(metrics_json, p) for p in paths},
+                )
+            )
+
+        LeaderboardEntry.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluation", "0005_auto_20210423_1305"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "evaluation",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="leaderboard_entry",
+                        serialize=False,
+                        to="evaluation.evaluation",
+                    ),
+                ),
+                ("rank", models.PositiveIntegerField()),
+                (
+                    "metrics",
+                    models.JSONField(
+                        default=dict,
+                        help_text="The values of the displayed metrics, keyed by jsonpath.",
+                    ),
+                ),
+                (
+                    "phase",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="evaluation.phase",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "leaderboard entries",
+                "ordering": ("phase", "rank"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(
+                fields=["phase", "rank"], name="evaluation__phase_i_eaf220_idx"
+            ),
+        ),
+        migrations.RunPython(
+            calculate_leaderboards, migrations.RunPython.noop, elidable=True
+        ),
+    ]
@@ -715,6 +715,10 @@ class Evaluation(UUIDModel, ComponentJob):
     rank_score = models.FloatField(default=0.0)
     rank_per_metric = models.JSONField(default=dict)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._published_orig = self.published
+
     def save(self, *args, **kwargs):
         adding = self._state.adding
 
@@ -723,6 +727,8 @@ class Evaluation(UUIDModel, ComponentJob):
 
         super().save(*args, **kwargs)
 
+        self._published_orig = self.published
+
         self.assign_permissions()
 
         on_commit(
@@ -820,3 +826,34 @@ class Evaluation(UUIDModel, ComponentJob):
                 "challenge_short_name": self.submission.phase.challenge.short_name,
             },
         )
+
+
+class LeaderboardEntry(models.Model):
+    """
+    A ranked evaluation on the leaderboard of a phase.
+
+    The entries are written by calculate_ranks, and store the values of the
+    displayed metrics so that the leaderboard can be read without having to
+    load the metrics json files of every evaluation.
+    """
+
+    evaluation = models.OneToOneField(
+        Evaluation,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entry",
+    )
+    phase = models.ForeignKey(Phase, on_delete=models.CASCADE)
+    rank = models.PositiveIntegerField()
+    metrics = models.JSONField(
+        default=dict,
+        help_text="The values of the displayed metrics, keyed by jsonpath.",
+    )
+
+    class Meta:
+        ordering = ("phase", "rank")
+        indexes = (models.Index(fields=["phase", "rank"]),)
+        verbose_name_plural = "leaderboard entries"
+
+    def __str__(self):
+        return f"#{self.rank} {self.evaluation_id}"
@@ -0,0 +1,16 @@
+from grandchallenge.datatables.cache import connect_version_signals
+from grandchallenge.evaluation.models import (
+    Evaluation,
+    LeaderboardEntry,
+    Phase,
+    Submission,
+)
+
+# Invalidate the cached leaderboard pages of a phase when it changes
+for model, path in (
+    (Phase, "pk"),
+    (Submission, "phase_id"),
+    (Evaluation, "submission__phase_id"),
+    (LeaderboardEntry, "phase_id"),
+):
+    connect_version_signals(model=model, version_model=Phase, path=path)
@@ -1,11 +1,23 @@
 import uuid
-from statistics import mean, median
+from functools import partial
+from itertools import chain
 
+import numpy as np
 from celery import shared_task
 from django.apps import apps
+from django.db import transaction
 from django.db.transaction import on_commit
 
-from grandchallenge.evaluation.utils import Metric, rank_results
+from grandchallenge.datatables.cache import increment_version
+from grandchallenge.evaluation.templatetags.evaluation_extras import (
+    get_jsonpath,
+)
+from grandchallenge.evaluation.utils import (
+    Metric,
+    get,
+    get_metric_values,
+    rank_metric_values,
+)
 
 
 @shared_task
@@ -128,12 +140,12 @@ def calculate_ranks(*, phase_pk: uuid.UUID):  # noqa: C901
     if score_method_choice == phase.ABSOLUTE:
 
         def score_method(x):
-            return list(x)[0]
+            return x[:, 0]
 
     elif score_method_choice == phase.MEAN:
-        score_method = mean
+        score_method = partial(np.mean, axis=1)
     elif score_method_choice == phase.MEDIAN:
-        score_method = median
+        score_method = partial(np.median, axis=1)
     else:
         raise NotImplementedError
 
@@ -142,17 +154,23 @@ def calculate_ranks(*, phase_pk: uuid.UUID):  # noqa: C901
             submission__phase=phase, published=True, status=Evaluation.SUCCESS,
         )
         .order_by("-created")
+        .defer("stdout", "stderr")
         .select_related("submission__creator")
         .prefetch_related("outputs__interface")
     )
 
+    # Only extract the metrics from each result once
+    metric_values = get_metric_values(
+        evaluations=valid_evaluations, metrics=metrics
+    )
+
     if display_choice == phase.MOST_RECENT:
         valid_evaluations = filter_by_creators_most_recent(
             evaluations=valid_evaluations
         )
     elif display_choice == phase.BEST:
-        all_positions = rank_results(
-            evaluations=valid_evaluations,
+        all_positions = rank_metric_values(
+            metric_values=metric_values,
             metrics=metrics,
             score_method=score_method,
         )
@@ -160,41 +178,129 @@ def calculate_ranks(*, phase_pk: uuid.UUID):  # noqa: C901
             evaluations=valid_evaluations, ranks=all_positions.ranks
         )
 
-    final_positions = rank_results(
-        evaluations=valid_evaluations,
+    final_positions = rank_metric_values(
+        metric_values={
+            e.pk: metric_values[e.pk]
+            for e in valid_evaluations
+            if e.pk in metric_values
+        },
         metrics=metrics,
         score_method=score_method,
     )
 
-    evaluations = Evaluation.objects.filter(submission__phase=phase)
+    with transaction.atomic():
+        _update_evaluations(phase=phase, final_positions=final_positions)
+        _update_leaderboard(
+            phase=phase,
+            evaluations=valid_evaluations,
+            final_positions=final_positions,
+        )
 
-    _update_evaluations(
-        evaluations=evaluations, final_positions=final_positions
-    )
+        # The bulk updates do not send signals, so invalidate the cached
+        # leaderboard pages explicitly
+        on_commit(lambda: increment_version(model=Phase, pk=phase.pk))
 
 
-def _update_evaluations(*, evaluations, final_positions):
+def _update_evaluations(*, phase, final_positions):
+    """Update the evaluations whose positions have changed."""
     Evaluation = apps.get_model(  # noqa: N806
         app_label="evaluation", model_name="Evaluation"
     )
 
-    for e in evaluations:
+    current_positions = Evaluation.objects.filter(
+        submission__phase=phase
+    ).values_list("pk", "rank", "rank_score", "rank_per_metric")
+
+    changed = []
+
+    for pk, *current in current_positions:
         try:
-            rank = final_positions.ranks[e.pk]
-            rank_score = final_positions.rank_scores[e.pk]
-            rank_per_metric = final_positions.rank_per_metric[e.pk]
+            position = (
+                final_positions.ranks[pk],
+                final_positions.rank_scores[pk],
+                final_positions.rank_per_metric[pk],
+            )
         except KeyError:
             # This result will be excluded from the display
-            rank = 0
-            rank_score = 0.0
-            rank_per_metric = {}
+            position = (0, 0.0, {})
+
+        if tuple(current) != position:
+            rank, rank_score, rank_per_metric = position
+            changed.append(
+                Evaluation(
+                    pk=pk,
+                    rank=rank,
+                    rank_score=rank_score,
+                    rank_per_metric=rank_per_metric,
+                )
+            )
+
+    if changed:
+        Evaluation.objects.bulk_update(
+            changed, ["rank", "rank_score", "rank_per_metric"]
+        )
+
+
+def _update_leaderboard(*, phase, evaluations, final_positions):
+    """Update the leaderboard entries of the ranked evaluations."""
+    LeaderboardEntry = apps.get_model(  # noqa: N806
+        app_label="evaluation", model_name="LeaderboardEntry"
+    )
+
+    paths = [
+        p
+        for p in (
+            phase.score_jsonpath,
+            phase.score_error_jsonpath,
+            *chain.from_iterable(
+                (col["path"], col.get("error_path"))
+                for col in phase.extra_results_columns
+            ),
+        )
+        if p
+    ]
+
+    entries = {}
+
+    for e in evaluations:
+        if e.pk not in final_positions.ranks:
+            continue
 
-        e.rank = rank
-        e.rank_score = rank_score
-        e.rank_per_metric = rank_per_metric
+        metrics_json = get(
+            [
+                o.value
+                for o in e.outputs.all()
+                if o.interface.slug == "metrics-json-file"
+            ]
+        )
+        entries[e.pk] = LeaderboardEntry(
+            evaluation_id=e.pk,
+            phase=phase,
+            rank=final_positions.ranks[e.pk],
+            metrics={p: get_jsonpath(metrics_json, p) for p in paths},
+        )
 
-    Evaluation.objects.bulk_update(
-        evaluations, ["rank", "rank_score", "rank_per_metric"]
+    current_entries = {
+        pk: (rank, metrics)
+        for pk, rank, metrics in LeaderboardEntry.objects.filter(
+            phase=phase
+        ).values_list("pk", "rank", "metrics")
+    }
+
+    LeaderboardEntry.objects.filter(phase=phase).exclude(
+        pk__in=entries.keys()
+    ).delete()
+    LeaderboardEntry.objects.bulk_create(
+        [e for pk, e in entries.items() if pk not in current_entries]
+    )
+    LeaderboardEntry.objects.bulk_update(
+        [
+            e
+            for pk, e in entries.items()
+            if pk in current_entries
+            and current_entries[pk] != (e.rank, e.metrics)
+        ],
+        ["rank", "metrics"],
     )
 
 
@@ -1,6 +1,7 @@
 from collections import OrderedDict
-from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+from typing import Callable, Dict, Iterable, NamedTuple, Tuple
 
+import numpy as np
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 
 from grandchallenge.evaluation.templatetags.evaluation_extras import (
@@ -33,88 +34,117 @@ def rank_results(
     *, evaluations: Tuple, metrics: Tuple[Metric, ...], score_method: Callable,
 ) -> Positions:
     """Determine the overall rank for each result."""
-    evaluations = _filter_valid_results(
-        evaluations=evaluations, metrics=metrics
+    return rank_metric_values(
+        metric_values=get_metric_values(
+            evaluations=evaluations, metrics=metrics
+        ),
+        metrics=metrics,
+        score_method=score_method,
     )
 
-    rank_per_metric = _get_rank_per_metric(
-        evaluations=evaluations, metrics=metrics
-    )
 
-    rank_scores = {
-        pk: score_method([m for m in metrics.values()])
-        for pk, metrics in rank_per_metric.items()
-    }
+def get_metric_values(
+    *, evaluations: Iterable, metrics: Tuple[Metric, ...]
+) -> Dict[str, Tuple]:
+    """
+    Extracts the values of the metrics from each result
 
-    return Positions(
-        ranks=_scores_to_ranks(scores=rank_scores, reverse=False),
-        rank_scores=rank_scores,
-        rank_per_metric=rank_per_metric,
-    )
+    Returns a dictionary where the key is the pk of the result and the value
+    is a tuple of the values of each metric. Results that are missing any of
+    the metrics are excluded.
+    """
+    metric_values = {}
+
+    for e in evaluations:
+        metrics_json = get(
+            [
+                o.value
+                for o in e.outputs.all()
+                if o.interface.slug == "metrics-json-file"
+            ]
+        )
+        values = tuple(get_jsonpath(metrics_json, m.path) for m in metrics)
 
+        if all(v not in ["", None] for v in values):
+            metric_values[e.pk] = values
 
-def _filter_valid_results(
-    *, evaluations: Iterable, metrics: Tuple[Metric, ...]
-) -> List:
-    """Ensure that all of the metrics are in every result."""
-    return [
-        e
-        for e in evaluations
-        if all(
-            get_jsonpath(
-                get(
-                    [
-                        o.value
-                        for o in e.outputs.all()
-                        if o.interface.slug == "metrics-json-file"
-                    ]
-                ),
-                m.path,
-            )
-            not in ["", None]
-            for m in metrics
-        )
-    ]
+    return metric_values
 
 
-def _get_rank_per_metric(
-    *, evaluations: Iterable, metrics: Tuple[Metric, ...]
-) -> Dict[str, Dict[str, float]]:
+def rank_metric_values(
+    *,
+    metric_values: Dict[str, Tuple],
+    metrics: Tuple[Metric, ...],
+    score_method: Callable,
+) -> Positions:
     """
-    Takes results and calculates the rank for each of the individual metrics
+    Determine the overall rank for each result from its metric values
 
-    Returns a dictionary where the key is the pk of the result, and the
-    values is another dictionary where the key is the path of the metric and
-    the value is the rank of this result for this metric
+    The results are ranked for each metric, then `score_method` is called
+    with an array of these ranks with a row per result and a column per
+    metric, and must return the rank score of each row.
     """
-    metric_rank = {}
-    for metric in metrics:
-        # Extract the value of the metric for this primary key and sort on the
-        # value of the metric
-        metric_scores = {
-            e.pk: get_jsonpath(
-                get(
-                    [
-                        o.value
-                        for o in e.outputs.all()
-                        if o.interface.slug == "metrics-json-file"
-                    ]
-                ),
-                metric.path,
-            )
-            for e in evaluations
-        }
-        metric_rank[metric.path] = _scores_to_ranks(
-            scores=metric_scores, reverse=metric.reverse
+    pks = list(metric_values)
+    columns = list(zip(*metric_values.values())) or [()] * len(metrics)
+
+    rank_matrix = np.column_stack(
+        [
+            _rank(scores=column, reverse=metric.reverse)
+            for column, metric in zip(columns, metrics)
+        ]
+    ).reshape(len(pks), len(metrics))
+
+    rank_scores = np.asarray(score_method(rank_matrix))
+    ranks = _rank(scores=rank_scores, reverse=False)
+
+    return Positions(
+        ranks=dict(zip(pks, ranks.tolist())),
+        rank_scores=dict(zip(pks, rank_scores.tolist())),
+        rank_per_metric={
+            pk: {
+                metric.path: rank
+                for metric, rank in zip(metrics, metric_ranks)
+            }
+            for pk, metric_ranks in zip(pks, rank_matrix.tolist())
+        },
+    )
+
+
+def _rank(*, scores, reverse: bool) -> np.ndarray:
+    """
+    Go from scores to ranks, where equal scores share the lowest rank
+
+    Numerical scores are ranked with numpy, anything else that can be
+    sorted falls back to `_scores_to_ranks`.
+    """
+    array = np.asarray(scores)
+
+    if array.ndim != 1 or array.dtype.kind not in "biuf":
+        ranks = _scores_to_ranks(
+            scores=dict(enumerate(scores)), reverse=reverse
         )
+        return np.array([ranks[idx] for idx in range(len(scores))], dtype=int)
 
-    return {
-        e.pk: {
-            metric_path: ranks[e.pk]
-            for metric_path, ranks in metric_rank.items()
-        }
-        for e in evaluations
-    }
+    if array.dtype.kind == "b":
+        array = array.astype(int)
+
+    if reverse:
+        array = -array
+
+    order = np.argsort(array, kind="stable")
+    sorted_scores = array[order]
+
+    # The rank of a score is the position of the first score that equals it
+    is_first = np.ones(len(sorted_scores), dtype=bool)
+    is_first[1:] = sorted_scores[1:] != sorted_scores[:-1]
+    sorted_ranks = np.maximum.accumulate(
+        np.where(is_first, np.arange(1, len(sorted_scores) + 1), 0)
+    )
+
+    ranks = np.empty(len(sorted_scores), dtype=int)
+    ranks[order] = sorted_ranks
+
+    return ranks
 
 
 def _scores_to_ranks(
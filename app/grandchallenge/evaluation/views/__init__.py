@@ -3,7 +3,6 @@ from typing import Dict
 
 from dateutil.relativedelta import relativedelta
 from django.contrib.messages.views import SuccessMessageMixin
-from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.files import File
 from django.db.models import Q
@@ -439,6 +438,10 @@ class LeaderboardDetail(
             slug=self.kwargs["slug"],
         )
 
+    def get_cache_version_object(self):
+        # Changes to the users and teams are picked up when the pages expire
+        return self.phase
+
     @property
     def columns(self):
         columns = []
@@ -539,25 +542,12 @@ class LeaderboardDetail(
     def get_queryset(self, *args, **kwargs):
         queryset = super().get_queryset(*args, **kwargs)
         queryset = self.filter_by_date(queryset=queryset)
-        queryset = (
-            queryset.select_related(
-                "submission__creator__user_profile",
-                "submission__creator__verification",
-                "submission__phase__challenge",
-            )
-            .filter(
-                submission__phase=self.phase,
-                published=True,
-                status=Evaluation.SUCCESS,
-                rank__gt=0,
-            )
-            .annotate(
-                metrics=ArrayAgg(
-                    "outputs__value",
-                    filter=Q(outputs__interface__slug="metrics-json-file"),
-                )
-            )
-        )
+        queryset = queryset.select_related(
+            "leaderboard_entry",
+            "submission__creator__user_profile",
+            "submission__creator__verification",
+            "submission__phase__challenge",
+        ).filter(leaderboard_entry__phase=self.phase)
         return queryset
 
     def filter_by_date(self, queryset):
@@ -1,8 +1,125 @@
+from uuid import UUID
+
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
 
-from grandchallenge.jqfileupload.widgets.uploader import cleanup_stale_files
+from grandchallenge.core.storage import MULTIPART_MIN_PART_SIZE
+from grandchallenge.jqfileupload.models import StagedFile
+from grandchallenge.jqfileupload.widgets.uploader import (
+    StagedAjaxFile,
+    cleanup_stale_files,
+    load_staged_ajax_files,
+)
 
 
 @shared_task
 def cleanup_stale_uploads():
     cleanup_stale_files()
+
+
+@shared_task
+def compact_complete_uploads():
+    """
+    Schedule the compaction of all complete chunked uploads.
+
+    Uploads where a chunk other than the last is smaller than the minimum
+    part size cannot be composed, so they are not scheduled.
+    """
+    file_ids = (
+        StagedFile.objects.values("file_id")
+        .annotate(
+            num_chunks=Count("pk"),
+            num_small_chunks=Count(
+                "pk",
+                filter=Q(end_byte__lt=F("total_size") - 1)
+                & Q(
+                    end_byte__lt=F("start_byte") + MULTIPART_MIN_PART_SIZE - 1
+                ),
+            ),
+        )
+        .filter(num_chunks__gt=1, num_small_chunks=0)
+        .values_list("file_id", flat=True)
+    )
+
+    for file_id, staged_file in load_staged_ajax_files(file_ids).items():
+        if staged_file.is_complete:
+            compact_upload.apply_async(kwargs={"file_id": str(file_id)})
+
+
+@shared_task
+def compact_upload(*, file_id):
+    """
+    Replaces the chunks of a complete upload with a single chunk.
+
+    The chunks are concatenated server side with a multipart copy, and the
+    chunk rows are replaced with a single row. The objects of the old chunks
+    are deleted after JQFILEUPLOAD_COMPACTED_CHUNKS_DELETE_DELAY so that
+    readers who already have the old chunks can finish.
+    """
+    staged_file = StagedAjaxFile(UUID(file_id))
+    chunks = list(staged_file.staged_files.order_by("start_byte"))
+
+    if len(chunks) < 2 or not staged_file.is_complete:
+        return
+
+    first_chunk = chunks[0]
+    compacted = StagedFile(
+        user_pk_str=first_chunk.user_pk_str,
+        client_id=first_chunk.client_id,
+        client_filename=first_chunk.client_filename,
+        file_id=first_chunk.file_id,
+        timeout=max(c.timeout for c in chunks),
+        start_byte=0,
+        end_byte=staged_file.size - 1,
+        total_size=staged_file.size,
+    )
+
+    storage = compacted.file.storage
+    compacted.file.name = storage.get_available_name(
+        compacted.file.field.generate_filename(
+            compacted, first_chunk.client_filename
+        ),
+        max_length=compacted.file.field.max_length,
+    )
+
+    try:
+        storage.compose(
+            from_names=[c.file.name for c in chunks],
+            to_name=compacted.file.name,
+        )
+    except ValueError:
+        # The chunks are too small to be copied as parts
+        return
+
+    with transaction.atomic():
+        locked = StagedFile.objects.select_for_update().filter(
+            pk__in=[c.pk for c in chunks]
+        )
+
+        if len(locked) != len(chunks):
+            # The upload was consumed or cleaned up in the meantime
+            transaction.on_commit(
+                lambda: storage.delete(name=compacted.file.name)
+            )
+            return
+
+        StagedFile.objects.filter(pk__in=[c.pk for c in chunks]).delete()
+        compacted.save()
+
+        names = [c.file.name for c in chunks]
+        delay = settings.JQFILEUPLOAD_COMPACTED_CHUNKS_DELETE_DELAY
+        transaction.on_commit(
+            lambda: delete_staged_file_objects.apply_async(
+                kwargs={"names": names}, countdown=delay.total_seconds()
+            )
+        )
+
+
+@shared_task
+def delete_staged_file_objects(*, names):
+    storage = StagedFile._meta.get_field("file").storage
+
+    for name in names:
+        storage.delete(name)
@@ -1,6 +1,10 @@
 import hashlib
 import uuid
+from collections import defaultdict
 from io import BufferedIOBase
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Dict, Iterable, List, Optional, Sequence
 
 from django import forms
 from django.core.exceptions import ValidationError
@@ -11,6 +15,9 @@ from django.utils import timezone
 from grandchallenge.jqfileupload.models import StagedFile
 from grandchallenge.jqfileupload.widgets.utils import IntervalMap
 
+READ_AHEAD_BLOCK_SIZE = 0x100000  # 1MB
+READ_AHEAD_DEPTH = 8
+
 
 def generate_upload_path_hash(request: HttpRequest) -> str:
     hasher = hashlib.sha256()
@@ -85,29 +92,117 @@ class AjaxUploadWidget(Widget):
         return context
 
 
+class _ChunkReadAhead:
+    """
+    Reads the chunks of a file, in order, on a background thread.
+
+    Reading starts at ``position`` and the blocks that are read are put on a
+    bounded queue, so the next chunk is being fetched from storage while the
+    current one is consumed, and at most ``depth`` blocks are held in memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        chunks: Sequence[StagedFile],
+        position: int,
+        block_size: int,
+        depth: int,
+    ):
+        self._chunks = [c for c in chunks if c.end_byte >= position]
+        self._position = position
+        self._block_size = block_size
+        self._queue = Queue(maxsize=depth)
+        self._stopped = Event()
+        self._finished = False
+
+        self._thread = Thread(target=self._read_chunks, daemon=True)
+        self._thread.start()
+
+    def _read_chunks(self):
+        try:
+            position = self._position
+
+            for chunk in self._chunks:
+                with chunk.file.storage.open(chunk.file.name, "rb") as f:
+                    f.seek(position - chunk.start_byte)
+
+                    while position <= chunk.end_byte:
+                        block = f.read(
+                            min(
+                                self._block_size, chunk.end_byte + 1 - position
+                            )
+                        )
+                        if not block:
+                            raise OSError(
+                                f"Unexpected end of data in {chunk.file.name}"
+                            )
+
+                        position += len(block)
+
+                        if not self._put(block):
+                            return
+
+            self._put(b"")
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+
+        return False
+
+    def get(self) -> bytes:
+        """Get the next block, which is empty at the end of the file."""
+        if self._finished:
+            return b""
+
+        block = self._queue.get()
+
+        if isinstance(block, Exception):
+            self._finished = True
+            raise block
+        elif not block:
+            self._finished = True
+
+        return block
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+
 class OpenedStagedAjaxFile(BufferedIOBase):
     """
     A open file handle for a :class:`StagedAjaxFile`.
 
     The file handle is strictly read-only. Under the hood, this class
     reconstructs the contingent file from the file chunks that have been
-    uploaded.
+    uploaded. The chunks are read ahead on a background thread while the
+    file is being read sequentially.
     """
 
-    def __init__(self, _uuid):
+    def __init__(
+        self, _uuid, *, chunks: Optional[Sequence[StagedFile]] = None
+    ):
         super().__init__()
         self._uuid = _uuid
-        self._chunks = list(
-            StagedFile.objects.filter(file_id=self._uuid).all()
-        )
-        self._chunks.sort(key=lambda x: x.start_byte)
+        if chunks is None:
+            chunks = StagedFile.objects.filter(file_id=self._uuid).all()
+        self._chunks = sorted(chunks, key=lambda x: x.start_byte)
         self._chunk_map = IntervalMap()
         for chunk in self._chunks:
             self._chunk_map.append_interval(
                 chunk.end_byte - chunk.start_byte + 1, chunk
             )
         self._file_pointer = 0
-        self._current_chunk = None
+        self._read_ahead = None
+        self._block = memoryview(b"")
 
     @property
     def closed(self):
@@ -131,12 +226,52 @@ class OpenedStagedAjaxFile(BufferedIOBase):
         return True
 
     def readinto(self, buffer):
-        read_bytes = self.read(len(buffer))
-        buffer[: len(read_bytes)] = read_bytes
-        return len(read_bytes)
+        if self.closed:
+            raise ValueError("file closed")
+
+        if self._file_pointer < 0:
+            raise OSError("invalid file pointer position")
+
+        view = memoryview(buffer).cast("B")
+        read_bytes = 0
+
+        while read_bytes < len(view) and self._file_pointer < self.size:
+            if not self._block:
+                self._block = self._next_block()
+
+            read_size = min(len(view) - read_bytes, len(self._block))
+            view[read_bytes : read_bytes + read_size] = self._block[:read_size]
+            self._block = self._block[read_size:]
+
+            read_bytes += read_size
+            self._file_pointer += read_size
+
+        return read_bytes
+
+    def _next_block(self) -> memoryview:
+        if self._read_ahead is None:
+            self._read_ahead = _ChunkReadAhead(
+                chunks=self._chunks,
+                position=self._file_pointer,
+                block_size=READ_AHEAD_BLOCK_SIZE,
+                depth=READ_AHEAD_DEPTH,
+            )
+
+        block = self._read_ahead.get()
+
+        if not block:
+            raise OSError("Unexpected end of file")
+
+        return memoryview(block)
+
+    def _stop_read_ahead(self):
+        if self._read_ahead is not None:
+            self._read_ahead.stop()
+            self._read_ahead = None
+        self._block = memoryview(b"")
 
     def read(self, size=-1):
-        if size < 0:
+        if size is None or size < 0:
             size = None
         if self.closed:
             raise ValueError("file closed")
@@ -147,31 +282,15 @@ class OpenedStagedAjaxFile(BufferedIOBase):
         if self._file_pointer < 0:
             raise OSError("invalid file pointer position")
 
-        if size is None:
-            size = self.size - self._file_pointer
-        result = b""
-        while len(result) < size:
-            if self._file_pointer >= len(self._chunk_map):
-                break
-
-            this_chunk = self._chunk_map[self._file_pointer]
-            if this_chunk is not self._current_chunk:
-                # we need to switch to a new chunk
-                if self._current_chunk is not None:
-                    self._current_chunk.file.close()
-                    self._current_chunk = None
-                this_chunk.file.open("rb")
-                this_chunk.file.seek(
-                    self._file_pointer - this_chunk.start_byte
-                )
-                self._current_chunk = this_chunk
-            read_size = min(
-                size - len(result),
-                self._current_chunk.end_byte + 1 - self._file_pointer,
-            )
-            result += self._current_chunk.file.read(read_size)
-            self._file_pointer += read_size
-        return result
+        remaining = self.size - self._file_pointer
+        if size is None or size > remaining:
+            size = remaining
+
+        result = bytearray(size)
+        read_bytes = self.readinto(result)
+        del result[read_bytes:]
+
+        return bytes(result)
 
     def read1(self, size=-1):
         return self.read(size=size)
@@ -193,12 +312,14 @@ class OpenedStagedAjaxFile(BufferedIOBase):
         if new_pointer < 0:
             raise OSError("invalid file pointer")
 
+        skip = new_pointer - self._file_pointer
+        if 0 <= skip <= len(self._block):
+            # Still inside of the block that was read ahead
+            self._block = self._block[skip:]
+        else:
+            self._stop_read_ahead()
+
         self._file_pointer = new_pointer
-        if self._file_pointer < self._chunk_map.len:
-            if self._chunk_map[self._file_pointer] is self._current_chunk:
-                self._current_chunk.file.seek(
-                    self._file_pointer - self._current_chunk.start_byte
-                )
         return self._file_pointer
 
     def tell(self, *args, **kwargs):
@@ -210,20 +331,38 @@ class OpenedStagedAjaxFile(BufferedIOBase):
     def close(self):
         if not self.closed:
             self._chunks = None
-            if self._current_chunk is not None:
-                self._current_chunk.file.close()
-                self._current_chunk = None
+            self._stop_read_ahead()
 
 
 class StagedAjaxFile:
-    """File representation of the loose chunks that belong to a single file."""
+    """
+    File representation of the loose chunks that belong to a single file.
 
-    def __init__(self, _uuid: uuid.UUID):
+    The chunks are fetched from the database once and then cached on the
+    instance, use `refresh_from_db` to fetch them again. If the chunks have
+    already been fetched they can be passed in, then no queries are made to
+    get the file metadata.
+    """
+
+    def __init__(
+        self,
+        _uuid: uuid.UUID,
+        *,
+        chunks: Optional[Sequence[StagedFile]] = None,
+    ):
         super().__init__()
         if not isinstance(_uuid, uuid.UUID):
             raise TypeError("uuid parameter must be uuid.UUID")
 
         self.__uuid = _uuid
+        self.__chunks = None
+
+        if chunks is not None:
+            self.__chunks = sorted(chunks, key=lambda x: x.start_byte)
+
+    def refresh_from_db(self):
+        """Discard the cached chunks, they are fetched again when needed."""
+        self.__chunks = None
 
     def _raise_if_missing(self):
         query = StagedFile.objects.filter(file_id=self.__uuid)
@@ -232,6 +371,23 @@ class StagedAjaxFile:
 
         return query
 
+    @property
+    def _chunks(self) -> List[StagedFile]:
+        if self.__chunks is None:
+            self.__chunks = sorted(
+                self.staged_files, key=lambda x: x.start_byte
+            )
+
+        return self.__chunks
+
+    def _get_chunks(self):
+        chunks = self._chunks
+
+        if not chunks:
+            raise NotFoundError()
+
+        return chunks
+
     @property
     def staged_files(self):
         return StagedFile.objects.filter(file_id=self.__uuid)
@@ -247,26 +403,24 @@ class StagedAjaxFile:
         Returns the name specified by the client for the uploaded file (might
         be unsafe!).
         """
-        chunks_query = self._raise_if_missing()
-        return chunks_query.first().client_filename
+        return self._get_chunks()[0].client_filename
 
     @property
     def exists(self):
         """True if the file has not been cleaned up yet."""
-        return StagedFile.objects.filter(file_id=self.__uuid).exists()
+        return bool(self._chunks)
 
     @property
     def size(self):
         """Total size of the file in bytes."""
-        chunks_query = self._raise_if_missing()
-        chunks = chunks_query.all()
+        chunks = self._get_chunks()
         remaining_size = None
         # Check if we want to verify some total size
-        total_sized_chunks = chunks.exclude(total_size=None)
-        if total_sized_chunks.exists():
-            remaining_size = total_sized_chunks.first().total_size
+        total_sized_chunks = [c for c in chunks if c.total_size is not None]
+        if total_sized_chunks:
+            remaining_size = total_sized_chunks[0].total_size
         current_size = 0
-        for chunk in sorted(chunks, key=lambda x: x.start_byte):
+        for chunk in chunks:
             if chunk.start_byte != current_size:
                 return None
 
@@ -282,7 +436,7 @@ class StagedAjaxFile:
     @property
     def is_complete(self):
         """False if the upload was incomplete or corrupted in another way."""
-        if not StagedFile.objects.filter(file_id=self.__uuid).exists():
+        if not self.exists:
             return False
 
         return self.size is not None
@@ -298,13 +452,30 @@ class StagedAjaxFile:
         if not self.is_complete:
             raise OSError("incomplete upload")
 
-        return OpenedStagedAjaxFile(self.__uuid)
+        return OpenedStagedAjaxFile(self.__uuid, chunks=self._chunks)
 
     def delete(self):
         query = self._raise_if_missing()
         for chunk in query:
             chunk.file.delete()
         query.delete()
+        self.__chunks = []
+
+
+def load_staged_ajax_files(
+    uuids: Iterable[uuid.UUID],
+) -> Dict[uuid.UUID, StagedAjaxFile]:
+    """
+    Create the StagedAjaxFiles for many uuids, fetching the chunks of all of
+    the files in a single query.
+    """
+    uuids = set(uuids)
+    chunks = defaultdict(list)
+
+    for chunk in StagedFile.objects.filter(file_id__in=uuids):
+        chunks[chunk.file_id].append(chunk)
+
+    return {u: StagedAjaxFile(u, chunks=chunks[u]) for u in uuids}
 
 
 class UploadedAjaxFileList(forms.Field):
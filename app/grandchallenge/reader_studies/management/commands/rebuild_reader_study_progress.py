@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+
+from grandchallenge.reader_studies.models import ReaderStudy
+
+
+class Command(BaseCommand):
+    help = "Recalculates the stored progress of the readers of reader studies"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "slugs",
+            nargs="*",
+            type=str,
+            help="The reader studies to rebuild, defaults to all of them",
+        )
+
+    def handle(self, *args, **options):
+        reader_studies = ReaderStudy.objects.all()
+
+        if options["slugs"]:
+            reader_studies = reader_studies.filter(slug__in=options["slugs"])
+
+        for reader_study in reader_studies.iterator():
+            readers = (
+                get_user_model()
+                .objects.filter(
+                    answer__question__reader_study=reader_study,
+                    answer__is_ground_truth=False,
+                )
+                .distinct()
+            )
+
+            reader_study.clear_progress()
+
+            for reader in readers:
+                reader_study.update_progress_for_user(reader)
+
+            self.stdout.write(
+                f"Rebuilt the progress of {len(readers)} readers "
+                f"for {reader_study}"
+            )
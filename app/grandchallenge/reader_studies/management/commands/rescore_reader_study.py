@@ -0,0 +1,33 @@
+from django.core.management import BaseCommand
+
+from grandchallenge.reader_studies.models import Answer, ReaderStudy
+from grandchallenge.reader_studies.scoring import update_scores
+
+
+class Command(BaseCommand):
+    help = "Recalculates the scores of the answers in reader studies"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "slugs",
+            nargs="*",
+            type=str,
+            help="The reader studies to rescore, defaults to all of them",
+        )
+
+    def handle(self, *args, **options):
+        reader_studies = ReaderStudy.objects.all()
+
+        if options["slugs"]:
+            reader_studies = reader_studies.filter(slug__in=options["slugs"])
+
+        for reader_study in reader_studies.iterator():
+            updated = update_scores(
+                answers=Answer.objects.filter(
+                    question__reader_study=reader_study
+                )
+            )
+
+            self.stdout.write(
+                f"Updated the scores of {updated} answers for {reader_study}"
+            )
@@ -0,0 +1,48 @@
+# Generated by Django 3.1.9 on 2026-10-17 21:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reader_studies", "0009_auto_20210504_1142"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReaderStudyProgress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("questions", models.FloatField(default=0.0)),
+                ("hangings", models.FloatField(default=0.0)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "reader_study",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="reader_studies.readerstudy",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("reader_study", "user")}},
+        ),
+    ]
@@ -1,22 +1,28 @@
 import itertools
 import json
-from collections import Counter
+from collections import Counter, defaultdict
 
 import numpy as np
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Avg, Count, OuterRef, Subquery, Sum
 from django.db.models.signals import post_delete
+from django.db.transaction import on_commit
 from django.dispatch import receiver
 from django.utils.functional import cached_property
+from django.utils.timezone import now
 from django_extensions.db.models import TitleSlugDescriptionModel
 from guardian.shortcuts import assign_perm, get_objects_for_group, remove_perm
 from jsonschema import RefResolutionError
 from numpy.random.mtrand import RandomState
 from simple_history.models import HistoricalRecords
+from simple_history.utils import (
+    bulk_create_with_history,
+    bulk_update_with_history,
+)
 from sklearn.metrics import accuracy_score
 
 from grandchallenge.anatomy.models import BodyStructure
@@ -32,6 +38,8 @@ from grandchallenge.core.validators import JSONSchemaValidator
 from grandchallenge.modalities.models import ImagingModality
 from grandchallenge.organizations.models import Organization
 from grandchallenge.publications.models import Publication
+from grandchallenge.reader_studies.scoring import batch_accuracy_score
+from grandchallenge.reader_studies.tasks import add_scores_for_reader_study
 from grandchallenge.subdomains.utils import reverse
 from grandchallenge.workstations.models import Workstation
 
@@ -441,6 +449,10 @@ class ReaderStudy(UUIDModel, TitleSlugDescriptionModel):
         self.assign_permissions()
         self.assign_workstation_permissions()
 
+        if not adding:
+            # The hanging list may have changed
+            self.clear_progress()
+
     def is_editor(self, user):
         """Checks if ``user`` is an editor for this ``ReaderStudy``."""
         return user.groups.filter(pk=self.editors_group.pk).exists()
@@ -576,68 +588,132 @@ class ReaderStudy(UUIDModel, TitleSlugDescriptionModel):
         return self.answerable_questions.count()
 
     def add_ground_truth(self, *, data, user):  # noqa: C901
-        """Add ground truth answers provided by ``data`` for this ``ReaderStudy``."""
-        answers = []
+        """
+        Add ground truth answers provided by ``data`` for this ``ReaderStudy``.
+
+        The questions, options, images and existing ground truth of this
+        reader study are loaded once, and every answer is validated before
+        any are saved. The answers are then created or updated in bulk,
+        and the scores of the readers are updated by a single task.
+        """
+        questions = {
+            q.question_text: q
+            for q in self.questions.prefetch_related("options")
+        }
+
+        images = defaultdict(list)
+        for image in self.images.all():
+            images[image.name].append(image)
+
+        existing_answers = {}
+        for answer in Answer.objects.filter(
+            question__reader_study=self, is_ground_truth=True
+        ).prefetch_related("images"):
+            for image in answer.images.all():
+                existing_answers.setdefault(
+                    (answer.question_id, image.pk), answer
+                )
+
+        answers = {}
         for gt in data:
-            images = self.images.filter(name__in=gt["images"].split(";"))
+            answer_images = list(
+                {
+                    image.pk: image
+                    for name in gt["images"].split(";")
+                    for image in images[name]
+                }.values()
+            )
             for key in gt.keys():
                 if key == "images" or key.endswith("__explanation"):
                     continue
-                question = self.questions.get(question_text=key)
+                question = questions[key]
+                options = {o.title: o.pk for o in question.options.all()}
                 _answer = json.loads(gt[key])
                 if question.answer_type == Question.AnswerType.CHOICE:
-                    try:
-                        option = question.options.get(title=_answer)
-                        _answer = option.pk
-                    except CategoricalOption.DoesNotExist:
+                    if not isinstance(_answer, str) or _answer not in options:
                         raise ValidationError(
                             f"Option '{_answer}' is not valid for question {question.question_text}"
                         )
+                    _answer = options[_answer]
                 if question.answer_type in (
                     Question.AnswerType.MULTIPLE_CHOICE,
                     Question.AnswerType.MULTIPLE_CHOICE_DROPDOWN,
                 ):
-                    _answer = list(
-                        question.options.filter(title__in=_answer).values_list(
-                            "pk", flat=True
-                        )
+                    _answer = [
+                        pk for title, pk in options.items() if title in _answer
+                    ]
+                Answer._validate_answer_type(question=question, answer=_answer)
+                if len(answer_images) == 0:
+                    raise ValidationError(
+                        "You must specify the images that this answer "
+                        "corresponds to."
                     )
-                Answer.validate(
-                    creator=user,
-                    question=question,
-                    images=images,
-                    answer=_answer,
-                    is_ground_truth=True,
+                Answer._validate_answer_options(
+                    question=question, answer=_answer
                 )
                 try:
                     explanation = json.loads(gt.get(key + "__explanation", ""))
                 except (json.JSONDecodeError, TypeError):
                     explanation = ""
-                answers.append(
-                    {
-                        "answer_obj": Answer.objects.filter(
-                            images__in=images,
-                            question=question,
-                            is_ground_truth=True,
-                        ).first()
-                        or Answer(
-                            creator=user,
-                            question=question,
-                            is_ground_truth=True,
-                            explanation="",
-                        ),
-                        "answer": _answer,
-                        "explanation": explanation,
-                        "images": images,
-                    }
+
+                answer = next(
+                    (
+                        existing_answers[(question.pk, image.pk)]
+                        for image in answer_images
+                        if (question.pk, image.pk) in existing_answers
+                    ),
+                    None,
+                ) or Answer(
+                    creator=user, question=question, is_ground_truth=True
                 )
+                answer.answer = _answer
+                answer.explanation = explanation
+                answers[answer.pk] = (answer, answer_images)
+
+        if answers and not user.has_perm("read_readerstudy", self):
+            raise ValidationError("This user is not a reader for this study.")
 
-        for answer in answers:
-            answer["answer_obj"].answer = answer["answer"]
-            answer["answer_obj"].explanation = answer["explanation"]
-            answer["answer_obj"].save()
-            answer["answer_obj"].images.set(answer["images"])
-            answer["answer_obj"].save()
+        self._save_ground_truth(answers=answers.values(), user=user)
+
+    @transaction.atomic
+    def _save_ground_truth(self, *, answers, user):
+        new_answers = [a for a, _ in answers if a._state.adding]
+        updated_answers = [a for a, _ in answers if not a._state.adding]
+
+        bulk_create_with_history(new_answers, Answer, default_user=user)
+
+        for answer in updated_answers:
+            answer.modified = now()
+        bulk_update_with_history(
+            updated_answers,
+            Answer,
+            ["answer", "explanation", "modified"],
+            default_user=user,
+        )
+
+        if new_answers:
+            assign_perm("view_answer", self.editors_group, new_answers)
+            assign_perm("view_answer", user, new_answers)
+            assign_perm("change_answer", user, new_answers)
+
+        # Replace the images of the answers without sending the m2m_changed
+        # signals, the scores are updated once afterwards
+        Answer.images.through.objects.filter(
+            answer__in=[a for a, _ in answers]
+        ).delete()
+        Answer.images.through.objects.bulk_create(
+            [
+                Answer.images.through(answer=answer, image=image)
+                for answer, images in answers
+                for image in images
+            ]
+        )
+
+        on_commit(
+            lambda: add_scores_for_reader_study.apply_async(
+                kwargs={"reader_study_pk": str(self.pk)}
+            )
+        )
 
     def get_hanging_list_images_for_user(self, *, user):
         """
@@ -670,6 +746,49 @@ class ReaderStudy(UUIDModel, TitleSlugDescriptionModel):
 
     def get_progress_for_user(self, user):
         """Returns the percentage of completed hangings and questions for ``user``."""
+        return self.get_progress_for_users([user])[user.pk]
+
+    def get_progress_for_users(self, users):
+        """
+        Returns the progress of each of ``users``, keyed by user pk.
+
+        The stored progress is read in one query, the progress of users
+        without a stored record is calculated and stored.
+        """
+        progress = {
+            p.user_id: p.as_dict()
+            for p in ReaderStudyProgress.objects.filter(
+                reader_study=self, user__in=users
+            )
+        }
+
+        for user in users:
+            if user.pk not in progress:
+                progress[user.pk] = self.update_progress_for_user(user)
+
+        return progress
+
+    def update_progress_for_user(self, user):
+        """Calculates and stores the progress of ``user``."""
+        progress = self.calculate_progress_for_user(user)
+
+        ReaderStudyProgress.objects.update_or_create(
+            reader_study=self,
+            user=user,
+            defaults={
+                "questions": progress["questions"],
+                "hangings": progress["hangings"],
+            },
+        )
+
+        return progress
+
+    def clear_progress(self):
+        """Removes the stored progress, it will be calculated when next read."""
+        ReaderStudyProgress.objects.filter(reader_study=self).delete()
+
+    def calculate_progress_for_user(self, user):
+        """Calculates the percentage of completed hangings and questions for ``user``."""
         if not self.is_valid or not self.hanging_list:
             return {
                 "questions": 0.0,
@@ -1181,6 +1300,10 @@ class Question(UUIDModel):
         ScoringFunction.ACCURACY: accuracy_score,
     }
 
+    BATCH_SCORING_FUNCTIONS = {
+        ScoringFunction.ACCURACY: batch_accuracy_score,
+    }
+
     EXAMPLE_FOR_ANSWER_TYPE = {
         AnswerType.SINGLE_LINE_TEXT: "'\"answer\"'",
         AnswerType.MULTI_LINE_TEXT: "'\"answer\\nanswer\\nanswer\"'",
@@ -1291,6 +1414,32 @@ class Question(UUIDModel):
             ans, gt, normalize=True
         )
 
+    def calculate_scores(self, *, answers, ground_truths):
+        """
+        Calculates the scores for many ``answers`` and their ``ground_truths``
+        at once. A vectorised implementation of ``scoring_function`` is used
+        if there is one, otherwise each score is calculated separately.
+        """
+        batch_scoring_function = self.BATCH_SCORING_FUNCTIONS.get(
+            self.scoring_function
+        )
+
+        if batch_scoring_function is None:
+            return [
+                self.calculate_score(answer, ground_truth)
+                for answer, ground_truth in zip(answers, ground_truths)
+            ]
+
+        return batch_scoring_function(
+            answers=answers,
+            ground_truths=ground_truths,
+            multiple_choice=self.answer_type
+            in (
+                Question.AnswerType.MULTIPLE_CHOICE,
+                Question.AnswerType.MULTIPLE_CHOICE_DROPDOWN,
+            ),
+        ).tolist()
+
     def save(self, *args, **kwargs):
         adding = self._state.adding
 
@@ -1480,16 +1629,7 @@ class Answer(UUIDModel):
         instance=None,
     ):
         """Validates all fields provided for ``answer``."""
-        if question.answer_type == Question.AnswerType.HEADING:
-            # Maintained for historical consistency
-            raise ValidationError("Headings are not answerable.")
-
-        if not question.is_answer_valid(answer=answer):
-            raise ValidationError(
-                f"Your answer is not the correct type. "
-                f"{question.get_answer_type_display()} expected, "
-                f"{type(answer)} found."
-            )
+        Answer._validate_answer_type(question=question, answer=answer)
 
         if len(images) == 0:
             raise ValidationError(
@@ -1524,9 +1664,29 @@ class Answer(UUIDModel):
         if not creator.has_perm("read_readerstudy", question.reader_study):
             raise ValidationError("This user is not a reader for this study.")
 
+        Answer._validate_answer_options(question=question, answer=answer)
+
+    @staticmethod
+    def _validate_answer_type(*, question, answer):
+        if question.answer_type == Question.AnswerType.HEADING:
+            # Maintained for historical consistency
+            raise ValidationError("Headings are not answerable.")
+
+        if not question.is_answer_valid(answer=answer):
+            raise ValidationError(
+                f"Your answer is not the correct type. "
+                f"{question.get_answer_type_display()} expected, "
+                f"{type(answer)} found."
+            )
+
+    @staticmethod
+    def _validate_answer_options(*, question, answer):
+        # Use all() so that prefetched options are used
+        options = [option.pk for option in question.options.all()]
+
         if (
             question.answer_type == Question.AnswerType.CHOICE
-            and answer not in question.options.values_list("id", flat=True)
+            and answer not in options
         ):
             raise ValidationError(
                 "Provided option is not valid for this question"
@@ -1536,7 +1696,6 @@ class Answer(UUIDModel):
             Question.AnswerType.MULTIPLE_CHOICE,
             Question.AnswerType.MULTIPLE_CHOICE_DROPDOWN,
         ):
-            options = question.options.values_list("id", flat=True)
             if not all(x in options for x in answer):
                 raise ValidationError(
                     "Provided options are not valid for this question"
@@ -1544,21 +1703,24 @@ class Answer(UUIDModel):
 
     @property
     def answer_text(self):
+        # The options are filtered here so that prefetched options are used
         if self.question.answer_type == Question.AnswerType.CHOICE:
-            return (
-                self.question.options.filter(pk=self.answer)
-                .values_list("title", flat=True)
-                .first()
-                or ""
+            return next(
+                (
+                    option.title
+                    for option in self.question.options.all()
+                    if option.pk == self.answer
+                ),
+                "",
             )
         if self.question.answer_type in (
             Question.AnswerType.MULTIPLE_CHOICE,
             Question.AnswerType.MULTIPLE_CHOICE_DROPDOWN,
         ):
             return ", ".join(
-                self.question.options.filter(pk__in=self.answer).values_list(
-                    "title", flat=True
-                )
+                option.title
+                for option in self.question.options.all()
+                if option.pk in self.answer
             )
         return self.answer
 
@@ -1585,6 +1747,32 @@ class Answer(UUIDModel):
         assign_perm(f"change_{self._meta.model_name}", self.creator, self)
 
 
+class ReaderStudyProgress(models.Model):
+    """
+    The progress of a reader in a ``ReaderStudy``.
+
+    This is updated when the reader answers a question, and is removed
+    when the reader study changes so that it is calculated again when it is
+    next read.
+    """
+
+    reader_study = models.ForeignKey(ReaderStudy, on_delete=models.CASCADE)
+    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
+    questions = models.FloatField(default=0.0)
+    hangings = models.FloatField(default=0.0)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (("reader_study", "user"),)
+
+    def as_dict(self):
+        return {
+            "questions": self.questions,
+            "hangings": self.hangings,
+            "diff": self.questions - self.hangings,
+        }
+
+
 class ReaderStudyPermissionRequest(RequestBase):
     """
     When a user wants to read a reader study, editors have the option of
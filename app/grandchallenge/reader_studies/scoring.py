@@ -0,0 +1,126 @@
+from collections import defaultdict
+from itertools import chain
+
+import numpy as np
+from django.apps import apps
+from django.db.models import JSONField, OuterRef, Subquery
+
+
+def _pad(values, *, width):
+    """Stack the integer sequences in ``values`` into a zero padded array."""
+    lengths = np.fromiter(map(len, values), dtype=int, count=len(values))
+    padded = np.zeros((len(values), width), dtype=int)
+
+    rows = np.repeat(np.arange(len(values)), lengths)
+    cols = np.arange(lengths.sum()) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    padded[rows, cols] = np.fromiter(
+        chain.from_iterable(values), dtype=int, count=lengths.sum()
+    )
+
+    return padded
+
+
+def batch_accuracy_score(*, answers, ground_truths, multiple_choice=False):
+    """
+    Calculates the accuracy score of each answer against its ground truth.
+
+    The scores are the same as those of ``Question.calculate_score`` with
+    ``accuracy_score``. For multiple choice answers the selected options are
+    compared position by position, padded with zeros to the longest of the
+    answer and the ground truth.
+    """
+    if not multiple_choice:
+        return np.fromiter(
+            (a == gt for a, gt in zip(answers, ground_truths)),
+            dtype=float,
+            count=len(answers),
+        )
+
+    lengths = np.fromiter(
+        (max(len(a), len(gt)) for a, gt in zip(answers, ground_truths)),
+        dtype=int,
+        count=len(answers),
+    )
+    width = lengths.max(initial=0)
+
+    matches = _pad(answers, width=width) == _pad(ground_truths, width=width)
+    matches &= np.arange(width) < lengths[:, np.newaxis]
+
+    # Empty answers match empty ground truth
+    return np.divide(
+        matches.sum(axis=1),
+        lengths,
+        out=np.ones(len(answers)),
+        where=lengths > 0,
+    )
+
+
+def update_scores(*, answers):
+    """
+    Update the scores of the readers' answers from the ground truth.
+
+    Each answer is paired with the ground truth of its question for one of
+    its images, all in one query. The scores are then calculated for each
+    question at once, and only the scores that changed are saved in bulk.
+    Answers without ground truth are not changed.
+
+    Parameters
+    ----------
+    answers
+        A queryset of the answers to score, ground truth is excluded.
+
+    Returns
+    -------
+        The number of answers whose score was updated.
+    """
+    Answer = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="Answer"
+    )
+    Question = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="Question"
+    )
+
+    ground_truth = Answer.objects.filter(
+        question=OuterRef("question"),
+        is_ground_truth=True,
+        images__answers=OuterRef("pk"),
+    ).order_by("created")
+
+    pairs = defaultdict(dict)
+    for pk, question_pk, answer, score, gt in (
+        answers.filter(is_ground_truth=False)
+        .annotate(
+            ground_truth_pk=Subquery(ground_truth.values("pk")[:1]),
+            ground_truth=Subquery(
+                ground_truth.values("answer")[:1], output_field=JSONField()
+            ),
+        )
+        .filter(ground_truth_pk__isnull=False)
+        .values_list("pk", "question_id", "answer", "score", "ground_truth")
+    ):
+        pairs[question_pk][pk] = (answer, score, gt)
+
+    questions = Question.objects.only(
+        "answer_type", "scoring_function"
+    ).in_bulk(pairs.keys())
+
+    changed = []
+    for question_pk, question_pairs in pairs.items():
+        pks = list(question_pairs.keys())
+        values, scores, ground_truths = zip(*question_pairs.values())
+
+        new_scores = questions[question_pk].calculate_scores(
+            answers=values, ground_truths=ground_truths
+        )
+
+        changed.extend(
+            Answer(pk=pk, score=new_score)
+            for pk, score, new_score in zip(pks, scores, new_scores)
+            if score != new_score
+        )
+
+    Answer.objects.bulk_update(changed, ["score"], batch_size=1000)
+
+    return len(changed)
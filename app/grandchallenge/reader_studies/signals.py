@@ -1,10 +1,16 @@
-from django.db.models.signals import m2m_changed
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.db.transaction import on_commit
 from django.dispatch import receiver
 from guardian.shortcuts import assign_perm, remove_perm
 
 from grandchallenge.cases.models import Image
-from grandchallenge.reader_studies.models import Answer, ReaderStudy
+from grandchallenge.reader_studies.models import (
+    Answer,
+    Question,
+    ReaderStudy,
+    ReaderStudyProgress,
+)
 from grandchallenge.reader_studies.tasks import add_scores
 
 
@@ -60,3 +66,77 @@ def assign_score(instance, action, reverse, model, pk_set, **_):
             }
         )
     )
+
+
+@receiver(m2m_changed, sender=Answer.images.through)
+def clear_answer_images_progress(instance, action, reverse, pk_set, **_):
+    """
+    Removes the stored progress of the creators of the answers, it is
+    recalculated the next time it is read.
+    """
+    if action not in ["post_add", "post_remove", "pre_clear"]:
+        return
+
+    if reverse:
+        if pk_set is None:
+            # When using a _clear action, pk_set is None
+            answers = instance.answers.all()
+        else:
+            answers = Answer.objects.filter(pk__in=pk_set)
+        answers = answers.values(
+            "question_id", "creator_id", "is_ground_truth"
+        )
+    else:
+        answers = [
+            {
+                "question_id": instance.question_id,
+                "creator_id": instance.creator_id,
+                "is_ground_truth": instance.is_ground_truth,
+            }
+        ]
+
+    readers = Q()
+    for answer in answers:
+        if not answer["is_ground_truth"]:
+            readers |= Q(
+                reader_study__questions=answer["question_id"],
+                user_id=answer["creator_id"],
+            )
+
+    if readers:
+        ReaderStudyProgress.objects.filter(readers).delete()
+
+
+@receiver(post_delete, sender=Answer)
+def clear_answer_progress(instance, **_):
+    if not instance.is_ground_truth:
+        ReaderStudyProgress.objects.filter(
+            reader_study__questions=instance.question_id,
+            user_id=instance.creator_id,
+        ).delete()
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def clear_question_progress(instance, **_):
+    ReaderStudyProgress.objects.filter(
+        reader_study_id=instance.reader_study_id
+    ).delete()
+
+
+@receiver(m2m_changed, sender=ReaderStudy.images.through)
+def clear_images_progress(instance, action, reverse, pk_set, **_):
+    if action not in ["post_add", "post_remove", "pre_clear"]:
+        return
+
+    if reverse:
+        if pk_set is None:
+            reader_studies = instance.readerstudies.all()
+        else:
+            reader_studies = ReaderStudy.objects.filter(pk__in=pk_set)
+    else:
+        reader_studies = [instance]
+
+    ReaderStudyProgress.objects.filter(
+        reader_study__in=reader_studies
+    ).delete()
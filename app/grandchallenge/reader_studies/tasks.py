@@ -1,14 +1,9 @@
 from celery import shared_task
+from django.apps import apps
 from django.db import transaction
 
 from grandchallenge.cases.models import Image
-from grandchallenge.reader_studies.models import Answer, ReaderStudy
-
-
-@transaction.atomic
-def add_score(obj, answer):
-    obj.calculate_score(answer)
-    obj.save()
+from grandchallenge.reader_studies.scoring import update_scores
 
 
 @transaction.atomic
@@ -21,26 +16,41 @@ def add_image(obj, image):
 
 @shared_task
 def add_scores(*, instance_pk, pk_set):
+    Answer = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="Answer"
+    )
+
     instance = Answer.objects.get(pk=instance_pk)
     if instance.is_ground_truth:
-        for answer in Answer.objects.filter(
-            question=instance.question,
-            is_ground_truth=False,
-            images__in=pk_set,
-        ):
-            add_score(answer, instance.answer)
+        answers = Answer.objects.filter(
+            question=instance.question_id, images__in=pk_set,
+        )
     else:
-        ground_truth = Answer.objects.filter(
-            question=instance.question,
-            is_ground_truth=True,
-            images__in=pk_set,
-        ).first()
-        if ground_truth:
-            add_score(instance, ground_truth.answer)
+        answers = Answer.objects.filter(pk=instance.pk)
+
+    update_scores(answers=answers)
+
+
+@shared_task
+def add_scores_for_reader_study(*, reader_study_pk):
+    """Update the scores of all of the answers in a reader study."""
+    Answer = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="Answer"
+    )
+
+    update_scores(
+        answers=Answer.objects.filter(
+            question__reader_study_id=reader_study_pk
+        )
+    )
 
 
 @shared_task
 def add_images_to_reader_study(*, upload_session_pk, reader_study_pk):
+    ReaderStudy = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="ReaderStudy"
+    )
+
     images = Image.objects.filter(origin_id=upload_session_pk)
     reader_study = ReaderStudy.objects.get(pk=reader_study_pk)
 
@@ -49,6 +59,10 @@ def add_images_to_reader_study(*, upload_session_pk, reader_study_pk):
 
 @shared_task
 def add_image_to_answer(*, upload_session_pk, answer_pk):
+    Answer = apps.get_model(  # noqa: N806
+        app_label="reader_studies", model_name="Answer"
+    )
+
     image = Image.objects.get(origin_id=upload_session_pk)
     answer = Answer.objects.get(pk=answer_pk)
 
@@ -48,6 +48,7 @@ from rest_framework.viewsets import (
 )
 from rest_framework_guardian.filters import ObjectPermissionsFilter
 
+from grandchallenge.api.mixins import StreamingExportMixin
 from grandchallenge.cases.forms import UploadRawImagesForm
 from grandchallenge.cases.models import Image, RawImageUploadSession
 from grandchallenge.core.filters import FilterMixin
@@ -665,16 +666,18 @@ class UsersProgress(
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        users = [
-            {
-                "obj": reader,
-                "progress": self.object.get_progress_for_user(reader),
-            }
-            for reader in get_user_model()
+        readers = (
+            get_user_model()
             .objects.filter(answer__question__reader_study=self.object)
             .distinct()
             .select_related("user_profile", "verification")
             .order_by("username")
+        )
+        progress = self.object.get_progress_for_users(readers)
+
+        users = [
+            {"obj": reader, "progress": progress[reader.pk]}
+            for reader in readers
         ]
 
         context.update({"reader_study": self.object, "users": users})
@@ -857,10 +860,14 @@ class ReaderStudyViewSet(ReadOnlyModelViewSet):
             image = reader_study.images.get(pk=case_pk)
         except Image.DoesNotExist:
             raise Http404()
-        answers = Answer.objects.filter(
-            images=image,
-            question__reader_study=reader_study,
-            is_ground_truth=True,
+        answers = (
+            Answer.objects.filter(
+                images=image,
+                question__reader_study=reader_study,
+                is_ground_truth=True,
+            )
+            .select_related("question")
+            .prefetch_related("question__options")
         )
         return JsonResponse(
             {
@@ -868,9 +875,10 @@ class ReaderStudyViewSet(ReadOnlyModelViewSet):
                     "answer": answer.answer,
                     "answer_text": answer.answer_text,
                     "question_text": answer.question.question_text,
-                    "options": dict(
-                        answer.question.options.values_list("id", "title")
-                    ),
+                    "options": {
+                        option.pk: option.title
+                        for option in answer.question.options.all()
+                    },
                     "explanation": answer.explanation,
                 }
                 for answer in answers
@@ -878,7 +886,7 @@ class ReaderStudyViewSet(ReadOnlyModelViewSet):
         )
 
 
-class QuestionViewSet(ReadOnlyModelViewSet):
+class QuestionViewSet(StreamingExportMixin, ReadOnlyModelViewSet):
     serializer_class = QuestionSerializer
     queryset = Question.objects.all().select_related("reader_study")
     permission_classes = [DjangoObjectPermissions]
@@ -891,6 +899,7 @@ class QuestionViewSet(ReadOnlyModelViewSet):
 
 
 class AnswerViewSet(
+    StreamingExportMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
@@ -1,12 +1,14 @@
 import base64
-from io import BytesIO
 
-import SimpleITK
-from PIL import Image as PILImage
 from django.http import Http404
 from rest_framework import serializers
 
 from grandchallenge.archives.models import Archive
+from grandchallenge.cases.previews import (
+    get_thumbnail_png,
+    pil_image_to_png,
+    sitk_image_to_pil,
+)
 from grandchallenge.modalities.serializers import ImagingModalitySerializer
 from grandchallenge.patients.serializers import PatientSerializer
 from grandchallenge.studies.models import Study
@@ -27,36 +29,24 @@ class B64ImageSerializer(serializers.Serializer):
 
     def get_content(self, obj):
         try:
-            image_itk = obj.get_sitk_image()
-        except Exception:
-            raise Http404
-
-        pil_image = self.convert_itk_to_pil(image_itk)
+            size = (self.context["width"], self.context["height"])
+        except KeyError:
+            size = None
 
         try:
-            pil_image.thumbnail(
-                (self.context["width"], self.context["height"]),
-                PILImage.ANTIALIAS,
-            )
-        except KeyError:
-            pass
+            thumbnail = get_thumbnail_png(image=obj, size=size)
+        except Exception:
+            raise Http404
 
-        return self.create_thumbnail_as_b64(pil_image)
+        return base64.b64encode(thumbnail)
 
     @staticmethod
     def convert_itk_to_pil(image_itk):
-        depth = image_itk.GetDepth()
-        image_nparray = SimpleITK.GetArrayFromImage(image_itk)
-        if depth > 0:
-            # Get center slice of image if 3D
-            image_nparray = image_nparray[depth // 2]
-        return PILImage.fromarray(image_nparray)
+        return sitk_image_to_pil(image_itk)
 
     @staticmethod
     def create_thumbnail_as_b64(image_pil):
-        buffer = BytesIO()
-        image_pil.save(buffer, format="png")
-        return base64.b64encode(buffer.getvalue())
+        return base64.b64encode(pil_image_to_png(image_pil))
 
 
 class TreeObjectSerializer(serializers.Serializer):
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+DOWNLOADS_KEY = "serving:downloads"
+FLUSHING_KEY = f"{DOWNLOADS_KEY}:flushing"
+LOCK_KEY = f"{DOWNLOADS_KEY}:lock"
+# Expire the lock if a flush is killed before it releases it
+LOCK_TIMEOUT = 600
+
+
+def _field(*, creator_id, image_id, submission_id) -> str:
+    return ":".join(
+        "" if pk is None else str(pk)
+        for pk in (creator_id, image_id, submission_id)
+    )
+
+
+def _parse_field(field: bytes) -> dict:
+    creator_id, image_id, submission_id = (
+        pk or None for pk in field.decode().split(":")
+    )
+    return {
+        "creator_id": creator_id,
+        "image_id": image_id,
+        "submission_id": submission_id,
+    }
+
+
+def record_download(*, creator_id, image_id=None, submission_id=None):
+    """
+    Count a download of an image or submission.
+
+    The counts are aggregated in redis, and are written to the database in
+    bulk by the flush_download_counts task.
+    """
+    get_redis_connection().hincrby(
+        DOWNLOADS_KEY,
+        _field(
+            creator_id=creator_id,
+            image_id=image_id,
+            submission_id=submission_id,
+        ),
+        1,
+    )
+
+
+@contextmanager
+def pop_download_counts():
+    """
+    Get the aggregated download counts, and reset them if they are saved.
+
+    The counts are moved to a separate key first, so downloads that are
+    recorded while the counts are being saved are kept for the next flush.
+    That key is only deleted if the block exits without an error, otherwise
+    the counts are retried by the next flush. Only one flush can run at a
+    time, concurrent flushes get no counts.
+
+    Yields
+    ------
+        A list of ({creator_id, image_id, submission_id}, count) pairs
+    """
+    redis = get_redis_connection()
+    lock = redis.lock(LOCK_KEY, timeout=LOCK_TIMEOUT)
+
+    if not lock.acquire(blocking=False):
+        yield []
+        return
+
+    try:
+        if not redis.exists(FLUSHING_KEY):
+            try:
+                redis.rename(DOWNLOADS_KEY, FLUSHING_KEY)
+            except ResponseError:
+                # Nothing has been downloaded since the last flush
+                yield []
+                return
+
+        counts = redis.hgetall(FLUSHING_KEY)
+
+        yield [(_parse_field(field), int(n)) for field, n in counts.items()]
+
+        redis.delete(FLUSHING_KEY)
+    finally:
+        lock.release()
@@ -1,12 +1,92 @@
 from celery import shared_task
-from django.db.models import F
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
 
+from grandchallenge.cases.models import Image
+from grandchallenge.evaluation.models import Submission
+from grandchallenge.serving.downloads import pop_download_counts
 from grandchallenge.serving.models import Download
 
 
+def _download_key(*, creator_id, image_id, submission_id):
+    return tuple(
+        None if pk is None else str(pk)
+        for pk in (creator_id, image_id, submission_id)
+    )
+
+
+def _get_pks(*, counts, field):
+    return {k[field] for k, _ in counts if k[field] is not None}
+
+
+def _filter_existing(*, counts):
+    """Remove the counts of objects that have been deleted."""
+    existing = {
+        field: {
+            str(pk)
+            for pk in model.objects.filter(
+                pk__in=_get_pks(counts=counts, field=field)
+            ).values_list("pk", flat=True)
+        }
+        for field, model in (
+            ("creator_id", get_user_model()),
+            ("image_id", Image),
+            ("submission_id", Submission),
+        )
+    }
+
+    return [
+        (kwargs, n)
+        for kwargs, n in counts
+        if all(
+            pk is None or pk in existing[field] for field, pk in kwargs.items()
+        )
+    ]
+
+
 @shared_task
-def create_download(*_, **kwargs):
-    n_updated = Download.objects.filter(**kwargs).update(count=F("count") + 1)
+def flush_download_counts():
+    """Write the download counts that are aggregated in redis in bulk."""
+    with pop_download_counts() as counts:
+        counts = _filter_existing(counts=counts)
+
+        if counts:
+            with transaction.atomic():
+                _save_download_counts(counts=counts)
+
+
+def _save_download_counts(*, counts):
+    existing = {
+        _download_key(
+            creator_id=d.creator_id,
+            image_id=d.image_id,
+            submission_id=d.submission_id,
+        ): d
+        for d in Download.objects.filter(
+            Q(creator_id__in=_get_pks(counts=counts, field="creator_id"))
+            | Q(creator__isnull=True),
+            Q(image_id__in=_get_pks(counts=counts, field="image_id"))
+            | Q(
+                submission_id__in=_get_pks(
+                    counts=counts, field="submission_id"
+                )
+            ),
+        )
+    }
+
+    to_update, to_create = [], []
+
+    for kwargs, n in counts:
+        download = existing.get(_download_key(**kwargs))
+
+        if download is None:
+            to_create.append(Download(**kwargs, count=n))
+        else:
+            download.count = F("count") + n
+            download.modified = now()
+            to_update.append(download)
 
-    if n_updated == 0:
-        Download.objects.create(**kwargs)
+    Download.objects.bulk_update(to_update, fields=["count", "modified"])
+    Download.objects.bulk_create(to_create)
@@ -1,9 +1,9 @@
 import posixpath
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, PermissionDenied
 from django.db.models import Q
-from django.db.transaction import on_commit
 from django.http import Http404, HttpResponseRedirect
 from django.utils._os import safe_join
 from guardian.shortcuts import get_objects_for_user
@@ -14,13 +14,39 @@ from grandchallenge.cases.models import Image
 from grandchallenge.components.models import ComponentInterfaceValue
 from grandchallenge.core.storage import internal_protected_s3_storage
 from grandchallenge.evaluation.models import Submission
-from grandchallenge.serving.tasks import create_download
+from grandchallenge.serving.downloads import record_download
+
+
+def _protected_file_exists(*, name):
+    """
+    Check if a file exists in protected storage.
+
+    Files are not changed after they are written, so only files that exist
+    are cached, for ``settings.PROTECTED_S3_STORAGE_EXISTS_CACHE_TIMEOUT``
+    seconds. Set this to None to skip the check.
+    """
+    timeout = settings.PROTECTED_S3_STORAGE_EXISTS_CACHE_TIMEOUT
+
+    if timeout is None:
+        return True
+
+    key = f"serving:protected-file-exists:{name}"
+
+    if cache.get(key):
+        return True
+
+    exists = internal_protected_s3_storage.exists(name=name)
+
+    if exists and timeout:
+        cache.set(key, True, timeout=timeout)
+
+    return exists
 
 
 def protected_storage_redirect(*, name):
     # Get the storage with the internal redirect and auth. This will prepend
     # settings.PROTECTED_S3_STORAGE_KWARGS['endpoint_url'] to the url
-    if not internal_protected_s3_storage.exists(name=name):
+    if not _protected_file_exists(name=name):
         raise Http404("File not found.")
 
     if settings.PROTECTED_S3_STORAGE_USE_CLOUDFRONT:
@@ -34,6 +60,33 @@ def protected_storage_redirect(*, name):
     return response
 
 
+def _user_can_view_image(*, user, image_pk):
+    """
+    Check if the user has permission to view an image.
+
+    A viewer fetches many files for each image, so permission is cached for
+    ``settings.SERVING_PERMISSION_CACHE_TIMEOUT`` seconds. Only granted
+    permissions are cached, so a revoked permission can still be used
+    until the cache expires.
+    """
+    key = f"serving:view-image:{user.pk}:{image_pk}"
+
+    if cache.get(key):
+        return True
+
+    try:
+        image = Image.objects.get(pk=image_pk)
+    except Image.DoesNotExist:
+        raise Http404("Image not found.")
+
+    can_view = user.has_perm("view_image", image)
+
+    if can_view:
+        cache.set(key, True, timeout=settings.SERVING_PERMISSION_CACHE_TIMEOUT)
+
+    return can_view
+
+
 def serve_images(request, *, pk, path, pa="", pb=""):
     document_root = safe_join(
         f"/{settings.IMAGE_FILES_SUBDIRECTORY}", pa, pb, str(pk)
@@ -41,22 +94,13 @@ def serve_images(request, *, pk, path, pa="", pb=""):
     path = posixpath.normpath(path).lstrip("/")
     name = safe_join(document_root, path)
 
-    try:
-        image = Image.objects.get(pk=pk)
-    except Image.DoesNotExist:
-        raise Http404("Image not found.")
-
     try:
         user, _ = TokenAuthentication().authenticate(request)
     except (AuthenticationFailed, TypeError):
         user = request.user
 
-    if user.has_perm("view_image", image):
-        on_commit(
-            lambda: create_download.apply_async(
-                kwargs={"creator_id": user.pk, "image_id": image.pk}
-            )
-        )
+    if _user_can_view_image(user=user, image_pk=pk):
+        record_download(creator_id=user.pk, image_id=pk)
         return protected_storage_redirect(name=name)
 
     raise PermissionDenied
@@ -69,13 +113,8 @@ def serve_submissions(request, *, submission_pk, **_):
         raise Http404("Submission not found.")
 
     if request.user.has_perm("view_submission", submission):
-        on_commit(
-            lambda: create_download.apply_async(
-                kwargs={
-                    "creator_id": request.user.pk,
-                    "submission_id": submission.pk,
-                }
-            )
+        record_download(
+            creator_id=request.user.pk, submission_id=submission.pk
         )
         return protected_storage_redirect(
             name=submission.predictions_file.name
@@ -1,5 +1,65 @@
+from math import inf
+
 import prometheus_client
 from django.conf import settings
+from django.core.cache import cache
+from prometheus_client.core import HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
+
+
+class CachedHistogram:
+    """
+    A histogram that is shared between processes.
+
+    The jobs are run by celery workers, but the metrics are scraped from the
+    web processes, so the observations are stored as counters in the cache.
+    Each observation only increments its own bucket, and the buckets are
+    accumulated when the histogram is collected, so both observing and
+    collecting are a constant number of cache operations.
+    """
+
+    def __init__(self, name, documentation, *, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = (*sorted(buckets), inf)
+
+        prometheus_client.REGISTRY.register(self)
+
+    def _key(self, suffix):
+        return f"statistics:histogram:{self.name}:{suffix}"
+
+    def _incr(self, key, delta=1):
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+
+    def observe(self, value):
+        """Record a value, in seconds."""
+        bucket = next(b for b in self.buckets if value <= b)
+        self._incr(self._key(bucket))
+        # The cache can only increment integers, so the sum is stored in ms
+        self._incr(self._key("sum_ms"), round(value * 1000))
+
+    def describe(self):
+        return [HistogramMetricFamily(self.name, self.documentation)]
+
+    def collect(self):
+        keys = [self._key(b) for b in self.buckets]
+        values = cache.get_many([*keys, self._key("sum_ms")])
+
+        buckets, count = [], 0
+        for bucket, key in zip(self.buckets, keys):
+            count += values.get(key, 0)
+            buckets.append((floatToGoString(bucket), count))
+
+        return [
+            HistogramMetricFamily(
+                self.name,
+                self.documentation,
+                buckets=buckets,
+                sum_value=values.get(self._key("sum_ms"), 0) / 1000,
+            )
+        ]
+
 
 WORKSTATION_SESSIONS_ACTIVE = prometheus_client.Gauge(
     "grandchallenge_workstation_sessions_active_total",
@@ -33,3 +93,43 @@ BUILD_VERSION = prometheus_client.Info(
     "grandchallenge_build_version", "The build version"
 )
 BUILD_VERSION.info({"grandchallenge_commit_id": settings.COMMIT_ID})
+
+JOB_DURATION_BUCKETS = (
+    1,
+    10,
+    30,
+    60,
+    300,
+    900,
+    1800,
+    3600,
+    7200,
+    14400,
+    43200,
+    86400,
+)
+JOB_NAMES = (
+    ("algorithms.job", "algorithm"),
+    ("evaluation.evaluation", "evaluation"),
+)
+JOB_QUEUE_DURATION = {
+    label: CachedHistogram(
+        f"grandchallenge_{name}_jobs_queue_duration_seconds",
+        f"The time that {name} jobs waited before they were started",
+        buckets=JOB_DURATION_BUCKETS,
+    )
+    for label, name in JOB_NAMES
+}
+JOB_EXECUTION_DURATION = {
+    label: CachedHistogram(
+        f"grandchallenge_{name}_jobs_execution_duration_seconds",
+        f"The time that {name} jobs ran for",
+        buckets=JOB_DURATION_BUCKETS,
+    )
+    for label, name in JOB_NAMES
+}
+UPLOAD_SESSIONS_IMPORT_DURATION = CachedHistogram(
+    "grandchallenge_upload_sessions_import_duration_seconds",
+    "The time taken to import the images of upload sessions",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+)
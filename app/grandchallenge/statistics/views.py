@@ -4,7 +4,7 @@ from datetime import timedelta
 import prometheus_client
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.db.models import Count, Sum
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from django.views.generic import TemplateView
 from rest_framework.permissions import IsAdminUser
@@ -51,21 +51,28 @@ class StatisticsDetail(TemplateView):
         extra = {
             "days": days,
             "max_num_results": max_num_results,
-            "number_of_users": User.objects.filter(is_active=True).count(),
+            **User.objects.aggregate(
+                number_of_users=Count("pk", filter=Q(is_active=True)),
+                new_users_period=Count(
+                    "pk", filter=Q(date_joined__gt=time_period)
+                ),
+                logged_in_period=Count(
+                    "pk", filter=Q(last_login__gt=time_period)
+                ),
+            ),
             "country_data": json.dumps(
                 [["Country", "#Participants"]] + list(country_data)
             ),
-            "new_users_period": (
-                User.objects.filter(date_joined__gt=time_period).count()
-            ),
-            "logged_in_period": (
-                User.objects.filter(last_login__gt=time_period).count()
+            **Challenge.objects.aggregate(
+                public_challenges=Count("pk", filter=Q(hidden=False)),
+                hidden_challenges=Count("pk", filter=Q(hidden=True)),
+                using_auto_eval=Count("pk", filter=Q(use_evaluation=True)),
             ),
-            "public_challenges": public_challenges.count(),
-            "hidden_challenges": Challenge.objects.filter(hidden=True).count(),
-            "submissions": Submission.objects.count(),
-            "submissions_period": (
-                Submission.objects.filter(created__gt=time_period).count()
+            **Submission.objects.aggregate(
+                submissions=Count("pk"),
+                submissions_period=Count(
+                    "pk", filter=Q(created__gt=time_period)
+                ),
             ),
             "latest_public_challenge": (
                 public_challenges.order_by("-created").first()
@@ -112,41 +119,22 @@ class StatisticsDetail(TemplateView):
                 .order_by("-created")
                 .first()
             ),
-            "using_auto_eval": (
-                Challenge.objects.filter(use_evaluation=True).count()
-            ),
-            "public_algorithms": (
-                Algorithm.objects.filter(public=True).count()
+            **self._get_public_counts(Algorithm, name="algorithms"),
+            **AlgorithmJob.objects.aggregate(
+                algorithm_jobs=Count("pk"),
+                algorithm_jobs_period=Count(
+                    "pk", filter=Q(created__gt=time_period)
+                ),
             ),
-            "private_algorithms": (
-                Algorithm.objects.filter(public=False).count()
-            ),
-            "algorithm_jobs": AlgorithmJob.objects.count(),
-            "algorithm_jobs_period": AlgorithmJob.objects.filter(
-                created__gt=time_period
-            ).count(),
-            "public_reader_studies": ReaderStudy.objects.filter(
-                public=True
-            ).count(),
-            "private_reader_studies": ReaderStudy.objects.filter(
-                public=False
-            ).count(),
+            **self._get_public_counts(ReaderStudy, name="reader_studies"),
             "questions": Question.objects.count(),
             "answers": Answer.objects.count(),
-            "public_workstations": Workstation.objects.filter(
-                public=True
-            ).count(),
-            "private_workstations": Workstation.objects.filter(
-                public=False
-            ).count(),
-            "workstation_sessions": Session.objects.count(),
-            "total_session_duration": (
-                Session.objects.aggregate(Sum("maximum_duration"))[
-                    "maximum_duration__sum"
-                ]
+            **self._get_public_counts(Workstation, name="workstations"),
+            **Session.objects.aggregate(
+                workstation_sessions=Count("pk"),
+                total_session_duration=Sum("maximum_duration"),
             ),
-            "public_archives": Archive.objects.filter(public=True).count(),
-            "private_archives": Archive.objects.filter(public=False).count(),
+            **self._get_public_counts(Archive, name="archives"),
             "images": Image.objects.count(),
         }
 
@@ -154,6 +142,16 @@ class StatisticsDetail(TemplateView):
 
         return context
 
+    @staticmethod
+    def _get_public_counts(model, *, name):
+        """The number of public and private instances of a model."""
+        return model.objects.aggregate(
+            **{
+                f"public_{name}": Count("pk", filter=Q(public=True)),
+                f"private_{name}": Count("pk", filter=Q(public=False)),
+            }
+        )
+
 
 class MetricsAPIView(APIView):
     renderer_classes = [PrometheusRenderer]
@@ -167,29 +165,38 @@ class MetricsAPIView(APIView):
         )
 
     @staticmethod
-    def _update_metrics():
+    def _get_status_counts(model):
+        """The number of instances of a model with each status."""
+        return dict(
+            model.objects.order_by()
+            .values_list("status")
+            .annotate(Count("pk"))
+        )
+
+    def _update_metrics(self):
+        sessions = self._get_status_counts(Session)
+        algorithm_jobs = self._get_status_counts(AlgorithmJob)
+        evaluation_jobs = self._get_status_counts(EvaluationJob)
+        upload_sessions = self._get_status_counts(RawImageUploadSession)
+
         metrics.WORKSTATION_SESSIONS_ACTIVE.set(
-            Session.objects.filter(status=Session.STARTED).count()
+            sessions.get(Session.STARTED, 0)
         )
         metrics.ALGORITHM_JOBS_PENDING.set(
-            AlgorithmJob.objects.filter(status=AlgorithmJob.PENDING).count()
+            algorithm_jobs.get(AlgorithmJob.PENDING, 0)
         )
         metrics.ALGORITHM_JOBS_ACTIVE.set(
-            AlgorithmJob.objects.filter(status=AlgorithmJob.STARTED).count()
+            algorithm_jobs.get(AlgorithmJob.STARTED, 0)
         )
         metrics.EVALUATION_JOBS_PENDING.set(
-            EvaluationJob.objects.filter(status=EvaluationJob.PENDING).count()
+            evaluation_jobs.get(EvaluationJob.PENDING, 0)
         )
         metrics.EVALUATION_JOBS_ACTIVE.set(
-            EvaluationJob.objects.filter(status=EvaluationJob.STARTED).count()
+            evaluation_jobs.get(EvaluationJob.STARTED, 0)
         )
         metrics.UPLOAD_SESSIONS_PENDING.set(
-            RawImageUploadSession.objects.filter(
-                status=RawImageUploadSession.REQUEUED
-            ).count()
+            upload_sessions.get(RawImageUploadSession.REQUEUED, 0)
         )
         metrics.UPLOAD_SESSIONS_ACTIVE.set(
-            RawImageUploadSession.objects.filter(
-                status=RawImageUploadSession.STARTED
-            ).count()
+            upload_sessions.get(RawImageUploadSession.STARTED, 0)
         )
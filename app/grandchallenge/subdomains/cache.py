@@ -0,0 +1,66 @@
+import pickle
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import cache
+
+from grandchallenge.challenges.models import Challenge
+
+# Process local cache of {subdomain: (expires, pickled challenge)}
+_local_cache = {}
+
+
+def _cache_key(*, subdomain: str) -> str:
+    return f"subdomains:challenge:{subdomain}"
+
+
+def get_challenge(*, subdomain: str) -> Challenge:
+    """
+    Get the challenge, with its forum and phases, for a subdomain.
+
+    The challenge is looked up in a process local cache, then in the shared
+    cache, and finally in the database. The shared cache is invalidated when
+    the challenge or its phases change, the process local cache only holds
+    the challenge for ``settings.CHALLENGE_SUBDOMAIN_LOCAL_CACHE_TIMEOUT``
+    seconds. The challenge is stored pickled so that each request gets its
+    own instance, including the prefetched phases.
+
+    Raises
+    ------
+    Challenge.DoesNotExist
+        If there is no challenge for this subdomain.
+    """
+    subdomain = subdomain.lower()
+
+    expires, pickled = _local_cache.get(subdomain, (0, None))
+
+    if expires < monotonic():
+        key = _cache_key(subdomain=subdomain)
+        challenge = cache.get(key)
+
+        if challenge is None:
+            challenge = (
+                Challenge.objects.select_related("forum")
+                .prefetch_related("phase_set")
+                .get(short_name__iexact=subdomain)
+            )
+            cache.set(
+                key,
+                challenge,
+                timeout=settings.CHALLENGE_SUBDOMAIN_CACHE_TIMEOUT,
+            )
+
+        pickled = pickle.dumps(challenge)
+        _local_cache[subdomain] = (
+            monotonic() + settings.CHALLENGE_SUBDOMAIN_LOCAL_CACHE_TIMEOUT,
+            pickled,
+        )
+
+    return pickle.loads(pickled)
+
+
+def invalidate_challenge(*, short_name: str):
+    """Remove the challenge from the caches after it has changed."""
+    subdomain = short_name.lower()
+    _local_cache.pop(subdomain, None)
+    cache.delete(_cache_key(subdomain=subdomain))
@@ -1,22 +1,28 @@
 import logging
 import re
+from functools import lru_cache
 
 from django.conf import settings
 from django.http import HttpResponseRedirect
 
 from grandchallenge.challenges.models import Challenge
+from grandchallenge.subdomains.cache import get_challenge
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=16)
+def _get_subdomain_pattern(domain):
+    return re.compile(rf"^(?:(?P<subdomain>.*?)[.])?{domain}$")
+
+
 def subdomain_middleware(get_response):
     def middleware(request):
         """Adds the subdomain to the request."""
         host = request.get_host().lower()
         domain = request.site.domain.lower()
 
-        pattern = rf"^(?:(?P<subdomain>.*?)[.])?{domain}$"
-        matches = re.match(pattern, host)
+        matches = _get_subdomain_pattern(domain).match(host)
 
         try:
             request.subdomain = matches.group("subdomain")
@@ -36,7 +42,11 @@ def challenge_subdomain_middleware(get_response):
         """
         Adds the challenge to the request based on the subdomain, redirecting
         to the main site if the challenge is not valid. Requires the
-        subdomain to be set on the request (eg, by using subdomain_middleware)
+        subdomain to be set on the request (eg, by using subdomain_middleware).
+
+        The challenge is cached for safe requests, other requests always
+        fetch it from the database so that changes are not made to a stale
+        instance.
         """
         subdomain = request.subdomain
 
@@ -44,11 +54,14 @@ def challenge_subdomain_middleware(get_response):
             request.challenge = None
         else:
             try:
-                request.challenge = (
-                    Challenge.objects.select_related("forum")
-                    .prefetch_related("phase_set")
-                    .get(short_name__iexact=subdomain)
-                )
+                if request.method in ("GET", "HEAD", "OPTIONS"):
+                    request.challenge = get_challenge(subdomain=subdomain)
+                else:
+                    request.challenge = (
+                        Challenge.objects.select_related("forum")
+                        .prefetch_related("phase_set")
+                        .get(short_name__iexact=subdomain)
+                    )
             except Challenge.DoesNotExist:
                 logger.warning(f"Could not find challenge {subdomain}")
                 domain = request.site.domain.lower()
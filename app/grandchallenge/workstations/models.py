@@ -217,6 +217,13 @@ class WorkstationImage(UUIDModel, ComponentImage):
             kwargs={"slug": self.workstation.slug, "pk": self.pk},
         )
 
+    @property
+    def preload_queues(self):
+        return [
+            f"workstations-{region}"
+            for region in settings.WORKSTATIONS_ACTIVE_REGIONS
+        ]
+
     def assign_permissions(self):
         # Allow the editors group to view this workstation image
         assign_perm(
@@ -3,8 +3,11 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django_capture_on_commit_callbacks import capture_on_commit_callbacks
+from guardian.shortcuts import get_perms
 
 from grandchallenge.algorithms.models import DEFAULT_INPUT_INTERFACE_SLUG, Job
 from grandchallenge.algorithms.tasks import (
@@ -161,6 +164,51 @@ class TestCreateAlgorithmJobs:
         )
         assert Job.objects.count() == 6
 
+    def test_jobs_match_saved_job(self):
+        creator = UserFactory()
+        ai = AlgorithmImageFactory()
+        ai.algorithm.add_editor(creator)
+        image = ImageFactory()
+        extra = GroupFactory()
+
+        (job,) = create_algorithm_jobs(
+            algorithm_image=ai,
+            images=[image],
+            creator=creator,
+            extra_viewer_groups=[extra],
+        )
+        job.refresh_from_db()
+
+        assert job.viewers.name == f"algorithms_job_{job.pk}_viewers"
+        assert {*job.viewer_groups.all()} == {job.viewers, extra}
+        assert creator.groups.filter(pk=job.viewers.pk).exists()
+        assert creator.has_perm("change_job", job)
+        assert creator.has_perm("view_job", job)
+        assert creator.has_perm("view_image", image)
+        assert "view_job" in get_perms(extra, job)
+        assert "view_image" in get_perms(extra, image)
+
+    def test_query_count_is_constant(self, record_property):
+        ai = AlgorithmImageFactory()
+        groups = [GroupFactory(), GroupFactory()]
+        queries = {}
+
+        for n_images in (1, 10, 50):
+            images = ImageFactory.create_batch(n_images)
+
+            with CaptureQueriesContext(connection) as context:
+                jobs = create_algorithm_jobs(
+                    algorithm_image=ai,
+                    images=images,
+                    extra_viewer_groups=groups,
+                )
+
+            assert len(jobs) == n_images
+            queries[n_images] = len(context.captured_queries)
+            record_property(f"queries_{n_images}_images", queries[n_images])
+
+        assert queries[1] == queries[10] == queries[50]
+
 
 class TestCreateJobsWorkflow(TestCase):
     def test_no_jobs_workflow(self):
@@ -176,6 +224,14 @@ class TestCreateJobsWorkflow(TestCase):
             execute_jobs(algorithm_image=ai, images=images)
         assert len(callbacks) == 1
 
+    def test_jobs_workflow_is_chunked(self):
+        ai = AlgorithmImageFactory()
+        images = ImageFactory.create_batch(5)
+        with self.settings(ALGORITHMS_JOBS_QUEUE_CHUNK_SIZE=2):
+            with capture_on_commit_callbacks() as callbacks:
+                execute_jobs(algorithm_image=ai, images=images)
+        assert len(callbacks) == 3
+
 
 @pytest.mark.django_db
 def test_algorithm(client, algorithm_image, settings):
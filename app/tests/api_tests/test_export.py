@@ -0,0 +1,99 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+
+from grandchallenge.api.mixins import StreamingExportMixin
+from tests.factories import ImageFactory, UserFactory
+from tests.reader_studies_tests.factories import (
+    AnswerFactory,
+    QuestionFactory,
+    ReaderStudyFactory,
+)
+from tests.utils import get_view_for_user
+
+
+def _export(*, client, user, viewname, export_format, **params):
+    response = get_view_for_user(
+        viewname=viewname,
+        reverse_kwargs={"export_format": export_format},
+        client=client,
+        user=user,
+        data=params,
+    )
+    assert response.status_code == 200
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("export_format", ("csv", "ndjson"))
+def test_answer_export(client, monkeypatch, export_format):
+    monkeypatch.setattr(StreamingExportMixin, "export_chunk_size", 2)
+
+    user = UserFactory()
+    answers = [AnswerFactory(creator=user, answer="") for _ in range(5)]
+    AnswerFactory(answer="")
+
+    content = _export(
+        client=client,
+        user=user,
+        viewname="api:reader-studies-answer-export",
+        export_format=export_format,
+    )
+
+    if export_format == "csv":
+        rows = list(csv.DictReader(StringIO(content)))
+        assert json.loads(rows[0]["images"]) == []
+    else:
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert rows[0]["images"] == []
+
+    assert {r["pk"] for r in rows} == {str(a.pk) for a in answers}
+
+
+@pytest.mark.django_db
+def test_question_export_is_filtered(client):
+    rs1, rs2 = ReaderStudyFactory(), ReaderStudyFactory()
+    editor = UserFactory()
+    rs1.add_editor(editor)
+    rs2.add_editor(editor)
+    q1, _ = (
+        QuestionFactory(reader_study=rs1),
+        QuestionFactory(reader_study=rs2),
+    )
+    QuestionFactory()
+
+    content = _export(
+        client=client,
+        user=editor,
+        viewname="api:reader-studies-question-export",
+        export_format="ndjson",
+        reader_study=rs1.pk,
+    )
+
+    assert [json.loads(line)["pk"] for line in content.splitlines()] == [
+        str(q1.pk)
+    ]
+
+
+@pytest.mark.django_db
+def test_image_export(client):
+    rs = ReaderStudyFactory()
+    reader = UserFactory()
+    rs.add_reader(reader)
+    images = [ImageFactory() for _ in range(3)]
+    rs.images.add(*images)
+    ImageFactory()
+
+    content = _export(
+        client=client,
+        user=reader,
+        viewname="api:image-export",
+        export_format="csv",
+    )
+
+    rows = list(csv.DictReader(StringIO(content)))
+    assert {r["pk"] for r in rows} == {str(im.pk) for im in images}
+    assert all(r["reader_study_set"] for r in rows)
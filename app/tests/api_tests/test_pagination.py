@@ -0,0 +1,132 @@
+import json
+from base64 import urlsafe_b64encode
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.factories import UserFactory
+from tests.reader_studies_tests.factories import AnswerFactory
+from tests.utils import get_view_for_user
+
+
+def _get_answers(*, client, user, **params):
+    response = get_view_for_user(
+        viewname="api:reader-studies-answer-list",
+        client=client,
+        user=user,
+        data=params,
+        HTTP_ACCEPT="application/json",
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _get_query(url):
+    return {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+
+
+@pytest.mark.django_db
+def test_keyset_pagination(client):
+    user = UserFactory()
+    answers = [AnswerFactory(creator=user, answer="") for _ in range(5)]
+    AnswerFactory(answer="")
+
+    response = _get_answers(client=client, user=user, limit=2, cursor="")
+    assert set(response) == {"next", "results"}
+
+    pks = [a["pk"] for a in response["results"]]
+    while response["next"]:
+        response = _get_answers(
+            client=client, user=user, **_get_query(response["next"])
+        )
+        pks += [a["pk"] for a in response["results"]]
+
+    assert pks == [
+        str(a.pk) for a in sorted(answers, key=lambda a: (a.created, a.pk))
+    ]
+
+
+def _encode_cursor(value):
+    return urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "cursor",
+    (
+        "invalid",
+        _encode_cursor(["2021-01-01T00:00:00+00:00"]),
+        _encode_cursor([1, "5d3c1a40-4d5e-4b4c-9a5e-2a0d7d0e9f0b"]),
+        _encode_cursor(
+            [
+                "2021-13-01T00:00:00+00:00",
+                "5d3c1a40-4d5e-4b4c-9a5e-2a0d7d0e9f0b",
+            ]
+        ),
+        _encode_cursor(["2021-01-01T00:00:00+00:00", "invalid"]),
+        _encode_cursor(["2021-01-01T00:00:00+00:00", {"pk": 1}]),
+        _encode_cursor(["2021-01-01T00:00:00+00:00", None]),
+    ),
+)
+def test_keyset_pagination_invalid_cursor(client, cursor):
+    user = UserFactory()
+
+    response = get_view_for_user(
+        viewname="api:reader-studies-answer-list",
+        client=client,
+        user=user,
+        data={"cursor": cursor},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params,counts,offsets",
+    (({"offset": 3, "limit": 2}, True, True), ({"cursor": ""}, False, False)),
+)
+def test_deep_page_queries(client, params, counts, offsets):
+    user = UserFactory()
+    for _ in range(5):
+        AnswerFactory(creator=user, answer="")
+
+    response = _get_answers(client=client, user=user, limit=2, cursor="")
+
+    if "cursor" in params:
+        # Request the second page
+        params = _get_query(response["next"])
+
+    with CaptureQueriesContext(connection) as context:
+        _get_answers(client=client, user=user, **params)
+
+    answer_queries = [
+        q["sql"]
+        for q in context.captured_queries
+        if 'FROM "reader_studies_answer"' in q["sql"]
+    ]
+
+    assert any("COUNT(" in q for q in answer_queries) is counts
+    assert any("OFFSET" in q for q in answer_queries) is offsets
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_csv(client):
+    user = UserFactory()
+    answers = [AnswerFactory(creator=user, answer="") for _ in range(3)]
+
+    response = get_view_for_user(
+        viewname="api:reader-studies-answer-list",
+        client=client,
+        user=user,
+        data={"cursor": "", "limit": 2},
+        HTTP_ACCEPT="text/csv",
+    )
+
+    assert response.status_code == 200
+    # The header and a row for each answer on the page
+    assert len(response.content.decode().splitlines()) == 3
+    assert str(min(answers, key=lambda a: (a.created, a.pk)).pk) in str(
+        response.content
+    )
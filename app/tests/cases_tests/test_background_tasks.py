@@ -1,5 +1,8 @@
+import io
 import os
 import shutil
+import tarfile
+import zipfile
 from pathlib import Path
 from typing import Dict, List, Tuple
 from unittest import mock
@@ -23,14 +26,18 @@ from grandchallenge.cases.models import (
     RawImageUploadSession,
 )
 from grandchallenge.cases.tasks import (
+    ArchiveExtractor,
+    ProvisioningError,
     build_images,
     check_compressed_and_extract,
+    populate_provisioning_directory,
 )
 from grandchallenge.jqfileupload.widgets.uploader import StagedAjaxFile
 from tests.cases_tests import RESOURCE_PATH
 from tests.factories import UploadSessionFactory, UserFactory
 from tests.jqfileupload_tests.external_test_support import (
     create_file_from_filepath,
+    create_file_with_content,
 )
 
 
@@ -277,6 +284,30 @@ def test_errors_on_files_with_duplicate_file_names(settings):
         assert raw_image.error is not None
 
 
+@pytest.mark.django_db
+def test_provisioning_files_with_the_same_name(tmpdir):
+    raw_files = [
+        RawImageFile(filename=f.name, staged_file_id=f.uuid)
+        for f in (
+            create_file_with_content("same.txt", b"first"),
+            create_file_with_content("other.txt", b"other"),
+            create_file_with_content("same.txt", b"last"),
+        )
+    ]
+
+    with mock.patch(
+        "grandchallenge.cases.tasks.copyfileobj", wraps=shutil.copyfileobj
+    ) as copyfileobj:
+        populate_provisioning_directory(raw_files, Path(tmpdir))
+
+    # The last file with the same name is kept, as when copied serially
+    assert copyfileobj.call_count == 2
+    assert {p.name: p.read_bytes() for p in Path(tmpdir).iterdir()} == {
+        "same.txt": b"last",
+        "other.txt": b"other",
+    }
+
+
 @pytest.mark.django_db
 def test_mhd_file_annotation_creation(settings):
     # Override the celery settings
@@ -403,6 +434,74 @@ def test_check_compressed_and_extract_same_name(tmpdir, file_name):
     assert actual == expected
 
 
+def test_extract_nested_archives(tmpdir):
+    tmpdir_path = Path(tmpdir)
+
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as zf:
+        zf.writestr("inner/file.txt", "inner")
+
+    with tarfile.open(tmpdir_path / "outer.tar", "w") as tf:
+        info = tarfile.TarInfo("folder/inner.zip")
+        info.size = inner.getbuffer().nbytes
+        inner.seek(0)
+        tf.addfile(info, inner)
+
+    extractor = ArchiveExtractor()
+    extractor.add(file_path=tmpdir_path / "outer.tar", target_path=tmpdir_path)
+    extractor.run()
+
+    extracted = sorted(
+        p.relative_to(tmpdir_path) for p in tmpdir_path.rglob("*")
+    )
+    assert extracted == [
+        Path("folder"),
+        Path("folder/inner"),
+        Path("folder/inner/file.txt"),
+    ]
+    assert (tmpdir_path / "folder/inner/file.txt").read_text() == "inner"
+    assert extractor.extracted_archives == 2
+
+
+def test_extract_total_size_limit(tmpdir):
+    tmp_file = Path(shutil.copy(str(RESOURCE_PATH / "test.zip"), str(tmpdir)))
+
+    extractor = ArchiveExtractor(max_bytes=10)
+    extractor.add(file_path=tmp_file, target_path=Path(tmpdir))
+
+    with pytest.raises(ProvisioningError):
+        extractor.run()
+
+
+def test_extract_decompression_ratio_limit(tmpdir):
+    tmp_file = Path(tmpdir) / "bomb.zip"
+    with zipfile.ZipFile(tmp_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("zeros.bin", bytes(10_000_000))
+
+    extractor = ArchiveExtractor(max_ratio=100)
+    extractor.add(file_path=tmp_file, target_path=Path(tmpdir))
+
+    with pytest.raises(ProvisioningError):
+        extractor.run()
+
+    assert extractor.extracted_bytes == 0
+
+
+def test_extract_path_traversal(tmpdir):
+    tmpdir_path = Path(tmpdir) / "target"
+    tmpdir_path.mkdir()
+
+    with tarfile.open(tmpdir_path / "evil.tar", "w") as tf:
+        info = tarfile.TarInfo("../evil.txt")
+        info.size = 4
+        tf.addfile(info, io.BytesIO(b"evil"))
+
+    with pytest.raises(ValidationError):
+        check_compressed_and_extract(tmpdir_path / "evil.tar", tmpdir_path)
+
+    assert not (Path(tmpdir) / "evil.txt").exists()
+
+
 @pytest.mark.django_db
 def test_build_zip_file(settings):
     settings.task_eager_propagates = (True,)
@@ -1,8 +1,12 @@
 import pytest
 from django.conf import settings
 from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from guardian.models import GroupObjectPermission
 from guardian.shortcuts import get_perms
 
+from grandchallenge.cases.permissions import update_view_image_permissions
 from tests.algorithms_tests.factories import AlgorithmJobFactory
 from tests.archives_tests.factories import ArchiveFactory
 from tests.components_tests.factories import ComponentInterfaceValueFactory
@@ -167,3 +171,86 @@ def test_view_permission_when_reused(in_archive, in_rs, in_job):
 
     for g in job.viewer_groups.all():
         assert ("view_image" in get_perms(g, im)) is in_job
+
+
+def _count_sync_queries(*, images, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        update_view_image_permissions(
+            image_pks=[im.pk for im in images], **kwargs
+        )
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("container", ("archive", "job", "reader_study"))
+def test_update_view_image_permissions_query_count(container, record_property):
+    queries = {}
+
+    for n_images in (1, 10, 50):
+        images = ImageFactory.create_batch(n_images)
+
+        if container == "archive":
+            archive = ArchiveFactory()
+            archive.images.add(*images)
+            group = archive.users_group
+        elif container == "reader_study":
+            rs = ReaderStudyFactory()
+            rs.images.add(*images)
+            group = rs.readers_group
+        else:
+            job = AlgorithmJobFactory()
+            job.outputs.add(
+                *[ComponentInterfaceValueFactory(image=im) for im in images]
+            )
+            group = job.viewers
+
+        # Remove all of the permissions so that every one is recreated
+        GroupObjectPermission.objects.filter(
+            object_pk__in=[str(im.pk) for im in images]
+        ).delete()
+
+        queries[n_images] = _count_sync_queries(images=images)
+        record_property(f"queries_{container}_{n_images}", queries[n_images])
+
+        for im in images:
+            assert "view_image" in get_perms(group, im)
+
+        # Nothing changes so nothing should be written
+        with CaptureQueriesContext(connection) as context:
+            update_view_image_permissions(image_pks=[im.pk for im in images])
+        assert not any(
+            q["sql"].startswith(("INSERT", "DELETE"))
+            for q in context.captured_queries
+        )
+
+    assert queries[1] == queries[10] == queries[50]
+
+
+@pytest.mark.django_db
+def test_job_viewer_groups_change_query_count(record_property):
+    queries = {}
+
+    for n_images in (1, 10, 50):
+        job = AlgorithmJobFactory()
+        images = ImageFactory.create_batch(n_images)
+        job.outputs.add(
+            *[ComponentInterfaceValueFactory(image=im) for im in images]
+        )
+        group = Group.objects.create(name=f"viewers-{n_images}")
+
+        with CaptureQueriesContext(connection) as context:
+            job.viewer_groups.add(group)
+
+        queries[n_images] = len(context.captured_queries)
+        record_property(f"queries_{n_images}", queries[n_images])
+
+        for im in images:
+            assert "view_image" in get_perms(group, im)
+
+        job.viewer_groups.remove(group)
+
+        for im in images:
+            assert "view_image" not in get_perms(group, im)
+            assert "view_image" in get_perms(job.viewers, im)
+
+    assert queries[1] == queries[10] == queries[50]
@@ -0,0 +1,89 @@
+import shutil
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image as PILImage
+from django.core.cache import cache
+
+from grandchallenge.cases.models import Image, ImageFile
+from grandchallenge.cases.previews import (
+    create_preview_files,
+    get_thumbnail_png,
+)
+from grandchallenge.cases.serializers import HyperlinkedImageSerializer
+from grandchallenge.cases.tasks import _handle_raw_image_files
+from tests.cases_tests import RESOURCE_PATH
+from tests.cases_tests.factories import ImageFactoryWithImageFile2DLarge
+from tests.factories import UploadSessionFactory
+
+
+@pytest.mark.django_db
+def test_previews_created_on_import(tmpdir, settings):
+    settings.CASES_PREVIEW_SIZES = (4, 8)
+    session = UploadSessionFactory()
+
+    for f in ("image128x256RGB.mhd", "image128x256RGB.zraw"):
+        shutil.copy(RESOURCE_PATH / f, Path(tmpdir))
+    _handle_raw_image_files(Path(tmpdir), session)
+
+    image = Image.objects.get(origin=session)
+    previews = image.files.filter(image_type=ImageFile.IMAGE_TYPE_PREVIEW)
+
+    assert {p.preview_size for p in previews} == {4, 8}
+    for preview in previews:
+        with preview.file.open("rb") as f:
+            assert max(PILImage.open(f).size) <= 8
+
+    # The previews must not replace the image itself
+    assert image.get_sitk_image().GetSize() == (128, 256)
+
+
+@pytest.mark.django_db
+def test_thumbnail_from_preview(settings, django_assert_num_queries):
+    settings.CASES_PREVIEW_SIZES = (64,)
+    image = ImageFactoryWithImageFile2DLarge()
+
+    for preview in create_preview_files(
+        image_id=image.pk, image_itk=image.get_sitk_image()
+    ):
+        preview.save()
+
+    with django_assert_num_queries(1):
+        exact = get_thumbnail_png(image=image, size=(64, 64))
+        assert PILImage.open(BytesIO(exact)).size == (32, 64)
+
+    smaller = get_thumbnail_png(image=image, size=(16, 16))
+    assert PILImage.open(BytesIO(smaller)).size == (8, 16)
+
+
+@pytest.mark.django_db
+def test_thumbnail_without_preview_is_cached(settings):
+    settings.CASES_PREVIEW_SIZES = ()
+    image = ImageFactoryWithImageFile2DLarge()
+    size = (100, 100)
+
+    thumbnail = get_thumbnail_png(image=image, size=size)
+
+    assert PILImage.open(BytesIO(thumbnail)).size == (50, 100)
+    assert cache.get(f"cases:image-thumbnail:{image.pk}:{size}") == thumbnail
+
+
+@pytest.mark.django_db
+def test_previews_not_downloadable(settings, rf):
+    settings.CASES_PREVIEW_SIZES = (64,)
+    image = ImageFactoryWithImageFile2DLarge()
+
+    for preview in create_preview_files(
+        image_id=image.pk, image_itk=image.get_sitk_image()
+    ):
+        preview.save()
+
+    files = HyperlinkedImageSerializer(
+        image, context={"request": rf.get("/")}
+    ).data["files"]
+
+    assert [f["image_type"] for f in files] == [ImageFile.IMAGE_TYPE_MHD] * 2
+    assert {f.image_type for f in image.download_files} == {
+        ImageFile.IMAGE_TYPE_MHD
+    }
@@ -1,7 +1,16 @@
+import shutil
+from pathlib import Path
+from time import perf_counter
+
 import pytest
 from celery import shared_task
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_capture_on_commit_callbacks import capture_on_commit_callbacks
 
+from grandchallenge.cases.models import Image, RawImageFile
+from grandchallenge.cases.tasks import _handle_raw_image_files
+from tests.cases_tests import RESOURCE_PATH
 from tests.factories import UploadSessionFactory
 
 
@@ -30,3 +39,44 @@ def test_linked_task_called_with_session_pk(settings):
         session.process_images(linked_task=local_linked_task.signature())
 
     assert called == {"upload_session_pk": session.pk}
+
+
+def _import_synthetic_session(*, n_files, tmpdir):
+    """Import a session of n_files images, returning the query count."""
+    session = UploadSessionFactory()
+
+    tmp_dir = Path(tmpdir) / str(n_files)
+    tmp_dir.mkdir()
+    for i in range(n_files):
+        shutil.copy(
+            RESOURCE_PATH / "image10x10x10.mha", tmp_dir / f"image{i}.mha"
+        )
+
+    with CaptureQueriesContext(connection) as context:
+        start = perf_counter()
+        _handle_raw_image_files(tmp_dir, session)
+        duration = perf_counter() - start
+
+    assert Image.objects.filter(origin=session).count() == n_files
+    assert (
+        RawImageFile.objects.filter(
+            upload_session=session, consumed=True
+        ).count()
+        == n_files
+    )
+
+    return len(context.captured_queries), duration
+
+
+@pytest.mark.django_db
+def test_import_query_count_is_constant(tmpdir, record_property):
+    queries = {}
+
+    for n_files in (1, 10, 50):
+        queries[n_files], duration = _import_synthetic_session(
+            n_files=n_files, tmpdir=tmpdir
+        )
+        record_property(f"queries_{n_files}_files", queries[n_files])
+        record_property(f"seconds_{n_files}_files", duration)
+
+    assert queries[1] == queries[10] == queries[50]
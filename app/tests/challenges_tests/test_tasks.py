@@ -0,0 +1,93 @@
+import pytest
+
+from grandchallenge.challenges.models import Challenge
+from grandchallenge.challenges.tasks import update_challenge_results_cache
+from tests.evaluation_tests.factories import (
+    EvaluationFactory,
+    PhaseFactory,
+    SubmissionFactory,
+)
+from tests.factories import ChallengeFactory, UserFactory
+
+
+@pytest.mark.django_db
+def test_participant_counts_maintained():
+    challenge, other_challenge = ChallengeFactory(), ChallengeFactory()
+    u1, u2 = UserFactory(), UserFactory()
+
+    challenge.add_participant(u1)
+    challenge.participants_group.user_set.add(u2)
+    other_challenge.add_participant(u1)
+
+    challenge.refresh_from_db()
+    other_challenge.refresh_from_db()
+    assert challenge.cached_num_participants == 2
+    assert other_challenge.cached_num_participants == 1
+
+    challenge.remove_participant(u2)
+    challenge.refresh_from_db()
+    assert challenge.cached_num_participants == 1
+
+    u1.groups.clear()
+    challenge.refresh_from_db()
+    other_challenge.refresh_from_db()
+    assert challenge.cached_num_participants == 0
+    assert other_challenge.cached_num_participants == 0
+
+
+@pytest.mark.django_db
+def test_result_counts_maintained():
+    phase = PhaseFactory()
+    challenge = phase.challenge
+
+    e1 = EvaluationFactory(submission=SubmissionFactory(phase=phase))
+    e2 = EvaluationFactory(submission=SubmissionFactory(phase=phase))
+
+    challenge.refresh_from_db()
+    assert challenge.cached_num_results == 2
+    assert challenge.cached_latest_result == e2.created
+
+    e2.published = False
+    e2.save()
+    challenge.refresh_from_db()
+    assert challenge.cached_num_results == 1
+    assert challenge.cached_latest_result == e1.created
+
+    e1.delete()
+    challenge.refresh_from_db()
+    assert challenge.cached_num_results == 0
+    assert challenge.cached_latest_result is None
+
+
+@pytest.mark.django_db
+def test_update_challenge_results_cache(django_assert_num_queries):
+    phase = PhaseFactory()
+    participant = UserFactory()
+    phase.challenge.add_participant(participant)
+    evaluation = EvaluationFactory(submission=SubmissionFactory(phase=phase))
+    ChallengeFactory()
+
+    # Bulk operations do not send signals, so the cache drifts
+    Challenge.objects.update(
+        cached_num_participants=5,
+        cached_num_results=5,
+        cached_latest_result=None,
+    )
+
+    with django_assert_num_queries(1):
+        update_challenge_results_cache()
+
+    assert {
+        c.pk: (
+            c.cached_num_participants,
+            c.cached_num_results,
+            c.cached_latest_result,
+        )
+        for c in Challenge.objects.all()
+    } == {
+        phase.challenge.pk: (1, 1, evaluation.created),
+        **{
+            c.pk: (0, 0, None)
+            for c in Challenge.objects.exclude(pk=phase.challenge.pk)
+        },
+    }
@@ -1,9 +1,15 @@
+import io
 import os
+import tarfile
+from pathlib import Path
 
 import pytest
+from django.core.files.base import ContentFile
 
 from grandchallenge.components.backends.docker import (
     DockerConnection,
+    TarStream,
+    get_archive,
     user_error,
 )
 
@@ -62,3 +68,82 @@ def test_user_error(with_timestamp):
         user_error(obj=f"{timestamp}\n{timestamp}\n")
         == "No errors were reported in the logs."
     )
+
+
+def test_tar_stream():
+    members = [
+        ("foo/bar/baz.txt", ContentFile(b"baz", name="baz.txt")),
+        ("foo/qux.json", ContentFile(b"[1, 2]" * 1000, name="qux.json")),
+        ("empty.txt", ContentFile(b"", name="empty.txt")),
+    ]
+    archive = TarStream(members=members, chunk_size=100)
+
+    data = b"".join(archive)
+
+    assert len(data) == archive.bytes_written
+    assert len(data) % tarfile.RECORDSIZE == 0
+
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r") as tar:
+        assert tar.getnames() == [
+            "foo",
+            "foo/bar",
+            "foo/bar/baz.txt",
+            "foo/qux.json",
+            "empty.txt",
+        ]
+        assert tar.getmember("foo").isdir()
+        assert tar.getmember("foo/bar").isdir()
+        assert tar.extractfile("foo/bar/baz.txt").read() == b"baz"
+        assert tar.extractfile("foo/qux.json").read() == b"[1, 2]" * 1000
+        assert tar.extractfile("empty.txt").read() == b""
+
+
+def test_tar_stream_truncated_file():
+    f = ContentFile(b"foo", name="foo.txt")
+    f.size = 10
+
+    with pytest.raises(OSError):
+        b"".join(TarStream(members=[("foo.txt", f)]))
+
+
+class FakeContainer:
+    def __init__(self, archive: bytes):
+        self._archive = archive
+
+    def get_archive(self, path):
+        chunks = (
+            self._archive[i : i + 1000]
+            for i in range(0, len(self._archive), 1000)
+        )
+        return chunks, {"size": len(self._archive)}
+
+
+def test_get_archive(tmpdir):
+    buffer = io.BytesIO()
+
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, content in (
+            ("output/results.json", b'{"foo": 1}'),
+            ("output/images/image.mha", b"0" * 10_000),
+        ):
+            tarinfo = tarfile.TarInfo(name=name)
+            tarinfo.size = len(content)
+            tar.addfile(tarinfo, fileobj=io.BytesIO(content))
+
+        link = tarfile.TarInfo(name="output/link")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "/etc/passwd"
+        tar.addfile(link)
+
+    get_archive(
+        container=FakeContainer(buffer.getvalue()), src="/output/", dest=tmpdir
+    )
+
+    dest = Path(tmpdir)
+    assert {str(f.relative_to(dest)) for f in dest.rglob("*")} == {
+        "results.json",
+        "images",
+        "images/image.mha",
+    }
+    assert (dest / "results.json").read_bytes() == b'{"foo": 1}'
+    assert (dest / "images" / "image.mha").read_bytes() == b"0" * 10_000
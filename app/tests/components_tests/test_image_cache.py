@@ -0,0 +1,78 @@
+import pytest
+from docker.errors import APIError, ImageNotFound
+
+from grandchallenge.components.backends.image_cache import (
+    DockerImageCache,
+    get_cache_stats,
+    record_cache_hit,
+    record_cache_miss,
+)
+
+
+class FakeImage:
+    def __init__(self, size):
+        self.attrs = {"Size": size}
+
+
+class FakeImages:
+    def __init__(self, images, in_use=()):
+        self._images = images
+        self._in_use = in_use
+        self.removed = []
+
+    def get(self, name):
+        try:
+            return self._images[name]
+        except KeyError:
+            raise ImageNotFound(name)
+
+    def remove(self, image):
+        if image in self._in_use:
+            raise APIError("Conflict")
+        del self._images[image]
+        self.removed.append(image)
+
+
+class FakeClient:
+    def __init__(self, images):
+        self.images = images
+
+    def info(self):
+        return {"ID": "host-1"}
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+
+def test_evict_least_recently_used(settings, locmem_cache):
+    settings.COMPONENTS_DOCKER_IMAGE_CACHE_SIZE_GB = 3
+
+    images = FakeImages(
+        {k: FakeImage(size=1e9) for k in ("a", "b", "c", "d", "e")},
+        in_use=("b",),
+    )
+    image_cache = DockerImageCache(client=FakeClient(images))
+
+    for image in ("a", "b", "c", "d", "e", "gone"):
+        image_cache.touch(image_sha256=image)
+
+    image_cache.evict(keep="a")
+
+    # a is kept and b is in use, so c and d are removed to get under budget
+    assert images.removed == ["c", "d"]
+    assert set(image_cache.last_used) == {"a", "b", "e"}
+
+
+def test_cache_stats(locmem_cache):
+    assert get_cache_stats(image_sha256="a") == {"hits": 0, "misses": 0}
+
+    record_cache_miss(image_sha256="a")
+    record_cache_hit(image_sha256="a")
+    record_cache_hit(image_sha256="a")
+
+    assert get_cache_stats(image_sha256="a") == {"hits": 2, "misses": 1}
+    assert get_cache_stats(image_sha256="b") == {"hits": 0, "misses": 0}
@@ -115,6 +115,20 @@ def test_cloudfront_urls(settings, tmpdir):
 
     assert signed_url == expected_url
 
+    # The key is only loaded once
+    pem.remove()
+
+    signed_urls = storage.cloudfront_signed_urls(
+        names=["horizon.jpg", "other/horizon.jpg"],
+        domain="d604721fxaaqy9.cloudfront.net",
+        expire=datetime.utcfromtimestamp(1258237200),
+    )
+
+    assert signed_urls["horizon.jpg"] == expected_url
+    assert signed_urls["other/horizon.jpg"].startswith(
+        "https://d604721fxaaqy9.cloudfront.net/other/horizon.jpg?Expires="
+    )
+
 
 def test_private_storage_url_generation_fails():
     storage = grandchallenge.core.storage.PrivateS3Storage()
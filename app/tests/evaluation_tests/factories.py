@@ -2,6 +2,7 @@ import factory
 
 from grandchallenge.evaluation.models import (
     Evaluation,
+    LeaderboardEntry,
     Method,
     Phase,
     Submission,
@@ -42,3 +43,12 @@ class EvaluationFactory(factory.django.DjangoModelFactory):
 
     method = factory.SubFactory(MethodFactory)
     submission = factory.SubFactory(SubmissionFactory)
+
+
+class LeaderboardEntryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = LeaderboardEntry
+
+    evaluation = factory.SubFactory(EvaluationFactory)
+    phase = factory.SelfAttribute("evaluation.submission.phase")
+    rank = factory.SelfAttribute("evaluation.rank")
@@ -1,11 +1,28 @@
+from importlib import import_module
+from statistics import mean
+from time import perf_counter
+
+import numpy as np
 import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from grandchallenge.components.models import (
     ComponentInterface,
     ComponentInterfaceValue,
 )
-from grandchallenge.evaluation.models import Evaluation, Phase
+from grandchallenge.evaluation.models import (
+    Evaluation,
+    LeaderboardEntry,
+    Phase,
+)
 from grandchallenge.evaluation.tasks import calculate_ranks
+from grandchallenge.evaluation.utils import (
+    Metric,
+    _scores_to_ranks,
+    rank_metric_values,
+)
 from tests.evaluation_tests.factories import EvaluationFactory, PhaseFactory
 from tests.factories import UserFactory
 
@@ -126,7 +143,7 @@ def test_calculate_ranks(django_assert_max_num_queries):
                 ]
                 phase.save()
 
-                with django_assert_max_num_queries(7):
+                with django_assert_max_num_queries(11):
                     calculate_ranks(phase_pk=phase.pk)
 
                 assert_ranks(
@@ -134,6 +151,18 @@ def test_calculate_ranks(django_assert_max_num_queries):
                     expected[a_order][score_method][b_order]["ranks"],
                     expected[a_order][score_method][b_order]["rank_scores"],
                 )
+                assert {
+                    entry.evaluation_id: (entry.rank, entry.metrics)
+                    for entry in LeaderboardEntry.objects.filter(phase=phase)
+                } == {
+                    e.pk: (rank, r)
+                    for e, r, rank in zip(
+                        queryset,
+                        results,
+                        expected[a_order][score_method][b_order]["ranks"],
+                    )
+                    if rank
+                }
 
 
 @pytest.mark.django_db
@@ -257,3 +286,114 @@ def assert_ranks(queryset, expected_ranks, expected_rank_scores=None):
 
     if expected_rank_scores:
         assert [r.rank_score for r in queryset] == expected_rank_scores
+
+
+@pytest.mark.django_db
+def test_calculate_ranks_only_updates_changes():
+    phase = PhaseFactory(score_jsonpath="a")
+    evaluations = [
+        EvaluationFactory(submission__phase=phase, status=Evaluation.SUCCESS)
+        for _ in range(3)
+    ]
+
+    for e, r in zip(evaluations, [0.1, 0.2, 0.3]):
+        e.outputs.add(
+            ComponentInterfaceValue.objects.create(
+                interface=ComponentInterface.objects.get(
+                    slug="metrics-json-file"
+                ),
+                value={"a": r},
+            )
+        )
+
+    calculate_ranks(phase_pk=phase.pk)
+    assert_ranks(evaluations, [3, 2, 1])
+
+    with CaptureQueriesContext(connection) as context:
+        calculate_ranks(phase_pk=phase.pk)
+
+    assert not any(
+        q["sql"].startswith("UPDATE") for q in context.captured_queries
+    )
+    assert_ranks(evaluations, [3, 2, 1])
+
+
+@pytest.mark.django_db
+def test_leaderboard_entries_migration():
+    migration = import_module(
+        "grandchallenge.evaluation.migrations.0006_leaderboardentry"
+    )
+    phase = PhaseFactory(score_jsonpath="a")
+    evaluations = [
+        EvaluationFactory(submission__phase=phase, status=Evaluation.SUCCESS)
+        for _ in range(3)
+    ]
+
+    for e, r in zip(evaluations, [{"a": 0.1}, {"a": 0.2}, {"b": 0.3}]):
+        e.outputs.add(
+            ComponentInterfaceValue.objects.create(
+                interface=ComponentInterface.objects.get(
+                    slug="metrics-json-file"
+                ),
+                value=r,
+            )
+        )
+
+    calculate_ranks(phase_pk=phase.pk)
+    expected = list(
+        LeaderboardEntry.objects.values_list(
+            "evaluation", "phase", "rank", "metrics"
+        )
+    )
+    assert len(expected) == 2
+
+    LeaderboardEntry.objects.all().delete()
+    migration.calculate_leaderboards(apps, None)
+
+    assert (
+        list(
+            LeaderboardEntry.objects.values_list(
+                "evaluation", "phase", "rank", "metrics"
+            )
+        )
+        == expected
+    )
+
+
+def test_rank_metric_values_benchmark(record_property):
+    """Rank a synthetic phase of 10k results against the reference."""
+    rng = np.random.default_rng(seed=42)
+    metrics = (Metric(path="a", reverse=True), Metric(path="b", reverse=False))
+    metric_values = {
+        f"pk{idx}": (float(a), int(b))
+        for idx, (a, b) in enumerate(
+            zip(rng.random(10_000).round(3), rng.integers(0, 100, 10_000))
+        )
+    }
+
+    start = perf_counter()
+    positions = rank_metric_values(
+        metric_values=metric_values,
+        metrics=metrics,
+        score_method=lambda x: np.mean(x, axis=1),
+    )
+    record_property("seconds_10k_evaluations", perf_counter() - start)
+
+    expected_per_metric = {
+        metric.path: _scores_to_ranks(
+            scores={pk: v[idx] for pk, v in metric_values.items()},
+            reverse=metric.reverse,
+        )
+        for idx, metric in enumerate(metrics)
+    }
+    expected_scores = {
+        pk: mean(expected_per_metric[m.path][pk] for m in metrics)
+        for pk in metric_values
+    }
+
+    assert positions.rank_per_metric == {
+        pk: {m.path: expected_per_metric[m.path][pk] for m in metrics}
+        for pk in metric_values
+    }
+    assert positions.rank_scores == expected_scores
+    assert positions.ranks == _scores_to_ranks(scores=expected_scores)
@@ -6,9 +6,11 @@ from django.db.models import signals
 from django.utils import timezone
 from guardian.shortcuts import assign_perm, remove_perm
 
-from grandchallenge.evaluation.models import Evaluation
+from grandchallenge.datatables.cache import get_cache_stats
+from grandchallenge.evaluation.models import Evaluation, Phase
 from tests.evaluation_tests.factories import (
     EvaluationFactory,
+    LeaderboardEntryFactory,
     MethodFactory,
     PhaseFactory,
     SubmissionFactory,
@@ -155,6 +157,7 @@ class TestObjectPermissionRequiredViews:
         e = EvaluationFactory(
             method=m, submission=s, rank=1, status=Evaluation.SUCCESS
         )
+        LeaderboardEntryFactory(evaluation=e)
 
         for view_name, kwargs, permission, obj in [
             ("method-list", {}, "view_method", m),
@@ -250,12 +253,14 @@ class TestViewFilters:
             rank=1,
             status=Evaluation.SUCCESS,
         )
-        _ = EvaluationFactory(
+        e2 = EvaluationFactory(
             method__phase=p2,
             submission__phase=p2,
             rank=1,
             status=Evaluation.SUCCESS,
         )
+        LeaderboardEntryFactory(evaluation=e1)
+        LeaderboardEntryFactory(evaluation=e2)
 
         response = get_view_for_user(
             client=client,
@@ -269,6 +274,48 @@ class TestViewFilters:
         assert response.status_code == 200
         assert {e1.pk} == {o.pk for o in response.context[-1]["object_list"]}
 
+    def test_leaderboard_rows_use_entries(self, client):
+        c = ChallengeFactory(hidden=False)
+        p = PhaseFactory(
+            challenge=c,
+            score_jsonpath="acc",
+            score_decimal_places=2,
+            extra_results_columns=[
+                {"path": "dice", "title": "Dice", "order": Phase.DESCENDING}
+            ],
+        )
+        entries = LeaderboardEntryFactory.create_batch(
+            3,
+            evaluation__method__phase=p,
+            evaluation__submission__phase=p,
+            evaluation__rank=1,
+            evaluation__status=Evaluation.SUCCESS,
+            metrics={"acc": 0.123, "dice": 0.456},
+        )
+
+        response = get_view_for_user(
+            client=client,
+            viewname="evaluation:leaderboard",
+            reverse_kwargs={
+                "challenge_short_name": c.short_name,
+                "slug": p.slug,
+            },
+            data={
+                "draw": 1,
+                "start": 0,
+                "length": 10,
+                "order[0][column]": 0,
+                "order[0][dir]": "asc",
+            },
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["recordsTotal"] == len(entries)
+        assert all("0.12" in "".join(row) for row in data["data"])
+        assert all("0.46" in "".join(row) for row in data["data"])
+
 
 @pytest.mark.django_db
 def test_submission_time_limit(client, two_challenge_sets):
@@ -370,3 +417,68 @@ def test_evaluation_list(client, two_challenge_sets):
     assert str(e_p_s1.pk) not in response.rendered_content
     assert str(e_p_s2.pk) not in response.rendered_content
     assert str(e_p1_s1.pk) not in response.rendered_content
+
+
+@pytest.mark.django_db
+def test_leaderboard_pages_are_cached(client):
+    c = ChallengeFactory(hidden=False)
+    p = PhaseFactory(challenge=c, score_jsonpath="acc")
+    entry = LeaderboardEntryFactory(
+        evaluation__method__phase=p,
+        evaluation__submission__phase=p,
+        evaluation__rank=1,
+        evaluation__status=Evaluation.SUCCESS,
+        metrics={"acc": 0.5},
+    )
+    view = "grandchallenge.evaluation.views.LeaderboardDetail"
+
+    def get_rows(draw):
+        response = get_view_for_user(
+            client=client,
+            viewname="evaluation:leaderboard",
+            reverse_kwargs={
+                "challenge_short_name": c.short_name,
+                "slug": p.slug,
+            },
+            data={
+                "draw": draw,
+                "start": 0,
+                "length": 10,
+                "order[0][column]": 0,
+                "order[0][dir]": "asc",
+            },
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        assert response.json()["draw"] == draw
+        return response.json()["data"]
+
+    initial_stats = get_cache_stats(view=view)
+
+    first = get_rows(draw=1)
+    assert get_rows(draw=2) == first
+
+    stats = get_cache_stats(view=view)
+    assert stats["misses"] - initial_stats["misses"] == 1
+    assert stats["hits"] - initial_stats["hits"] == 1
+
+    # Changes to other phases do not invalidate the cached pages
+    other_entry = LeaderboardEntryFactory()
+    other_entry.evaluation.save()
+    other_entry.save()
+
+    assert get_rows(draw=3) == first
+    assert get_cache_stats(view=view)["hits"] - stats["hits"] == 1
+
+    # Saving an entry invalidates the cached pages
+    entry.metrics = {"acc": 0.75}
+    entry.save()
+
+    assert "0.75" in "".join(get_rows(draw=4)[0])
+    assert get_cache_stats(view=view)["misses"] - stats["misses"] == 1
+
+    # As does updating an evaluation of the phase
+    stats = get_cache_stats(view=view)
+    entry.evaluation.save()
+
+    get_rows(draw=5)
+    assert get_cache_stats(view=view)["misses"] - stats["misses"] == 1
@@ -0,0 +1,84 @@
+from unittest import mock
+
+import pytest
+from django_capture_on_commit_callbacks import capture_on_commit_callbacks
+
+from grandchallenge.core.storage import private_s3_storage
+from grandchallenge.jqfileupload.models import StagedFile
+from grandchallenge.jqfileupload.tasks import (
+    compact_complete_uploads,
+    compact_upload,
+    delete_staged_file_objects,
+)
+from grandchallenge.jqfileupload.widgets.uploader import StagedAjaxFile
+from tests.jqfileupload_tests.test_widgets_uploaded_file import (
+    create_uploaded_file,
+)
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.mark.django_db
+def test_compact_upload():
+    file_content = bytes(range(256)) * (PART_SIZE // 128 + 1)
+    file_id = create_uploaded_file(
+        file_content, [PART_SIZE, 2 * PART_SIZE, len(file_content)]
+    )
+    old_names = [
+        c.file.name for c in StagedFile.objects.filter(file_id=file_id)
+    ]
+
+    with capture_on_commit_callbacks() as callbacks:
+        compact_upload(file_id=str(file_id))
+
+    chunk = StagedFile.objects.get(file_id=file_id)
+    assert chunk.start_byte == 0
+    assert chunk.end_byte == len(file_content) - 1
+    assert chunk.total_size == len(file_content)
+    assert not chunk.is_chunked
+
+    with StagedAjaxFile(file_id).open() as f:
+        assert f.read() == file_content
+
+    # The old objects are only deleted later
+    assert len(callbacks) == 1
+    assert all(private_s3_storage.exists(name) for name in old_names)
+
+    delete_staged_file_objects(names=old_names)
+
+    assert not any(private_s3_storage.exists(name) for name in old_names)
+
+
+@pytest.mark.django_db
+def test_compact_upload_small_chunks():
+    file_content = b"HelloWorld" * 5
+    file_id = create_uploaded_file(file_content, [10, len(file_content)])
+
+    compact_upload(file_id=str(file_id))
+
+    assert StagedFile.objects.filter(file_id=file_id).count() == 2
+
+
+@pytest.mark.django_db
+def test_compact_complete_uploads():
+    file_content = b"HelloWorld" * 5
+    complete = create_uploaded_file(
+        bytes(PART_SIZE) + file_content, [PART_SIZE, PART_SIZE + 50]
+    )
+    create_uploaded_file(file_content, client_id="single")
+    create_uploaded_file(
+        file_content, [10, 20], client_id="incomplete",
+    )
+    # Chunks other than the last that are too small cannot be composed
+    create_uploaded_file(
+        file_content, [10, len(file_content)], client_id="small_chunks"
+    )
+
+    with mock.patch(
+        "grandchallenge.jqfileupload.tasks.compact_upload"
+    ) as compact:
+        compact_complete_uploads()
+
+    compact.apply_async.assert_called_once_with(
+        kwargs={"file_id": str(complete)}
+    )
@@ -8,10 +8,12 @@ from django.utils import timezone
 
 from grandchallenge.core.storage import private_s3_storage
 from grandchallenge.jqfileupload.models import StagedFile
+from grandchallenge.jqfileupload.widgets import uploader
 from grandchallenge.jqfileupload.widgets.uploader import (
     NotFoundError,
     StagedAjaxFile,
     cleanup_stale_files,
+    load_staged_ajax_files,
 )
 
 
@@ -184,6 +186,7 @@ def test_file_cleanup():
 
     cleanup_stale_files()
 
+    tested_file.refresh_from_db()
     assert not tested_file.exists
     assert len(StagedFile.objects.filter(file_id=tested_file.uuid).all()) == 0
 
@@ -202,6 +205,7 @@ def test_missing_file():
     assert tested_file.is_complete
     chunks = StagedFile.objects.filter(file_id=tested_file.uuid).all()
     chunks.delete()
+    tested_file.refresh_from_db()
     assert not tested_file.exists
     assert not tested_file.is_complete
     with pytest.raises(NotFoundError):
@@ -227,6 +231,7 @@ def test_file_missing_chunk():
     # delete chunk
     chunks = StagedFile.objects.filter(file_id=uploaded_file_uuid).all()
     chunks[4].delete()
+    tested_file.refresh_from_db()
     assert tested_file.exists
     assert not tested_file.is_complete
     assert tested_file.size is None
@@ -245,6 +250,7 @@ def test_file_missing_last_chunk():
     # delete chunk
     chunks = StagedFile.objects.filter(file_id=uploaded_file_uuid).all()
     chunks[len(chunks) - 1].delete()
+    tested_file.refresh_from_db()
     assert tested_file.exists
     assert not tested_file.is_complete
     assert tested_file.size is None
@@ -282,6 +288,7 @@ def test_file_no_total_size():
     assert tested_file.size == len(file_content)
     chunks = StagedFile.objects.filter(file_id=uploaded_file_uuid).all()
     chunks[4].delete()
+    tested_file.refresh_from_db()
     assert tested_file.exists
     assert not tested_file.is_complete
     assert tested_file.size is None
@@ -308,3 +315,89 @@ def test_file_deletion():
     assert not tested_file.is_complete
     for path in file_paths:
         assert not private_s3_storage.exists(path)
+
+
+@pytest.mark.django_db
+def test_load_staged_ajax_files(django_assert_num_queries):
+    file_content = b"HelloWorld" * 5
+    chunked_uuid = create_uploaded_file(
+        file_content, list(range(1, len(file_content) + 1)), client_id="a"
+    )
+    single_uuid = create_uploaded_file(
+        file_content, client_filename="bla", client_id="b"
+    )
+    missing_uuid = uuid.uuid4()
+
+    with django_assert_num_queries(1):
+        staged_files = load_staged_ajax_files(
+            [chunked_uuid, single_uuid, missing_uuid]
+        )
+
+        assert staged_files[single_uuid].name == "bla"
+        assert staged_files[chunked_uuid].size == len(file_content)
+        assert staged_files[chunked_uuid].is_complete
+        assert not staged_files[missing_uuid].exists
+        assert not staged_files[missing_uuid].is_complete
+
+        with pytest.raises(NotFoundError):
+            _ = staged_files[missing_uuid].name
+
+    do_default_content_tests(staged_files[chunked_uuid], file_content)
+
+
+@pytest.mark.django_db
+def test_metadata_is_cached(django_assert_num_queries):
+    file_content = b"HelloWorld" * 5
+    uploaded_file_uuid = create_uploaded_file(
+        file_content, [4, 8, len(file_content)], client_filename="bla"
+    )
+    tested_file = StagedAjaxFile(uploaded_file_uuid)
+
+    with django_assert_num_queries(1):
+        assert tested_file.exists
+        assert tested_file.is_complete
+        assert tested_file.name == "bla"
+        assert tested_file.size == len(file_content)
+
+        with tested_file.open() as f:
+            assert f.read() == file_content
+
+    tested_file.refresh_from_db()
+
+    with django_assert_num_queries(1):
+        assert tested_file.size == len(file_content)
+
+
+@pytest.mark.django_db
+def test_read_ahead_across_chunks(monkeypatch):
+    monkeypatch.setattr(uploader, "READ_AHEAD_BLOCK_SIZE", 3)
+    monkeypatch.setattr(uploader, "READ_AHEAD_DEPTH", 2)
+
+    file_content = bytes(range(256)) * 4
+    uploaded_file_uuid = create_uploaded_file(
+        file_content, list(range(100, len(file_content), 100)) + [1024]
+    )
+    tested_file = StagedAjaxFile(uploaded_file_uuid)
+
+    with tested_file.open() as f:
+        buffer = bytearray(7)
+        view = memoryview(buffer)
+        result = bytearray()
+
+        while True:
+            read_bytes = f.readinto(view)
+            if not read_bytes:
+                break
+            result += view[:read_bytes]
+
+        assert result == file_content
+
+        # Seeking backwards restarts the read ahead
+        assert f.seek(250) == 250
+        assert f.read(300) == file_content[250:550]
+
+        # Seeking forwards within the block that was read ahead
+        assert f.seek(1, 1) == 551
+        assert f.read(10) == file_content[551:561]
+
+    assert f.closed
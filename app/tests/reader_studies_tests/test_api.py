@@ -3,6 +3,8 @@ from pathlib import Path
 from unittest import mock
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_capture_on_commit_callbacks import capture_on_commit_callbacks
 
 from grandchallenge.reader_studies.models import Answer, Question
@@ -865,6 +867,45 @@ def test_csv_export(client, answer_type, answer):
     assert im.name in content
 
 
+@pytest.mark.django_db
+def test_csv_export_num_queries(client):
+    rs = ReaderStudyFactory()
+    editor = UserFactory()
+    rs.add_editor(editor)
+    q = QuestionFactory(reader_study=rs)
+    im1, im2 = ImageFactory(), ImageFactory()
+    rs.images.add(im1, im2)
+    client.force_login(editor)
+
+    def export():
+        with CaptureQueriesContext(connection) as context:
+            response = get_view_for_user(
+                viewname="api:reader-studies-answer-list",
+                params={"question__reader_study": str(rs.pk)},
+                client=client,
+                HTTP_ACCEPT="text/csv",
+            )
+        assert response.status_code == 200
+        return len(context), response.content.decode()
+
+    answers = [AnswerFactory(question=q, answer="foo")]
+    answers[0].images.add(im1, im2)
+
+    # The first request fills the caches
+    export()
+    expected_num_queries, _ = export()
+
+    for _ in range(4):
+        a = AnswerFactory(question=q, answer="foo")
+        a.images.add(im1, im2)
+        answers.append(a)
+
+    num_queries, content = export()
+
+    assert num_queries == expected_num_queries
+    assert all(str(a.pk) in content for a in answers)
+
+
 @pytest.mark.django_db
 @mock.patch(
     "grandchallenge.reader_studies.models.ReaderStudy.generate_hanging_list"
@@ -1,11 +1,20 @@
 import pytest
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_capture_on_commit_callbacks import capture_on_commit_callbacks
 
-from grandchallenge.reader_studies.models import Answer, Question, ReaderStudy
+from grandchallenge.reader_studies.models import (
+    Answer,
+    Question,
+    ReaderStudy,
+    ReaderStudyProgress,
+)
 from tests.factories import ImageFactory, UserFactory
 from tests.reader_studies_tests.factories import (
     AnswerFactory,
+    CategoricalOptionFactory,
     QuestionFactory,
     ReaderStudyFactory,
 )
@@ -170,6 +179,119 @@ def test_progress_for_user(settings):
     assert progress["questions"] == 100.0
 
 
+@pytest.mark.django_db
+def test_progress_stored(django_assert_num_queries):
+    rs = ReaderStudyFactory()
+    im1, im2 = ImageFactory(name="im1"), ImageFactory(name="im2")
+    q1 = QuestionFactory(reader_study=rs)
+    rs.images.set([im1, im2])
+    rs.hanging_list = [{"main": im1.name}, {"main": im2.name}]
+    rs.save()
+
+    r1, r2 = UserFactory(), UserFactory()
+    for reader in (r1, r2):
+        rs.add_reader(reader)
+        a = AnswerFactory(question=q1, answer="foo", creator=reader)
+        a.images.add(im1)
+
+    # The progress is calculated when it is first read
+    assert not ReaderStudyProgress.objects.filter(reader_study=rs).exists()
+    rs.get_progress_for_users([r1, r2])
+
+    with django_assert_num_queries(1):
+        progress = rs.get_progress_for_users([r1, r2])
+
+    assert progress[r1.pk]["hangings"] == progress[r2.pk]["hangings"] == 50
+
+    # Answering removes the stored progress of the reader only
+    AnswerFactory(question=q1, answer="bar", creator=r1).images.add(im2)
+    assert [
+        p.user for p in ReaderStudyProgress.objects.filter(reader_study=rs)
+    ] == [r2]
+    assert rs.get_progress_for_user(r1)["hangings"] == 100
+
+    # As does clearing the answers of an image
+    im2.answers.clear()
+    assert rs.get_progress_for_user(r1)["hangings"] == 50
+
+    a.delete()
+    assert ReaderStudyProgress.objects.filter(reader_study=rs).count() == 1
+    assert rs.get_progress_for_user(r2)["hangings"] == 0
+
+    # Adding a question changes the progress of all readers
+    QuestionFactory(reader_study=rs)
+    assert not ReaderStudyProgress.objects.filter(reader_study=rs).exists()
+
+    ReaderStudyProgress.objects.create(reader_study=rs, user=r1)
+    call_command("rebuild_reader_study_progress", rs.slug)
+
+    assert {
+        p.user: (p.hangings, p.questions)
+        for p in ReaderStudyProgress.objects.filter(reader_study=rs)
+    } == {r1: (0, 50)}
+
+
+def _add_ground_truth(*, num_images):
+    rs = ReaderStudyFactory()
+    images = [ImageFactory(name=f"im{i}") for i in range(num_images)]
+    rs.images.set(images)
+    rs.hanging_list = [{"main": im.name} for im in images]
+    rs.save()
+
+    q1 = QuestionFactory(
+        reader_study=rs,
+        question_text="q1",
+        answer_type=Question.AnswerType.BOOL,
+    )
+    q2 = QuestionFactory(
+        reader_study=rs,
+        question_text="q2",
+        answer_type=Question.AnswerType.CHOICE,
+    )
+    option = CategoricalOptionFactory(question=q2, title="yes")
+
+    editor, reader = UserFactory(), UserFactory()
+    rs.add_editor(editor)
+    rs.add_reader(reader)
+    reader_answer = AnswerFactory(question=q1, creator=reader, answer=True)
+    reader_answer.images.add(images[0])
+
+    data = [{"images": im.name, "q1": "true", "q2": '"yes"'} for im in images]
+
+    with CaptureQueriesContext(connection) as context:
+        with capture_on_commit_callbacks() as callbacks:
+            rs.add_ground_truth(data=data, user=editor)
+
+    ground_truth = Answer.objects.filter(
+        question__reader_study=rs, is_ground_truth=True
+    )
+    assert ground_truth.count() == 2 * num_images
+    assert {a.answer for a in ground_truth.filter(question=q2)} == {option.pk}
+    assert all(a.history.count() == 1 for a in ground_truth)
+
+    # The scores are updated once, after all of the answers are saved
+    assert len(callbacks) == 1
+    callbacks[0]()
+    reader_answer.refresh_from_db()
+    assert reader_answer.score == 1.0
+
+    # Existing ground truth is updated
+    data[0]["q1"] = "false"
+    rs.add_ground_truth(data=data, user=editor)
+    assert ground_truth.count() == 2 * num_images
+    assert ground_truth.get(question=q1, images=images[0]).answer is False
+
+    return len(context)
+
+
+@pytest.mark.django_db
+def test_add_ground_truth_num_queries(settings):
+    settings.task_eager_propagates = (True,)
+    settings.task_always_eager = (True,)
+
+    assert _add_ground_truth(num_images=1) == _add_ground_truth(num_images=5)
+
+
 @pytest.mark.django_db  # noqa: C901
 def test_leaderboard(reader_study_with_gt, settings):  # noqa: C901
     settings.task_eager_propagates = (True,)
@@ -0,0 +1,112 @@
+from time import perf_counter
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+
+from grandchallenge.reader_studies.models import Answer, Question
+from grandchallenge.reader_studies.scoring import (
+    batch_accuracy_score,
+    update_scores,
+)
+from tests.reader_studies_tests.factories import AnswerFactory
+
+
+def _random_multiple_choice(rng, *, n):
+    return [
+        rng.integers(1, 4, size=rng.integers(0, 4)).tolist() for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize(
+    "answer_type",
+    (Question.AnswerType.BOOL, Question.AnswerType.MULTIPLE_CHOICE),
+)
+def test_batch_accuracy_score(answer_type):
+    rng = np.random.default_rng(seed=42)
+    question = Question(answer_type=answer_type)
+
+    if answer_type == Question.AnswerType.BOOL:
+        answers = rng.integers(0, 2, 100).astype(bool).tolist()
+        ground_truths = rng.integers(0, 2, 100).astype(bool).tolist()
+    else:
+        answers = _random_multiple_choice(rng, n=100)
+        ground_truths = _random_multiple_choice(rng, n=100)
+
+    assert question.calculate_scores(
+        answers=answers, ground_truths=ground_truths
+    ) == pytest.approx(
+        [
+            question.calculate_score(a, gt)
+            for a, gt in zip(answers, ground_truths)
+        ]
+    )
+
+
+def test_batch_accuracy_score_empty():
+    assert (
+        batch_accuracy_score(
+            answers=[], ground_truths=[], multiple_choice=True
+        ).tolist()
+        == []
+    )
+    assert batch_accuracy_score(
+        answers=[[], [1]], ground_truths=[[], []], multiple_choice=True
+    ).tolist() == [1.0, 0.0]
+
+
+def test_batch_accuracy_score_benchmark(record_property):
+    """Score 100k multiple choice answers against their ground truth."""
+    rng = np.random.default_rng(seed=42)
+    question = Question(answer_type=Question.AnswerType.MULTIPLE_CHOICE)
+    answers = _random_multiple_choice(rng, n=100_000)
+    ground_truths = _random_multiple_choice(rng, n=100_000)
+
+    start = perf_counter()
+    scores = question.calculate_scores(
+        answers=answers, ground_truths=ground_truths
+    )
+    record_property("seconds_100k_answers_batch", perf_counter() - start)
+
+    start = perf_counter()
+    expected = [
+        question.calculate_score(a, gt)
+        for a, gt in zip(answers[:1000], ground_truths[:1000])
+    ]
+    record_property("seconds_1k_answers_single", perf_counter() - start)
+
+    assert scores[:1000] == pytest.approx(expected)
+
+
+@pytest.mark.django_db
+def test_update_scores(reader_study_with_gt, django_assert_num_queries):
+    rs = reader_study_with_gt
+    reader = rs.readers_group.user_set.first()
+    images = list(rs.images.all())
+
+    for question in rs.questions.all():
+        for image, answer in zip(images, (True, False)):
+            a = AnswerFactory(question=question, creator=reader, answer=answer)
+            a.images.add(image)
+
+    answers = Answer.objects.filter(
+        question__reader_study=rs, is_ground_truth=False
+    )
+    answers.update(score=None)
+
+    # Select the answers, select the questions and update the scores
+    with django_assert_num_queries(3):
+        assert update_scores(answers=answers) == 6
+
+    assert (
+        sorted(answers.values_list("score", flat=True))
+        == [0.0] * 3 + [1.0] * 3
+    )
+
+    with django_assert_num_queries(2):
+        assert update_scores(answers=answers) == 0
+
+    answers.update(score=None)
+    call_command("rescore_reader_study", rs.slug)
+
+    assert not answers.filter(score=None).exists()
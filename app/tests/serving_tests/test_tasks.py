@@ -0,0 +1,89 @@
+import pytest
+from django.db import DatabaseError
+
+from grandchallenge.serving.downloads import (
+    pop_download_counts,
+    record_download,
+)
+from grandchallenge.serving.models import Download
+from grandchallenge.serving.tasks import flush_download_counts
+from tests.evaluation_tests.factories import SubmissionFactory
+from tests.factories import ImageFactory, UserFactory
+
+
+@pytest.mark.django_db
+def test_flush_download_counts(django_assert_num_queries):
+    with pop_download_counts():
+        pass
+
+    u1, u2 = UserFactory(), UserFactory()
+    image = ImageFactory()
+    submission = SubmissionFactory()
+    Download.objects.create(creator=u1, image=image, count=5)
+
+    for _ in range(3):
+        record_download(creator_id=u1.pk, image_id=image.pk)
+    record_download(creator_id=u2.pk, image_id=image.pk)
+    record_download(creator_id=None, image_id=image.pk)
+    record_download(creator_id=u2.pk, submission_id=submission.pk)
+
+    # Check the users, images and submissions exist, select the existing
+    # downloads, one update and one insert, in a savepoint
+    with django_assert_num_queries(8):
+        flush_download_counts()
+
+    assert {
+        (d.creator, d.image, d.submission, d.count)
+        for d in Download.objects.all()
+    } == {
+        (u1, image, None, 8),
+        (u2, image, None, 1),
+        (None, image, None, 1),
+        (u2, None, submission, 1),
+    }
+
+    # The counts are reset after the flush
+    with django_assert_num_queries(0):
+        flush_download_counts()
+
+
+@pytest.mark.django_db
+def test_flush_download_counts_skips_deleted_objects():
+    with pop_download_counts():
+        pass
+
+    user = UserFactory()
+    image, deleted_image = ImageFactory(), ImageFactory()
+
+    record_download(creator_id=user.pk, image_id=image.pk)
+    record_download(creator_id=user.pk, image_id=deleted_image.pk)
+    deleted_image.delete()
+
+    flush_download_counts()
+
+    assert [(d.creator, d.image) for d in Download.objects.all()] == [
+        (user, image)
+    ]
+
+
+@pytest.mark.django_db
+def test_download_counts_are_kept_on_error():
+    with pop_download_counts():
+        pass
+
+    user, image = UserFactory(), ImageFactory()
+    record_download(creator_id=user.pk, image_id=image.pk)
+
+    with pytest.raises(DatabaseError):
+        with pop_download_counts() as counts:
+            assert len(counts) == 1
+            raise DatabaseError
+
+    # Concurrent flushes do not get the counts
+    with pop_download_counts() as counts:
+        with pop_download_counts() as concurrent_counts:
+            assert concurrent_counts == []
+        assert len(counts) == 1
+
+    with pop_download_counts() as counts:
+        assert counts == []
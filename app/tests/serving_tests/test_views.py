@@ -168,3 +168,49 @@ def test_output_download(client):
             url=job.outputs.first().file.url, client=client, user=test[1]
         )
         assert response.status_code == test[0]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "timeout,expected_status", ((0, 404), (60, 302), (None, 302))
+)
+def test_file_exists_cached(client, settings, timeout, expected_status):
+    settings.PROTECTED_S3_STORAGE_EXISTS_CACHE_TIMEOUT = timeout
+
+    image_file = ImageFileFactory()
+    user = UserFactory()
+    assign_perm("view_image", user, image_file.image)
+    url = image_file.file.url
+
+    response = get_view_for_user(url=url, client=client, user=user)
+    assert response.status_code == 302
+
+    image_file.file.storage.delete(image_file.file.name)
+
+    response = get_view_for_user(url=url, client=client, user=user)
+    assert response.status_code == expected_status
+
+
+@pytest.mark.django_db
+def test_image_permission_cached(client, settings, django_assert_num_queries):
+    settings.PROTECTED_S3_STORAGE_EXISTS_CACHE_TIMEOUT = None
+
+    image_file = ImageFileFactory()
+    user = UserFactory()
+    url = image_file.file.url
+
+    response = get_view_for_user(url=url, client=client, user=user)
+    assert response.status_code == 403
+
+    assign_perm("view_image", user, image_file.image)
+
+    response = get_view_for_user(url=url, client=client, user=user)
+    assert response.status_code == 302
+
+    client.force_login(user)
+
+    # Only the session and user lookups, and the request savepoint
+    with django_assert_num_queries(4):
+        response = client.get(url)
+
+    assert response.status_code == 302
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+
+from grandchallenge.statistics import metrics
+from tests.algorithms_tests.factories import AlgorithmJobFactory
+
+
+def _get_sample(name, le=None):
+    labels = {} if le is None else {"le": le}
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_cached_histogram():
+    name = "grandchallenge_upload_sessions_import_duration_seconds"
+    before = {
+        "le_1": _get_sample(f"{name}_bucket", "1.0"),
+        "le_10": _get_sample(f"{name}_bucket", "10.0"),
+        "inf": _get_sample(f"{name}_bucket", "+Inf"),
+        "count": _get_sample(f"{name}_count"),
+        "sum": _get_sample(f"{name}_sum"),
+    }
+
+    for value in (0.5, 7.25, 100000):
+        metrics.UPLOAD_SESSIONS_IMPORT_DURATION.observe(value)
+
+    assert _get_sample(f"{name}_bucket", "1.0") == before["le_1"] + 1
+    assert _get_sample(f"{name}_bucket", "10.0") == before["le_10"] + 2
+    assert _get_sample(f"{name}_bucket", "+Inf") == before["inf"] + 3
+    assert _get_sample(f"{name}_count") == before["count"] + 3
+    assert _get_sample(f"{name}_sum") == pytest.approx(
+        before["sum"] + 100007.75
+    )
+
+
+@pytest.mark.django_db
+def test_job_durations_observed():
+    queue = "grandchallenge_algorithm_jobs_queue_duration_seconds_count"
+    execution = (
+        "grandchallenge_algorithm_jobs_execution_duration_seconds_count"
+    )
+    queue_before = _get_sample(queue)
+    execution_before = _get_sample(execution)
+
+    job = AlgorithmJobFactory()
+    job.created -= timedelta(minutes=5)
+
+    job.update_status(status=job.STARTED)
+    assert _get_sample(queue) == queue_before + 1
+    assert _get_sample(execution) == execution_before
+
+    job.update_status(status=job.SUCCESS)
+    assert _get_sample(queue) == queue_before + 1
+    assert _get_sample(execution) == execution_before + 1
@@ -1,6 +1,7 @@
 import pytest
 from prometheus_client import CONTENT_TYPE_LATEST
 
+from grandchallenge.statistics.views import MetricsAPIView
 from tests.factories import UserFactory
 from tests.utils import get_view_for_user
 
@@ -35,3 +36,10 @@ def test_prometheus_metrics(client):
     )
     assert response.status_code == 200
     assert response.content_type == CONTENT_TYPE_LATEST
+
+
+@pytest.mark.django_db
+def test_prometheus_metrics_num_queries(django_assert_num_queries):
+    # One grouped query for each model with a status
+    with django_assert_num_queries(4):
+        MetricsAPIView()._update_metrics()
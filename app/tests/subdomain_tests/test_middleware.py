@@ -8,6 +8,7 @@ from grandchallenge.subdomains.middleware import (
     subdomain_middleware,
     subdomain_urlconf_middleware,
 )
+from tests.evaluation_tests.factories import PhaseFactory
 from tests.factories import ChallengeFactory
 
 # The domain that is set for the main site, set by RequestFactory
@@ -156,3 +157,38 @@ def test_url_conf_set(
         assert request.challenge == c
     else:
         assert request.challenge is None
+
+
+@pytest.mark.django_db
+def test_challenge_cached(settings, rf, django_assert_num_queries):
+    settings.ALLOWED_HOSTS = [f".{SITE_DOMAIN}"]
+    c = ChallengeFactory(short_name="cached")
+    middleware = challenge_subdomain_middleware(lambda x: x)
+
+    def get_challenge(method="get"):
+        request = getattr(rf, method)("/", HTTP_HOST=f"cached.{SITE_DOMAIN}")
+        request = CurrentSiteMiddleware(lambda x: x)(request)
+        request = subdomain_middleware(lambda x: x)(request)
+        return middleware(request).challenge
+
+    with django_assert_num_queries(2):
+        # The challenge and its phases
+        assert get_challenge() == c
+
+    with django_assert_num_queries(0):
+        for _ in range(10):
+            challenge = get_challenge()
+
+    assert challenge == c
+    assert [p.pk for p in challenge.phase_set.all()] == [
+        p.pk for p in c.phase_set.all()
+    ]
+
+    # Changes to the challenge must always be made to the current instance
+    with django_assert_num_queries(2):
+        get_challenge(method="post")
+
+    phase = PhaseFactory(challenge=c)
+
+    with django_assert_num_queries(2):
+        assert phase in get_challenge().phase_set.all()